@@ -2,22 +2,42 @@
 星图解算模块导出 / Plate solving module exports
 """
 
+from ogscope.algorithms.plate_solve.attitude import propagate_solve
+from ogscope.algorithms.plate_solve.background import (
+    BackgroundSnapshot,
+    TemporalBackgroundModel,
+)
+from ogscope.algorithms.plate_solve.cancellation import SolveCancelToken
+from ogscope.algorithms.plate_solve.pool import (
+    AsyncPlateSolver,
+    shutdown_solver_pool,
+    warmup_solver,
+)
 from ogscope.algorithms.plate_solve.solver import (
     CentroidExtractionParams,
     PlateSolver,
     SolveResult,
     centroid_extraction_preview,
+    luminance_for_extraction,
     merge_centroid_params,
     reset_tetra3_singleton_for_tests,
     resize_bgr_for_extraction,
 )
 
 __all__ = [
+    "AsyncPlateSolver",
+    "BackgroundSnapshot",
     "CentroidExtractionParams",
     "PlateSolver",
+    "SolveCancelToken",
     "SolveResult",
+    "TemporalBackgroundModel",
     "centroid_extraction_preview",
+    "luminance_for_extraction",
     "merge_centroid_params",
+    "propagate_solve",
     "reset_tetra3_singleton_for_tests",
     "resize_bgr_for_extraction",
+    "shutdown_solver_pool",
+    "warmup_solver",
 ]
@@ -0,0 +1,120 @@
+"""
+由帧间星点跟踪推算姿态 / Attitude propagation from inter-frame star tracking
+
+两次解算之间，把上一成功解的姿态沿跟踪器匹配的星点对推到当前帧：上一帧星点按旧姿态映射到天球，
+与当前帧同一批星点的像方向量求最优旋转（与 Tetra3 同一针孔/畸变模型），无需星表与进程池。
+Between solves, carries the last good attitude to the current frame along the star pairs matched by
+the tracker: previous stars are mapped to the sky with the old attitude, and the best rotation to
+the same stars' current image vectors is solved (same pinhole/distortion model as Tetra3). No
+catalogue lookup or solver process is involved.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+
+import numpy as np
+
+from ogscope.algorithms.plate_solve.solver import SolveResult
+
+
+def image_vectors(
+    xy: np.ndarray,
+    frame_shape: tuple[int, ...],
+    fov_deg: float,
+    distortion: float | None,
+) -> np.ndarray:
+    """像素 (x, y) → 相机系单位向量（Tetra3 约定，i 为视轴）/ Pixel (x, y) to camera unit vectors.
+
+    与 Tetra3 ``_undistort_centroids`` / ``_compute_vectors`` 等价；视场按宽度计，与解算缩放无关。
+    Equivalent to Tetra3's ``_undistort_centroids`` / ``_compute_vectors``; the FOV spans the
+    width, so the result does not depend on the solve's downscaling.
+    """
+    height, width = float(frame_shape[0]), float(frame_shape[1])
+    offset = np.asarray(xy, dtype=np.float64) - (width / 2.0, height / 2.0)
+    if distortion:
+        k = float(distortion)
+        kp = k * (2.0 / width) ** 2
+        r2 = np.einsum("ij,ij->i", offset, offset)
+        offset = offset * ((1.0 - kp * r2) / (1.0 - k))[:, None]
+    scale = math.tan(math.radians(fov_deg) / 2.0) / width * 2.0
+    vectors = np.empty((len(offset), 3))
+    vectors[:, 0] = 1.0
+    vectors[:, 1] = -offset[:, 0] * scale
+    vectors[:, 2] = -offset[:, 1] * scale
+    return vectors / np.linalg.norm(vectors, axis=1)[:, None]
+
+
+def propagate_solve(
+    prior: SolveResult,
+    previous_xy: np.ndarray,
+    current_xy: np.ndarray,
+    frame_shape: tuple[int, ...],
+    *,
+    residual_px: float | None = None,
+) -> SolveResult | None:
+    """沿匹配星点对把 ``prior`` 推到当前帧；先验缺少姿态矩阵或点数不足时返回 None。
+    Carry ``prior`` to the current frame along matched star pairs; None when the prior has no
+    rotation matrix or too few pairs.
+
+    ``previous_xy`` / ``current_xy`` 为主流像素 (N, 2) x,y，``previous_xy`` 须属于 ``prior`` 所解的帧。
+    ``previous_xy`` / ``current_xy`` are (N, 2) main-frame x,y; ``previous_xy`` must come from
+    the frame ``prior`` solved.
+    """
+    raw = prior.raw or {}
+    rotation = raw.get("rotation_matrix")
+    if (
+        prior.status_code != 1
+        or rotation is None
+        or not prior.fov_deg
+        or len(current_xy) < 3
+    ):
+        return None
+    t0 = time.perf_counter()
+    fov = float(prior.fov_deg)
+    distortion = raw.get("distortion")
+    distortion = float(distortion) if distortion is not None else None
+    sky = image_vectors(previous_xy, frame_shape, fov, distortion) @ np.asarray(
+        rotation, dtype=np.float64
+    )
+    cam = image_vectors(current_xy, frame_shape, fov, distortion)
+    # Tetra3 ``_find_rotation_matrix``：最小二乘旋转，R·sky ≈ cam / Least-squares rotation
+    u, _s, vt = np.linalg.svd(cam.T @ sky)
+    matrix = u @ vt
+    if np.linalg.det(matrix) < 0:
+        return None
+    ra = math.degrees(math.atan2(matrix[0, 1], matrix[0, 0])) % 360.0
+    dec = math.degrees(math.atan2(matrix[0, 2], float(np.linalg.norm(matrix[1:3, 2]))))
+    roll = math.degrees(math.atan2(matrix[1, 2], matrix[2, 2])) % 360.0
+    rmse_arcsec = (
+        float(residual_px) * fov / float(frame_shape[1]) * 3600.0
+        if residual_px is not None
+        else None
+    )
+    t_ms = (time.perf_counter() - t0) * 1000.0
+    return SolveResult(
+        ra_deg=ra,
+        dec_deg=dec,
+        detected_stars=len(current_xy),
+        solve_source=prior.solve_source,
+        status="MATCH_FOUND",
+        status_code=1,
+        roll_deg=roll,
+        fov_deg=fov,
+        matches=len(current_xy),
+        prob=None,
+        rmse_arcsec=rmse_arcsec,
+        t_solve_ms=t_ms,
+        t_extract_ms=None,
+        t_preprocess_ms=None,
+        raw={
+            "RA": ra,
+            "Dec": dec,
+            "Roll": roll,
+            "FOV": fov,
+            "distortion": distortion,
+            "rotation_matrix": matrix.tolist(),
+        },
+        solve_mode="propagated",
+    )
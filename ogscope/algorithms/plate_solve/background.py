@@ -0,0 +1,177 @@
+"""
+大尺度背景时间模型 / Temporal large-scale background model
+
+暗角与光污染渐变以分钟计变化，逐帧重新估计背景（缩小、高斯平滑、放大、全画幅浮点乘法）
+在实时解算中是浪费。:class:`TemporalBackgroundModel` 在服务进程中保存小分辨率背景的指数滑动平均，
+仅每 N 帧或曝光/增益/画幅变化时刷新；每帧只产出一个小而可 pickle 的 :class:`BackgroundSnapshot`，
+可随解算请求发往进程池 worker。:func:`apply_background` 将快照上采样为整数偏移（按版本缓存），
+再以一次饱和加法作用于提星亮度。
+Vignetting and light-pollution gradients change over minutes, so the realtime path keeps an
+exponentially averaged low-res background, refreshed every N frames or when exposure, gain or
+frame size change. Each frame only carries a small picklable snapshot; applying it is one
+saturating add of a cached, upsampled integer offset on the extraction luminance.
+"""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+
+def estimate_small_background(gray: np.ndarray, downsample_max_side: int) -> np.ndarray:
+    """小图低频背景：INTER_AREA 缩小后高斯平滑（float32）/ Low-res background: area downsample + Gaussian blur."""
+    h, w = int(gray.shape[0]), int(gray.shape[1])
+    sc = min(1.0, float(downsample_max_side) / float(max(h, w)))
+    sw = max(1, int(round(w * sc)))
+    sh = max(1, int(round(h * sc)))
+    small = cv2.resize(gray, (sw, sh), interpolation=cv2.INTER_AREA).astype(np.float32)
+    sigma_s = max(2.0, float(min(sw, sh)) / 32.0)
+    return cv2.GaussianBlur(small, (0, 0), sigmaX=sigma_s, sigmaY=sigma_s)
+
+
+def frame_luminance(frame: np.ndarray) -> np.ndarray:
+    """帧转亮度：BGR/BGRA(XRGB) 转灰度，单通道原样返回（视图）/ Frame to luminance.
+
+    BGR and 4-channel BGRA/XRGB frames are converted to gray; single-channel frames are
+    returned as a view. Other channel counts raise :class:`ValueError`.
+    """
+    if frame.ndim == 2:
+        return frame
+    channels = frame.shape[2] if frame.ndim == 3 else 0
+    if channels == 1:
+        return frame[:, :, 0]
+    if channels == 3:
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if channels == 4:
+        return cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
+    raise ValueError(
+        f"无法从形状 {frame.shape} 的帧取亮度 / Cannot take luminance of frame shape {frame.shape}"
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class BackgroundSnapshot:
+    """某一时刻的小分辨率背景（可跨进程传递）/ Low-res background at one point in time (picklable).
+
+    ``token`` 每次刷新都会变化，供 worker 缓存上采样后的偏移 / ``token`` changes on every refresh
+    so workers can cache the upsampled offset.
+    """
+
+    token: str
+    small: np.ndarray
+    mean: float
+
+
+def single_frame_background(
+    gray: np.ndarray, downsample_max_side: int
+) -> BackgroundSnapshot:
+    """仅由当前帧估计的背景快照（无时间平均）/ Snapshot estimated from one frame, no averaging."""
+    return BackgroundSnapshot(
+        token=uuid.uuid4().hex,
+        small=estimate_small_background(gray, downsample_max_side),
+        mean=float(cv2.mean(gray)[0]),
+    )
+
+
+_offset_lock = threading.Lock()
+# 最近一次上采样的偏移：(token, 形状, dtype) -> 偏移 / Last upsampled offset keyed by (token, shape, dtype)
+_offset_cache: tuple[tuple[str, tuple[int, int], str], np.ndarray] | None = None
+
+
+def _offset_for(
+    snapshot: BackgroundSnapshot, shape: tuple[int, int], dtype: np.dtype
+) -> np.ndarray:
+    """``mean - 背景`` 的整数偏移（按快照版本缓存）/ Integer ``mean - background`` offset, cached per snapshot."""
+    global _offset_cache
+    key = (snapshot.token, shape, dtype.str)
+    with _offset_lock:
+        if _offset_cache is not None and _offset_cache[0] == key:
+            return _offset_cache[1]
+    h, w = shape
+    bg = cv2.resize(snapshot.small, (w, h), interpolation=cv2.INTER_LINEAR)
+    np.subtract(snapshot.mean, bg, out=bg)
+    offset = np.round(bg).astype(np.int16 if dtype == np.uint8 else np.int32)
+    with _offset_lock:
+        _offset_cache = (key, offset)
+    return offset
+
+
+def apply_background(gray: np.ndarray, snapshot: BackgroundSnapshot) -> np.ndarray:
+    """亮度减去背景并加回均值（一次饱和加法）/ Flatten luminance with one saturating add.
+
+    等价于 ``clip(gray - bg + mean)``；``gray`` 为 uint8 或 uint16，输出同类型。
+    Equivalent to ``clip(gray - bg + mean)`` for uint8 or uint16 input, same dtype out.
+    """
+    offset = _offset_for(snapshot, (int(gray.shape[0]), int(gray.shape[1])), gray.dtype)
+    depth = cv2.CV_8U if gray.dtype == np.uint8 else cv2.CV_16U
+    return cv2.add(gray, offset, dtype=depth)
+
+
+class TemporalBackgroundModel:
+    """指数滑动平均的大尺度背景 / Exponentially averaged large-scale background.
+
+    ``update`` 每帧调用：计数未到 ``refresh_interval_frames`` 且 ``key``（曝光/增益等）与画幅不变时
+    直接返回上一快照（零开销）；否则从当前帧估计小图背景，按 ``smoothing`` 与旧背景融合，
+    ``key`` 或画幅变化时丢弃旧背景重新开始。线程安全。
+    ``update`` is called per frame: between refreshes it returns the previous snapshot for free;
+    on refresh the new estimate is blended in with ``smoothing``, and a changed ``key`` (exposure,
+    gain, ...) or frame size restarts the average. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        *,
+        refresh_interval_frames: int = 30,
+        smoothing: float = 0.3,
+        downsample_max_side: int = 256,
+    ) -> None:
+        self.refresh_interval_frames = max(1, int(refresh_interval_frames))
+        self.smoothing = min(1.0, max(0.0, float(smoothing)))
+        self.downsample_max_side = int(downsample_max_side)
+        self._lock = threading.Lock()
+        self._snapshot: BackgroundSnapshot | None = None
+        self._key: Hashable | None = None
+        self._shape: tuple[int, int] | None = None
+        self._frames_since_refresh = 0
+        self.refresh_count = 0
+
+    def reset(self) -> None:
+        """丢弃已有背景 / Drop the current background."""
+        with self._lock:
+            self._snapshot = None
+            self._frames_since_refresh = 0
+
+    def update(
+        self, frame: np.ndarray, key: Hashable | None = None
+    ) -> BackgroundSnapshot:
+        """记入一帧并返回应使用的背景快照 / Account for one frame and return the snapshot to apply."""
+        shape = (int(frame.shape[0]), int(frame.shape[1]))
+        with self._lock:
+            restart = self._snapshot is None or key != self._key or shape != self._shape
+            self._frames_since_refresh += 1
+            if (
+                not restart
+                and self._frames_since_refresh < self.refresh_interval_frames
+            ):
+                return self._snapshot  # type: ignore[return-value]
+            gray = frame_luminance(frame)
+            small = estimate_small_background(gray, self.downsample_max_side)
+            mean = float(cv2.mean(gray)[0])
+            if not restart:
+                prev = self._snapshot
+                a = self.smoothing
+                small = cv2.addWeighted(small, a, prev.small, 1.0 - a, 0.0)  # type: ignore[union-attr]
+                mean = a * mean + (1.0 - a) * prev.mean  # type: ignore[union-attr]
+            self._snapshot = BackgroundSnapshot(
+                token=uuid.uuid4().hex, small=small, mean=mean
+            )
+            self._key = key
+            self._shape = shape
+            self._frames_since_refresh = 0
+            self.refresh_count += 1
+            return self._snapshot
@@ -0,0 +1,48 @@
+"""
+解算取消令牌 / Plate-solve cancellation tokens
+
+每个请求一个令牌，随 ``PlateSolver`` 传入 Tetra3 提星与图案搜索；外层超时、客户端断开或停止实时解算时
+调用 ``cancel()``，正在运行的解算在下一个图案（或提星阶段）处以 CANCELLED 结束。
+
+One token per request, threaded through ``PlateSolver`` into Tetra3 extraction and pattern
+search. Outer timeouts, client disconnects and realtime stop call ``cancel()``; the running solve
+ends with CANCELLED at the next pattern (or extraction stage).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+
+
+class SolveCancelToken:
+    """协作式取消令牌（与 ``threading.Event`` 同样提供 ``is_set``）/ Cooperative cancellation token."""
+
+    __slots__ = ("_event", "_lock", "_callbacks")
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: list[Callable[[], None]] = []
+
+    def is_set(self) -> bool:
+        """是否已取消 / Whether cancellation was requested."""
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """请求取消；重复调用无副作用 / Request cancellation; idempotent."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        """注册取消回调（已取消则立即调用），用于转发到 worker 进程 / Register a cancel hook."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
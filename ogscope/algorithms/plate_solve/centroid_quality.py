@@ -47,18 +47,16 @@ def _reject_dense_clusters(
 
     counts = np.bincount(cell_id, minlength=rows * cols).reshape(rows, cols)
 
-    bad = np.zeros_like(counts, dtype=bool)
+    # 3×3 邻域和：零填充积分图上一次盒式求和 / 3×3 neighbourhood sums as one box sum on a zero-padded integral image
+    integral = np.zeros((rows + 3, cols + 3), dtype=np.int64)
+    integral[2:-1, 2:-1] = counts
+    np.cumsum(integral, axis=0, out=integral)
+    np.cumsum(integral, axis=1, out=integral)
+    neigh = (
+        integral[3:, 3:] - integral[:-3, 3:] - integral[3:, :-3] + integral[:-3, :-3]
+    )
     neigh_thresh = max(dense_min_points * 2, dense_min_points + 3)
-    for r in range(rows):
-        for c in range(cols):
-            if counts[r, c] >= dense_min_points:
-                bad[r, c] = True
-                continue
-            r0, r1 = max(0, r - 1), min(rows, r + 2)
-            c0, c1 = max(0, c - 1), min(cols, c + 2)
-            s = int(counts[r0:r1, c0:c1].sum())
-            if s >= neigh_thresh:
-                bad[r, c] = True
+    bad = (counts >= dense_min_points) | (neigh >= neigh_thresh)
 
     bad_flat = bad[iy, ix]
     kept = xy[~bad_flat]
@@ -67,31 +65,49 @@ def _reject_dense_clusters(
     return kept, removed, removed_pts
 
 
-def _point_line_dist(
+def _point_segment_dists(
     points_yx: np.ndarray, p0: np.ndarray, p1: np.ndarray
 ) -> np.ndarray:
-    """点到线段距离（像素）/ Distance from points to segment."""
-    # segment vector
-    vx = p1[1] - p0[1]
-    vy = p1[0] - p0[0]
+    """各点到多条线段的距离矩阵（线段 × 点，像素）/ Distances from points to many segments (segments × points).
+
+    ``p0``/``p1`` 为 (L, 2) 的 [y, x] 端点；退化线段按点距离计算。
+    ``p0``/``p1`` are (L, 2) [y, x] endpoints; degenerate segments use the point distance.
+    """
+    vx = (p1[:, 1] - p0[:, 1])[:, np.newaxis]
+    vy = (p1[:, 0] - p0[:, 0])[:, np.newaxis]
     len2 = vx * vx + vy * vy
-    if len2 < 1e-12:
-        return np.hypot(points_yx[:, 1] - p0[1], points_yx[:, 0] - p0[0])
-    t = ((points_yx[:, 1] - p0[1]) * vx + (points_yx[:, 0] - p0[0]) * vy) / len2
-    t = np.clip(t, 0.0, 1.0)
-    proj_x = p0[1] + t * vx
-    proj_y = p0[0] + t * vy
-    return np.hypot(points_yx[:, 1] - proj_x, points_yx[:, 0] - proj_y)
+    dx = points_yx[np.newaxis, :, 1] - p0[:, 1, np.newaxis]
+    dy = points_yx[np.newaxis, :, 0] - p0[:, 0, np.newaxis]
+    degenerate = len2 < 1e-12
+    t = (dx * vx + dy * vy) / np.where(degenerate, 1.0, len2)
+    t = np.where(degenerate, 0.0, np.clip(t, 0.0, 1.0))
+    return np.hypot(dx - t * vx, dy - t * vy)
 
 
-def _span_along_line(inlier_yx: np.ndarray) -> float:
-    if inlier_yx.shape[0] < 2:
-        return 0.0
-    c = np.mean(inlier_yx, axis=0)
-    _, _, vt = np.linalg.svd(inlier_yx - c, full_matrices=False)
-    dire = vt[0]
-    proj = (inlier_yx - c) @ dire
-    return float(proj.max() - proj.min())
+def _spans_along_principal_axis(points_yx: np.ndarray, masks: np.ndarray) -> np.ndarray:
+    """每个掩膜内点沿主轴的投影跨度（像素）/ Span of each masked subset projected on its principal axis.
+
+    主轴由 2×2 协方差闭式求得，与逐组 SVD 的首个右奇异向量一致。
+    The principal axis comes from the 2×2 covariance in closed form, matching the first right
+    singular vector of a per-subset SVD.
+    """
+    weights = masks.astype(np.float64)
+    count = weights.sum(axis=1)
+    safe = np.maximum(count, 1.0)
+    y = points_yx[:, 0]
+    x = points_yx[:, 1]
+    cy = (weights @ y) / safe
+    cx = (weights @ x) / safe
+    dy = y[np.newaxis, :] - cy[:, np.newaxis]
+    dx = x[np.newaxis, :] - cx[:, np.newaxis]
+    syy = (weights * dy * dy).sum(axis=1)
+    sxx = (weights * dx * dx).sum(axis=1)
+    sxy = (weights * dx * dy).sum(axis=1)
+    theta = 0.5 * np.arctan2(2.0 * sxy, syy - sxx)
+    proj = dy * np.cos(theta)[:, np.newaxis] + dx * np.sin(theta)[:, np.newaxis]
+    hi = np.where(masks, proj, -np.inf).max(axis=1)
+    lo = np.where(masks, proj, np.inf).min(axis=1)
+    return np.where(count >= 2, hi - lo, 0.0)
 
 
 def _reject_collinear_ransac(
@@ -104,7 +120,12 @@ def _reject_collinear_ransac(
     max_dist_px: float,
     min_span_frac: float,
 ) -> tuple[np.ndarray, int, np.ndarray]:
-    """随机采样直线，剔除强共线簇 / RANSAC-style collinear rejection."""
+    """随机采样直线，剔除强共线簇 / RANSAC-style collinear rejection.
+
+    每轮仍逐次抽取端点（随机序列与逐条评估时一致），再以 (直线 × 点) 距离矩阵一次评估全部候选线。
+    Endpoints are still drawn one pair at a time (same random sequence as before), then all
+    candidate lines of a round are scored at once as a (lines × points) distance matrix.
+    """
     n = int(xy.shape[0])
     if n < min_inliers:
         return xy, 0, np.empty((0, 2), dtype=np.float64)
@@ -119,33 +140,27 @@ def _reject_collinear_ransac(
         m = int(remain.shape[0])
         if m < min_inliers:
             break
-        best_mask: np.ndarray | None = None
-        best_count = 0
-
-        for _ in range(iters):
-            i, j = rng.integers(0, m, size=2)
-            if i == j:
-                continue
-            p0 = remain[i]
-            p1 = remain[j]
-            d = _point_line_dist(remain, p0, p1)
-            inl = d <= max_dist_px
-            cnt = int(inl.sum())
-            if cnt < min_inliers:
-                continue
-            span = _span_along_line(remain[inl])
-            if span < min_span:
-                continue
-            if cnt > best_count:
-                best_count = cnt
-                best_mask = inl
-
-        if best_mask is None or best_count < min_inliers:
+        pairs = np.array([rng.integers(0, m, size=2) for _ in range(iters)]).reshape(
+            -1, 2
+        )
+        pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+        if pairs.shape[0] == 0:
             break
 
-        span = _span_along_line(remain[best_mask])
-        if span < min_span:
+        inliers = (
+            _point_segment_dists(remain, remain[pairs[:, 0]], remain[pairs[:, 1]])
+            <= max_dist_px
+        )
+        counts = inliers.sum(axis=1)
+        candidates = np.flatnonzero(counts >= min_inliers)
+        if candidates.size == 0:
+            break
+        spans = _spans_along_principal_axis(remain, inliers[candidates])
+        valid = candidates[spans >= min_span]
+        if valid.size == 0:
             break
+        # 取首个最大计数，与逐条比较的严格大于一致 / First maximum, as with the sequential strict ">"
+        best_mask = inliers[valid[np.argmax(counts[valid])]]
 
         n_removed = int(best_mask.sum())
         removed_chunks.append(remain[best_mask].copy())
@@ -0,0 +1,618 @@
+"""
+解算进程池与异步门面 / Plate-solve process pool and async façade
+
+图案搜索大部分时间持有 GIL；放到独立进程后，事件循环、JPEG 编码与 MJPEG 推流不再被解算卡顿。
+每个 worker 在初始化时加载一次图案库；内存映射目录（``default_database/``）经页缓存只读共享。
+请求与结果以紧凑的 numpy 数组跨进程传递，而非整块嵌套 dict。
+
+Pattern search holds the GIL for most of a solve; running it in worker processes keeps the event
+loop, JPEG encoder and MJPEG streams smooth. Each worker loads the pattern database once in its
+initializer; the mmap directory (``default_database/``) is shared read-only via the page cache.
+Requests and results cross the process boundary as compact numpy arrays, not nested dicts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+import numpy as np
+from loguru import logger
+
+from ogscope.algorithms.plate_solve.background import BackgroundSnapshot
+from ogscope.algorithms.plate_solve.cancellation import SolveCancelToken
+from ogscope.algorithms.plate_solve.solver import (
+    CentroidExtractionParams,
+    PlateSolver,
+    SolveResult,
+    warmup_tetra3,
+)
+from ogscope.algorithms.star_extract import HotPixelMap, StarPoint
+from ogscope.config import get_settings
+
+# SolveResult 标量字段，按此顺序打包为 float64（None → NaN）/ Scalar fields packed as float64, None → NaN
+_RESULT_SCALARS = (
+    "ra_deg",
+    "dec_deg",
+    "detected_stars",
+    "status_code",
+    "roll_deg",
+    "fov_deg",
+    "matches",
+    "prob",
+    "rmse_arcsec",
+    "t_solve_ms",
+    "t_extract_ms",
+    "t_preprocess_ms",
+    "large_scale_bg_subtract",
+)
+_RESULT_INTS = frozenset({"detected_stars", "status_code", "matches"})
+
+# 请求数值参数，按此顺序打包为 float64（None → NaN）/ Numeric request options, None → NaN
+_REQUEST_OPTIONS = (
+    "fov_deg",
+    "fov_max_error_deg",
+    "default_timeout_ms",
+    "max_stars",
+    "fov_estimate",
+    "fov_max_error",
+    "solve_timeout_ms",
+    "max_image_side",
+    "large_scale_bg_subtract",
+    "centroid_rejection_level",
+    "hint_ra_deg",
+    "hint_dec_deg",
+    "hint_radius_deg",
+)
+_REQUEST_INTS = frozenset(
+    {"default_timeout_ms", "max_stars", "max_image_side", "centroid_rejection_level"}
+)
+
+# 跨进程取消标志槽位数（同时在途请求上限，超出的请求不可远程取消）
+# Cross-process cancel flag slots (in-flight requests beyond this are not remotely cancellable)
+_CANCEL_SLOTS = 64
+# worker 进程内的共享取消标志（由初始化函数注入）/ Shared cancel flags inside a worker
+_worker_cancel_flags: Any = None
+
+
+@dataclass(slots=True)
+class _PackedList:
+    """数值列表（可嵌套）打包为数组，解包还原为 list / Numeric (nested) list packed as an array."""
+
+    values: np.ndarray
+
+
+@dataclass(slots=True)
+class _PackedRecords:
+    """同键 dict 列表按列打包 / List of same-keyed dicts packed column-wise."""
+
+    keys: tuple[str, ...]
+    columns: tuple[np.ndarray, ...]
+
+
+@dataclass(slots=True)
+class PackedSolveResult:
+    """跨进程传递的 SolveResult / SolveResult in its cross-process form."""
+
+    scalars: np.ndarray
+    status: str
+    solve_source: str
+    solve_mode: str
+    raw: dict[str, Any]
+    solve_overlay: dict[str, Any] | None
+    centroid_quality: dict[str, Any] | None
+
+
+@dataclass(slots=True)
+class _SolveRequest:
+    """跨进程解算请求 / Cross-process solve request."""
+
+    method: str
+    # BGR 帧，或 (N, 4) float64 星点 [x, y, flux, area] / BGR frame or (N, 4) stars
+    image: np.ndarray
+    frame_shape: tuple[int, ...]
+    options: np.ndarray
+    solve_source: str
+    centroid_params: CentroidExtractionParams | None
+    prior: PackedSolveResult | None
+    # 时间背景模型快照（小图）/ Temporal background snapshot (low-res)
+    background: BackgroundSnapshot | None = None
+    # 热像素索引 / Hot-pixel index
+    hot_pixels: HotPixelMap | None = None
+    # 共享取消标志槽位，-1 表示不可取消 / Shared cancel flag slot, -1 when not cancellable
+    cancel_slot: int = -1
+
+
+class _SharedCancelFlag:
+    """worker 侧取消令牌：读取共享内存中的标志字节 / Worker-side token reading a shared flag byte."""
+
+    __slots__ = ("slot",)
+
+    def __init__(self, slot: int) -> None:
+        self.slot = slot
+
+    def is_set(self) -> bool:
+        return bool(_worker_cancel_flags[self.slot])
+
+
+def _numeric_leaves_kind(value: Any) -> str | None:
+    """嵌套列表叶子的统一类型（'b'/'i'/'f'），不统一或非数值为 None / Uniform leaf kind or None."""
+    kinds: set[str] = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif isinstance(item, (bool, np.bool_)):
+            kinds.add("b")
+        elif isinstance(item, (int, np.integer)):
+            kinds.add("i")
+        elif isinstance(item, (float, np.floating)):
+            kinds.add("f")
+        else:
+            return None
+        if len(kinds) > 1:
+            return None
+    return kinds.pop() if kinds else None
+
+
+def _compact(value: Any) -> Any:
+    """把嵌套 list/dict 中的数值数据换成数组 / Replace numeric payloads in nested lists/dicts by arrays."""
+    if isinstance(value, dict):
+        return {k: _compact(v) for k, v in value.items()}
+    if not isinstance(value, list) or not value:
+        return value
+    if all(isinstance(r, dict) for r in value):
+        keys = tuple(value[0])
+        if all(tuple(r) == keys for r in value):
+            columns = [[r[k] for r in value] for k in keys]
+            if all(_numeric_leaves_kind(c) is not None for c in columns):
+                return _PackedRecords(keys, tuple(np.asarray(c) for c in columns))
+        return [_compact(r) for r in value]
+    if _numeric_leaves_kind(value) is not None:
+        try:
+            return _PackedList(np.asarray(value))
+        except ValueError:  # 不规则嵌套 / ragged nesting
+            return value
+    return value
+
+
+def _expand(value: Any) -> Any:
+    """``_compact`` 的逆操作 / Inverse of ``_compact``."""
+    if isinstance(value, _PackedList):
+        return value.values.tolist()
+    if isinstance(value, _PackedRecords):
+        rows = zip(*(c.tolist() for c in value.columns))
+        return [dict(zip(value.keys, row)) for row in rows]
+    if isinstance(value, dict):
+        return {k: _expand(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_expand(v) for v in value]
+    return value
+
+
+def _pack_numbers(values: dict[str, Any], fields: tuple[str, ...]) -> np.ndarray:
+    return np.array(
+        [np.nan if values.get(f) is None else float(values[f]) for f in fields],
+        dtype=np.float64,
+    )
+
+
+def _unpack_numbers(
+    arr: np.ndarray, fields: tuple[str, ...], ints: frozenset[str]
+) -> dict[str, Any]:
+    out: dict[str, Any] = {}
+    for name, v in zip(fields, arr.tolist()):
+        if np.isnan(v):
+            out[name] = None
+        elif name in ints:
+            out[name] = int(v)
+        else:
+            out[name] = v
+    return out
+
+
+def pack_solve_result(result: SolveResult) -> PackedSolveResult:
+    """SolveResult → 紧凑跨进程形式 / SolveResult to its compact cross-process form."""
+    scalars = _pack_numbers(
+        {f: getattr(result, f) for f in _RESULT_SCALARS}, _RESULT_SCALARS
+    )
+    return PackedSolveResult(
+        scalars=scalars,
+        status=result.status,
+        solve_source=result.solve_source,
+        solve_mode=result.solve_mode,
+        raw=_compact(result.raw),
+        solve_overlay=_compact(result.solve_overlay),
+        centroid_quality=_compact(result.centroid_quality),
+    )
+
+
+def unpack_solve_result(packed: PackedSolveResult) -> SolveResult:
+    """紧凑形式 → SolveResult / Compact form back to SolveResult."""
+    fields = _unpack_numbers(packed.scalars, _RESULT_SCALARS, _RESULT_INTS)
+    fields["large_scale_bg_subtract"] = bool(fields["large_scale_bg_subtract"])
+    return SolveResult(
+        **fields,
+        status=packed.status,
+        solve_source=packed.solve_source,
+        solve_mode=packed.solve_mode,
+        raw=_expand(packed.raw),
+        solve_overlay=_expand(packed.solve_overlay),
+        centroid_quality=_expand(packed.centroid_quality),
+    )
+
+
+def _stars_to_array(stars: list[StarPoint]) -> np.ndarray:
+    arr = np.empty((len(stars), 4), dtype=np.float64)
+    for i, s in enumerate(stars):
+        arr[i] = (s.x, s.y, s.flux, s.area)
+    return arr
+
+
+def _stars_from_array(arr: np.ndarray) -> list[StarPoint]:
+    return [StarPoint(x=x, y=y, flux=f, area=a) for x, y, f, a in arr.tolist()]
+
+
+def _worker_initialize(cancel_flags: Any) -> None:
+    """worker 进程初始化：加载一次图案库 / Worker init: load the pattern database once."""
+    global _worker_cancel_flags
+    _worker_cancel_flags = cancel_flags
+    try:
+        warmup_tetra3()
+    except OSError as exc:
+        # 首次解算会以 DATABASE_ERROR 返回 / The first solve reports DATABASE_ERROR
+        logger.warning(
+            f"解算 worker 加载图案库失败 / Solver worker failed to load DB: {exc}"
+        )
+
+
+def _worker_ping() -> bool:
+    return True
+
+
+def _worker_solve(request: _SolveRequest) -> PackedSolveResult:
+    """在 worker 进程内执行一次解算 / Run one solve inside a worker process."""
+    opts = _unpack_numbers(request.options, _REQUEST_OPTIONS, _REQUEST_INTS)
+    solver = PlateSolver(
+        fov_deg=opts["fov_deg"],
+        fov_max_error_deg=opts["fov_max_error_deg"],
+        solve_timeout_ms=opts["default_timeout_ms"],
+    )
+    prior = unpack_solve_result(request.prior) if request.prior is not None else None
+    common = {
+        "solve_source": request.solve_source,
+        "fov_estimate": opts["fov_estimate"],
+        "fov_max_error": opts["fov_max_error"],
+        "solve_timeout_ms": opts["solve_timeout_ms"],
+        "centroid_rejection_level": opts["centroid_rejection_level"],
+        "hint_ra_deg": opts["hint_ra_deg"],
+        "hint_dec_deg": opts["hint_dec_deg"],
+        "hint_radius_deg": opts["hint_radius_deg"],
+        "prior": prior,
+        "cancel_token": (
+            _SharedCancelFlag(request.cancel_slot) if request.cancel_slot >= 0 else None
+        ),
+    }
+    if request.method == "solve":
+        result = solver.solve(
+            stars=_stars_from_array(request.image),
+            frame_shape=request.frame_shape,
+            **common,
+        )
+    else:
+        result = solver.solve_from_bgr_frame(
+            frame_bgr=request.image,
+            max_stars=opts["max_stars"],
+            max_image_side=opts["max_image_side"],
+            centroid_params=request.centroid_params,
+            large_scale_bg_subtract=bool(opts["large_scale_bg_subtract"]),
+            background=request.background,
+            hot_pixels=request.hot_pixels,
+            **common,
+        )
+    return pack_solve_result(result)
+
+
+class SolverProcessPool:
+    """解算进程池（spawn 启动，避免 fork 继承相机/事件循环线程）/ Solver process pool.
+
+    使用 spawn 而非 fork：父进程持有相机与事件循环线程，fork 后子进程状态不可控。
+    Uses spawn rather than fork: the parent owns camera and event-loop threads.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = max(1, int(workers))
+        self._lock = threading.Lock()
+        self._context = multiprocessing.get_context("spawn")
+        # 父进程写、worker 轮询的取消标志；重建进程池时沿用 / Parent writes, workers poll; kept on restart
+        self._cancel_flags = self._context.RawArray("b", _CANCEL_SLOTS)
+        self._free_slots = list(range(_CANCEL_SLOTS))
+        self._slot_tickets = [0] * _CANCEL_SLOTS
+        # 每次重建进程池加一，用于识别过期失败 / Bumped on every rebuild to spot stale failures
+        self._generation = 0
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._context,
+            initializer=_worker_initialize,
+            initargs=(self._cancel_flags,),
+        )
+
+    @property
+    def generation(self) -> int:
+        """当前进程池代数 / Generation of the current executor."""
+        return self._generation
+
+    def submit(
+        self, request: _SolveRequest, cancel_token: SolveCancelToken | None = None
+    ) -> tuple[Future[PackedSolveResult], int]:
+        """提交解算，返回 future 与所用进程池代数；令牌取消时置位该请求的共享标志。
+        Submit; returns the future and the executor generation it ran on. A cancelled token sets
+        the request's shared flag.
+        """
+        with self._lock:
+            generation = self._generation
+            slot, ticket = -1, 0
+            if cancel_token is not None and self._free_slots:
+                slot = self._free_slots.pop()
+                self._slot_tickets[slot] += 1
+                ticket = self._slot_tickets[slot]
+                self._cancel_flags[slot] = 0
+            request.cancel_slot = slot
+            future = self._executor.submit(_worker_solve, request)
+        if slot >= 0:
+            cancel_token.on_cancel(partial(self._signal_cancel, slot, ticket))
+            future.add_done_callback(lambda _f: self._release_slot(slot, ticket))
+        return future, generation
+
+    def _signal_cancel(self, slot: int, ticket: int) -> None:
+        with self._lock:
+            # 槽位已被后续请求复用时忽略迟到的取消 / Ignore late cancels after slot reuse
+            if self._slot_tickets[slot] == ticket:
+                self._cancel_flags[slot] = 1
+
+    def _release_slot(self, slot: int, ticket: int) -> None:
+        with self._lock:
+            if self._slot_tickets[slot] == ticket:
+                self._slot_tickets[slot] += 1
+                self._free_slots.append(slot)
+
+    def warmup(self) -> None:
+        """启动全部 worker 并等待图案库加载完成 / Start all workers and wait for DB load."""
+        with self._lock:
+            futures = [self._executor.submit(_worker_ping) for _ in range(self.workers)]
+        for fut in futures:
+            fut.result()
+
+    def restart(self, generation: int | None = None) -> bool:
+        """worker 异常退出（如 OOM）后重建进程池 / Rebuild after a worker died (e.g. OOM kill).
+
+        给定 ``generation`` 时仅当它仍是当前进程池才重建：同一次崩溃使多个 future 失败，只重建一次。
+        With ``generation``, rebuilds only while it is still the current executor, so one crash
+        failing several futures restarts once. Returns whether a rebuild happened.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+            self._generation += 1
+            return True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool_lock = threading.Lock()
+_pool_instance: SolverProcessPool | None = None
+
+
+def get_solver_pool() -> SolverProcessPool | None:
+    """按配置懒加载进程池；``solver_process_workers`` 为 0 时返回 None / Lazy pool, None when disabled."""
+    global _pool_instance
+    workers = int(get_settings().solver_process_workers)
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool_instance is None:
+            _pool_instance = SolverProcessPool(workers)
+        return _pool_instance
+
+
+def shutdown_solver_pool() -> None:
+    """关闭进程池（应用退出时）/ Shut down the pool on application exit."""
+    global _pool_instance
+    with _pool_lock:
+        if _pool_instance is not None:
+            _pool_instance.shutdown()
+            _pool_instance = None
+
+
+def warmup_solver() -> None:
+    """预热解算：进程池启用时预热 worker，否则预热本进程单例 / Warm workers, or the in-process singleton."""
+    pool = get_solver_pool()
+    if pool is None:
+        warmup_tetra3()
+    else:
+        pool.warmup()
+
+
+class AsyncPlateSolver:
+    """``PlateSolver`` 的异步门面：优先进程池，未启用时在线程中调用原求解器。
+
+    Async façade over ``PlateSolver`` with the same ``SolveResult`` contract. Uses the process pool
+    when enabled, otherwise runs the wrapped solver on ``executor`` threads. The ``*_sync`` variants
+    serve callers already on a worker thread (batch jobs) and block without holding the GIL.
+    """
+
+    def __init__(
+        self, solver: PlateSolver, executor: ThreadPoolExecutor | None = None
+    ) -> None:
+        self.solver = solver
+        self._executor = executor
+
+    async def solve(
+        self, stars: list[StarPoint], frame_shape: tuple[int, ...], **kwargs: Any
+    ) -> SolveResult:
+        """异步 ``PlateSolver.solve``；被取消时同时取消解算 / Async ``solve``; cancelling stops the solve."""
+        token = kwargs.setdefault("cancel_token", SolveCancelToken())
+        pool = get_solver_pool()
+        try:
+            if pool is None:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self._executor,
+                    partial(self.solver.solve, stars, frame_shape, **kwargs),
+                )
+            request = self._request(
+                "solve", _stars_to_array(stars), frame_shape, kwargs
+            )
+            return await asyncio.wrap_future(self._dispatch(pool, request, token))
+        except asyncio.CancelledError:
+            token.cancel()
+            raise
+
+    async def solve_from_bgr_frame(
+        self, frame_bgr: np.ndarray, max_stars: int, **kwargs: Any
+    ) -> SolveResult:
+        """异步 ``PlateSolver.solve_from_bgr_frame`` / Async ``solve_from_bgr_frame``."""
+        token = kwargs.setdefault("cancel_token", SolveCancelToken())
+        pool = get_solver_pool()
+        try:
+            if pool is None:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self._executor,
+                    partial(
+                        self.solver.solve_from_bgr_frame, frame_bgr, max_stars, **kwargs
+                    ),
+                )
+            kwargs["max_stars"] = max_stars
+            request = self._request(
+                "solve_from_bgr_frame", frame_bgr, tuple(frame_bgr.shape), kwargs
+            )
+            return await asyncio.wrap_future(self._dispatch(pool, request, token))
+        except asyncio.CancelledError:
+            token.cancel()
+            raise
+
+    def solve_sync(
+        self, stars: list[StarPoint], frame_shape: tuple[int, ...], **kwargs: Any
+    ) -> SolveResult:
+        """阻塞版 ``solve``（供工作线程调用）/ Blocking ``solve`` for worker threads."""
+        pool = get_solver_pool()
+        if pool is None:
+            return self.solver.solve(stars, frame_shape, **kwargs)
+        token = kwargs.get("cancel_token")
+        request = self._request("solve", _stars_to_array(stars), frame_shape, kwargs)
+        return self._dispatch(pool, request, token).result()
+
+    def solve_from_bgr_frame_sync(
+        self, frame_bgr: np.ndarray, max_stars: int, **kwargs: Any
+    ) -> SolveResult:
+        """阻塞版 ``solve_from_bgr_frame`` / Blocking ``solve_from_bgr_frame``."""
+        pool = get_solver_pool()
+        if pool is None:
+            return self.solver.solve_from_bgr_frame(frame_bgr, max_stars, **kwargs)
+        token = kwargs.get("cancel_token")
+        kwargs["max_stars"] = max_stars
+        request = self._request(
+            "solve_from_bgr_frame", frame_bgr, tuple(frame_bgr.shape), kwargs
+        )
+        return self._dispatch(pool, request, token).result()
+
+    def _request(
+        self,
+        method: str,
+        image: np.ndarray,
+        frame_shape: tuple[int, ...],
+        kwargs: dict[str, Any],
+    ) -> _SolveRequest:
+        prior = kwargs.pop("prior", None)
+        background = kwargs.pop("background", None)
+        hot_pixels = kwargs.pop("hot_pixels", None)
+        kwargs.pop("cancel_token", None)
+        options = dict(kwargs)
+        options.update(
+            fov_deg=self.solver.fov_deg,
+            fov_max_error_deg=self.solver.fov_max_error_deg,
+            default_timeout_ms=self.solver.solve_timeout_ms,
+        )
+        options.setdefault("centroid_rejection_level", 3)
+        options.setdefault("hint_ra_deg", 0.0)
+        options.setdefault("hint_dec_deg", 0.0)
+        return _SolveRequest(
+            method=method,
+            image=np.ascontiguousarray(image),
+            frame_shape=tuple(int(v) for v in frame_shape),
+            options=_pack_numbers(options, _REQUEST_OPTIONS),
+            solve_source=str(kwargs.get("solve_source", "full")),
+            centroid_params=kwargs.get("centroid_params"),
+            prior=pack_solve_result(prior) if prior is not None else None,
+            background=background,
+            hot_pixels=hot_pixels,
+        )
+
+    @staticmethod
+    def _dispatch(
+        pool: SolverProcessPool,
+        request: _SolveRequest,
+        cancel_token: SolveCancelToken | None = None,
+    ) -> Future[SolveResult]:
+        """提交到进程池并在完成时解包 / Submit to the pool and unpack on completion."""
+        out: Future[SolveResult] = Future()
+        out.set_running_or_notify_cancel()
+
+        def _done(fut: Future[PackedSolveResult], generation: int) -> None:
+            try:
+                out.set_result(unpack_solve_result(fut.result()))
+            except BrokenProcessPool as exc:
+                if pool.restart(generation):
+                    logger.warning(
+                        f"解算 worker 异常退出，重建进程池 / Solver worker died, restarting: {exc}"
+                    )
+                out.set_result(_worker_error_result(request, exc))
+            except BaseException as exc:
+                # 传给调用方 / propagate to caller
+                out.set_exception(exc)
+
+        generation = pool.generation
+        try:
+            future, generation = pool.submit(request, cancel_token)
+        except BrokenProcessPool as exc:
+            pool.restart(generation)
+            out.set_result(_worker_error_result(request, exc))
+            return out
+        future.add_done_callback(partial(_done, generation=generation))
+        return out
+
+
+def _worker_error_result(request: _SolveRequest, exc: BaseException) -> SolveResult:
+    """worker 崩溃时的结果（不抛出，与其它错误状态一致）/ Result when the worker crashed."""
+    return SolveResult(
+        ra_deg=0.0,
+        dec_deg=0.0,
+        detected_stars=0,
+        solve_source=request.solve_source,
+        status="WORKER_ERROR",
+        status_code=None,
+        roll_deg=None,
+        fov_deg=None,
+        matches=None,
+        prob=None,
+        rmse_arcsec=None,
+        t_solve_ms=None,
+        t_extract_ms=None,
+        t_preprocess_ms=None,
+        raw={"error": str(exc) or type(exc).__name__},
+    )
@@ -0,0 +1,183 @@
+"""
+设备配置图案库 / Device-profile pattern database
+
+OGScope 的视场（``solver_fov_deg``）已知且误差小，极轴校准又几乎只看天极附近，通用的
+全视场、全天图案库大部分内容用不到。本模块按 ``Settings`` 生成只含当前配置所需部分的库：
+``solver_fov_deg`` 附近的视场带、星等极限与可选赤纬带。文件名由这些参数决定，
+``_resolve_database_path`` 在配置未显式指定图案库且该文件存在时自动选用，参数改变后自动回退到默认库。
+OGScope runs with a known FOV and polar alignment looks near the pole, so most of the
+general-purpose DB is never used. This builds the subset the configured optics need; its
+file name encodes the profile so the solver picks it up only while the settings match.
+
+Example:
+    python -m ogscope.algorithms.plate_solve.profile_database data/plate_solve/hip_main.dat --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+from ogscope.config import Settings, get_settings
+
+
+def _name_part(value: float) -> str:
+    """文件名中的数值（小数点写作 p）/ Number for a file name, with ``p`` for the decimal point."""
+    return f"{value:g}".replace(".", "p")
+
+
+@dataclass(slots=True)
+class DatabaseProfile:
+    """设备图案库的覆盖范围 / Coverage of a device-profile pattern database."""
+
+    min_fov_deg: float
+    max_fov_deg: float
+    star_max_magnitude: float | None = None
+    dec_min_deg: float | None = None
+    dec_max_deg: float | None = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> DatabaseProfile:
+        """从应用配置构造 / Build from application settings."""
+        fov = float(settings.solver_fov_deg)
+        margin = max(0.0, float(settings.solver_profile_fov_margin_deg))
+        return cls(
+            min_fov_deg=max(fov - margin, 0.1 * fov),
+            max_fov_deg=fov + margin,
+            star_max_magnitude=settings.solver_profile_star_max_magnitude,
+            dec_min_deg=settings.solver_profile_dec_min_deg,
+            dec_max_deg=settings.solver_profile_dec_max_deg,
+        )
+
+    @property
+    def range_dec(self) -> tuple[float, float] | None:
+        """视场中心赤纬带；None 为全天 / Field-centre Dec band, None for the whole sky."""
+        if self.dec_min_deg is None and self.dec_max_deg is None:
+            return None
+        low = -90.0 if self.dec_min_deg is None else float(self.dec_min_deg)
+        high = 90.0 if self.dec_max_deg is None else float(self.dec_max_deg)
+        return (low, high)
+
+    @property
+    def file_name(self) -> str:
+        """由覆盖范围决定的 .npz 文件名 / ``.npz`` file name derived from the coverage."""
+        mag = (
+            "auto"
+            if self.star_max_magnitude is None
+            else _name_part(self.star_max_magnitude)
+        )
+        name = (
+            f"profile_fov{_name_part(round(self.min_fov_deg, 3))}"
+            f"to{_name_part(round(self.max_fov_deg, 3))}_mag{mag}"
+        )
+        if self.range_dec is not None:
+            name += (
+                f"_dec{_name_part(self.range_dec[0])}to{_name_part(self.range_dec[1])}"
+            )
+        return f"{name}.npz"
+
+
+def profile_database_path(settings: Settings) -> Path:
+    """当前配置对应的设备图案库路径（不保证存在）/ Device-profile DB path for these settings (may not exist)."""
+    return settings.plate_solve_dir / DatabaseProfile.from_settings(settings).file_name
+
+
+def build_profile_database(
+    settings: Settings,
+    star_catalog: Path | None = None,
+    *,
+    workers: int = 1,
+    compact: bool = True,
+    lattice_field_oversampling: int = 100,
+    patterns_per_lattice_field: int = 50,
+    verification_stars_per_fov: int = 150,
+    epoch_proper_motion: float | str | None = "now",
+) -> Path:
+    """生成当前配置的设备图案库，返回其路径 / Generate the device-profile DB and return its path.
+
+    ``star_catalog`` 默认为 ``plate_solve_dir/hip_main.dat``；``compact`` 时以紧凑布局保存。
+    ``star_catalog`` defaults to ``plate_solve_dir/hip_main.dat``; ``compact`` saves the compact layout.
+    """
+    from tetra3 import Tetra3, compact_database  # noqa: PLC0415 — after vendor path
+
+    profile = DatabaseProfile.from_settings(settings)
+    out = profile_database_path(settings)
+    catalog = star_catalog or settings.plate_solve_dir / "hip_main.dat"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    generated = out.with_name(f"{out.stem}_full.npz") if compact else out
+
+    t0 = time.perf_counter()
+    Tetra3(load_database=None).generate_database(
+        max_fov=profile.max_fov_deg,
+        min_fov=profile.min_fov_deg,
+        star_catalog=Path(catalog),
+        save_as=generated,
+        star_max_magnitude=profile.star_max_magnitude,
+        lattice_field_oversampling=lattice_field_oversampling,
+        patterns_per_lattice_field=patterns_per_lattice_field,
+        verification_stars_per_fov=verification_stars_per_fov,
+        epoch_proper_motion=epoch_proper_motion,
+        range_dec=profile.range_dec,
+        workers=workers,
+    )
+    if compact:
+        compact_database(generated, out)
+        generated.unlink()
+    logger.info(
+        f"设备图案库已生成 / Device-profile DB written: {out} "
+        f"({out.stat().st_size / 1e6:.1f} MB, {time.perf_counter() - t0:.1f} s)"
+    )
+    return out
+
+
+def main() -> None:
+    """命令行入口 / Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description="按 OGSCOPE_* 配置生成设备图案库 / Build the device-profile pattern DB "
+        "for the current OGSCOPE_* settings"
+    )
+    parser.add_argument(
+        "STAR_CATALOG",
+        type=Path,
+        nargs="?",
+        default=None,
+        help="星表文件，默认 plate_solve_dir/hip_main.dat / Star catalog file",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="生成进程数 / Worker processes"
+    )
+    parser.add_argument(
+        "--no-compact",
+        action="store_true",
+        help="保存为普通哈希表布局 / Keep the plain hash-table layout",
+    )
+    parser.add_argument("--lattice-field-oversampling", type=int, default=100)
+    parser.add_argument("--patterns-per-lattice-field", type=int, default=50)
+    parser.add_argument("--verification-stars-per-fov", type=int, default=150)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    settings = get_settings()
+    out = build_profile_database(
+        settings,
+        args.STAR_CATALOG,
+        workers=args.workers,
+        compact=not args.no_compact,
+        lattice_field_oversampling=args.lattice_field_oversampling,
+        patterns_per_lattice_field=args.patterns_per_lattice_field,
+        verification_stars_per_fov=args.verification_stars_per_fov,
+    )
+    if settings.solver_tetra_database_path is not None:
+        logger.warning(
+            "已配置 solver_tetra_database_path，设备图案库不会被自动选用 / "
+            f"solver_tetra_database_path is set, so {out.name} is not picked up automatically"
+        )
+
+
+if __name__ == "__main__":
+    main()
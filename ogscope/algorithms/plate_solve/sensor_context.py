@@ -186,6 +186,19 @@ def predict_from_solve_context(
     }
 
 
+def sensor_hint(solve_context: Any) -> tuple[float, float] | None:
+    """可信传感器预测的 (RA, Dec)，供解算剪枝天区；不可用时 None。
+
+    Predicted (RA, Dec) for pruning the solver's sky search; None when unavailable.
+    """
+    if solve_context is None:
+        return None
+    prediction = predict_from_solve_context(solve_context)
+    if prediction.get("sensor_status") != "predicted":
+        return None
+    return float(prediction["predicted_ra_deg"]), float(prediction["predicted_dec_deg"])
+
+
 def attach_sensor_prediction(
     row: dict[str, Any],
     solve_context: Any,
@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import base64
 import dataclasses
+import math
 import threading
 import time
 from dataclasses import dataclass, field
@@ -14,10 +15,19 @@ from typing import Any
 
 import cv2
 import numpy as np
-from PIL import Image
-
+from loguru import logger
+
+from ogscope.algorithms.plate_solve.background import (
+    BackgroundSnapshot,
+    apply_background,
+    estimate_small_background,
+    frame_luminance,
+    single_frame_background,
+)
+from ogscope.algorithms.plate_solve.cancellation import SolveCancelToken
 from ogscope.algorithms.plate_solve.centroid_quality import filter_centroids_yx
-from ogscope.algorithms.star_extract import StarPoint
+from ogscope.algorithms.plate_solve.profile_database import profile_database_path
+from ogscope.algorithms.star_extract import HotPixelMap, StarPoint
 from ogscope.config import Settings, get_settings
 
 _STATUS_NAMES: dict[int, str] = {
@@ -52,15 +62,76 @@ _tetra_load_key: str | None = None
 
 
 def _resolve_database_path(settings: Settings) -> Path | str:
-    """选择图案库路径：环境配置 > data/plate_solve > 包内默认名 / Resolve pattern DB path."""
+    """选择图案库路径：环境配置 > 设备图案库 > data/plate_solve > 包内默认名 / Resolve pattern DB path.
+
+    设备图案库为与当前视场/星等/赤纬配置匹配的 ``profile_*.npz``（见 ``profile_database``）。
+    开启 ``solver_database_mmap`` 时，同名内存映射目录（``default_database/``）优先于 ``.npz``。
+    The device-profile DB is the ``profile_*.npz`` matching the current optics settings.
+    With ``solver_database_mmap``, a sibling mmap directory (``default_database/``) wins over ``.npz``.
+    """
     if settings.solver_tetra_database_path is not None:
-        return settings.solver_tetra_database_path.expanduser().resolve()
+        configured = settings.solver_tetra_database_path.expanduser().resolve()
+        return _prefer_mmap_database(settings, configured)
+    profile = profile_database_path(settings)
+    if profile.is_file() or (
+        settings.solver_database_mmap and _is_mmap_database(profile.with_suffix(""))
+    ):
+        return _prefer_mmap_database(settings, profile)
     candidate = settings.plate_solve_dir / "default_database.npz"
-    if candidate.is_file():
-        return candidate
+    if candidate.is_file() or (
+        settings.solver_database_mmap and _is_mmap_database(candidate.with_suffix(""))
+    ):
+        return _prefer_mmap_database(settings, candidate)
     return "default_database"
 
 
+def _is_mmap_database(path: Path) -> bool:
+    """目录是否为完整的内存映射图案库 / Whether path is a complete mmap database directory."""
+    return (path / "props_packed.npy").is_file() and (
+        path / "pattern_catalog.npy"
+    ).is_file()
+
+
+def _prefer_mmap_database(settings: Settings, path: Path) -> Path:
+    """.npz 旁若有不旧于它的映射目录则改用之 / Use the sibling mmap dir when not older than the .npz."""
+    if not settings.solver_database_mmap or path.is_dir():
+        return path
+    mmap_dir = path.with_suffix("")
+    npz = path.with_suffix(".npz")
+    if not _is_mmap_database(mmap_dir):
+        return path
+    if (
+        npz.is_file()
+        and npz.stat().st_mtime > (mmap_dir / "props_packed.npy").stat().st_mtime
+    ):
+        return path
+    return mmap_dir
+
+
+def _convert_database_if_needed(settings: Settings, path: Path | str) -> Path | str:
+    """首次加载 .npz 时转换为映射目录；失败则沿用 .npz / One-time .npz → mmap conversion, fallback on failure."""
+    if not settings.solver_database_mmap or not isinstance(path, Path):
+        return path
+    npz = path.with_suffix(".npz")
+    if path.is_dir() or not npz.is_file():
+        return path
+    from tetra3 import convert_database_to_mmap  # noqa: PLC0415 — after vendor path
+
+    try:
+        t0 = time.perf_counter()
+        out_dir = convert_database_to_mmap(npz)
+    except (OSError, ValueError) as exc:
+        logger.warning(
+            f"图案库转换为内存映射失败，继续使用 .npz / mmap DB conversion failed, keep .npz: {exc}"
+        )
+        return path
+    logger.info(
+        f"图案库已转换为内存映射目录 / Pattern DB converted to mmap dir: {out_dir} "
+        f"({(time.perf_counter() - t0) * 1000.0:.0f} ms)"
+    )
+    return out_dir
+
+
 def _get_tetra3(settings: Settings) -> Any:
     """懒加载单例 / Lazy singleton Tetra3."""
     global _tetra_instance, _tetra_load_key
@@ -70,9 +141,11 @@ def _get_tetra3(settings: Settings) -> Any:
             return _tetra_instance
         from tetra3 import Tetra3  # noqa: PLC0415 — after vendor path
 
-        load_arg: Path | str = _resolve_database_path(settings)
+        load_arg = _convert_database_if_needed(
+            settings, _resolve_database_path(settings)
+        )
         _tetra_instance = Tetra3(load_arg)
-        _tetra_load_key = key
+        _tetra_load_key = str(_resolve_database_path(settings))
         return _tetra_instance
 
 
@@ -96,6 +169,7 @@ class CentroidExtractionParams:
     bg_sub_mode: str = "local_mean"
     sigma_mode: str = "global_root_square"
     max_axis_ratio: float | None = None
+    backend: str = "opencv"
 
     @classmethod
     def from_settings(cls, settings: Settings) -> CentroidExtractionParams:
@@ -109,6 +183,7 @@ class CentroidExtractionParams:
             bg_sub_mode=settings.solver_centroid_bg_sub_mode,
             sigma_mode=settings.solver_centroid_sigma_mode,
             max_axis_ratio=settings.solver_centroid_max_axis_ratio,
+            backend=settings.solver_centroid_backend,
         )
 
     def to_get_centroids_kwargs(self) -> dict[str, Any]:
@@ -121,6 +196,7 @@ class CentroidExtractionParams:
             "binary_open": self.binary_open,
             "max_area": self.max_area,
             "min_area": self.min_area,
+            "backend": self.backend,
         }
         if self.max_axis_ratio is not None:
             kwargs["max_axis_ratio"] = self.max_axis_ratio
@@ -153,6 +229,52 @@ def resize_bgr_for_extraction(
     return img, (h0, w0)
 
 
+def luminance_for_extraction(
+    frame: np.ndarray,
+    max_image_side: int,
+    *,
+    large_scale_bg_subtract: bool = False,
+    downsample_max_side: int = 256,
+    background: BackgroundSnapshot | None = None,
+    hot_pixels: HotPixelMap | None = None,
+) -> tuple[np.ndarray, tuple[int, int]]:
+    """提星输入：单通道亮度（uint8/uint16），返回 (亮度, 原始高宽) / Single-channel luminance for extraction.
+
+    单通道帧无需缩放时原样返回视图（零拷贝）；BGR/BGRA 帧先转亮度再以 INTER_AREA 缩放单通道，
+    不再经 RGB/PIL 与 Tetra3 内的浮点三通道亮度计算；其他通道数抛出 ValueError。
+    Mono frames that fit are returned as-is (no copy); BGR/BGRA frames are converted to luminance
+    once and only that channel is resized, replacing the RGB/PIL round trip. Other channel
+    counts raise ``ValueError``.
+    给定 ``background``（:class:`TemporalBackgroundModel` 快照）时以其展平亮度，不再逐帧估计背景。
+    With a ``background`` snapshot the luminance is flattened with it instead of per-frame estimation.
+    单通道帧开启 ``large_scale_bg_subtract`` 且无快照时，以当前帧估计的背景做同样的减法展平。
+    Mono frames with ``large_scale_bg_subtract`` and no snapshot are flattened the same way with
+    a background estimated from the frame itself.
+    ``hot_pixels`` 在缩放前于原始画幅上修补热像素 / ``hot_pixels`` are repaired at full size before resizing.
+    """
+    h0, w0 = int(frame.shape[0]), int(frame.shape[1])
+    is_bgr = frame.ndim == 3 and frame.shape[2] == 3
+    if is_bgr and large_scale_bg_subtract and background is None:
+        if hot_pixels is not None:
+            frame = hot_pixels.repair(frame)
+        img, _ = resize_bgr_for_extraction(frame, max_image_side)
+        img = subtract_large_scale_background_bgr(
+            img, downsample_max_side=downsample_max_side
+        )
+        return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY), (h0, w0)
+    gray = frame_luminance(frame)
+    if hot_pixels is not None:
+        # 彩色帧转出的亮度是新数组，可原地修补 / Luminance from colour is a fresh array, repair in place
+        converted = frame.ndim == 3 and frame.shape[2] > 1
+        gray = hot_pixels.repair(gray, copy=not converted)
+    gray, _ = resize_bgr_for_extraction(gray, max_image_side)
+    if background is None and large_scale_bg_subtract:
+        background = single_frame_background(gray, downsample_max_side)
+    if background is not None:
+        gray = apply_background(gray, background)
+    return gray, (h0, w0)
+
+
 def subtract_large_scale_background_bgr(
     frame_bgr: np.ndarray,
     *,
@@ -167,13 +289,7 @@ def subtract_large_scale_background_bgr(
         return frame_bgr
     h, w = int(frame_bgr.shape[0]), int(frame_bgr.shape[1])
     gray = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY).astype(np.float32)
-    side = max(h, w)
-    sc = min(1.0, float(downsample_max_side) / float(side))
-    sw = max(1, int(round(w * sc)))
-    sh = max(1, int(round(h * sc)))
-    small = cv2.resize(gray, (sw, sh), interpolation=cv2.INTER_AREA)
-    sigma_s = max(2.0, float(min(sw, sh)) / 32.0)
-    bg_small = cv2.GaussianBlur(small, (0, 0), sigmaX=sigma_s, sigmaY=sigma_s)
+    bg_small = estimate_small_background(gray, downsample_max_side)
     bg = cv2.resize(bg_small, (w, h), interpolation=cv2.INTER_LINEAR).astype(np.float32)
     mean_gray = float(np.mean(gray))
     # 复用背景数组承载校正亮度和比例，减少两张全画幅float32临时图
@@ -200,19 +316,18 @@ def centroid_extraction_preview(
     """提星预览：二值掩膜 PNG（base64），不解算 Tetra3 / Preview extraction mask without plate solve."""
     from tetra3 import get_centroids_from_image  # noqa: PLC0415
 
-    img, (h0, w0) = resize_bgr_for_extraction(frame_bgr, max_image_side)
-    if large_scale_bg_subtract:
-        img = subtract_large_scale_background_bgr(
-            img, downsample_max_side=downsample_max_side
-        )
-    height, width = int(img.shape[0]), int(img.shape[1])
-    rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-    pil_image = Image.fromarray(rgb)
+    gray, (h0, w0) = luminance_for_extraction(
+        frame_bgr,
+        max_image_side,
+        large_scale_bg_subtract=large_scale_bg_subtract,
+        downsample_max_side=downsample_max_side,
+    )
+    height, width = int(gray.shape[0]), int(gray.shape[1])
     kwargs = centroid_params.to_get_centroids_kwargs()
     t0 = time.perf_counter()
     try:
         centroids, images_dict = get_centroids_from_image(
-            pil_image,
+            gray,
             max_returned=max_stars,
             return_images=True,
             **kwargs,
@@ -274,6 +389,9 @@ class SolveResult:
     solve_overlay: dict[str, Any] | None = None
     # 质心质量过滤（过密/共线）/ Centroid quality (dense + collinear)
     centroid_quality: dict[str, Any] | None = None
+    # full=图案哈希全量搜索，tracking=由上一姿态跟踪，propagated=由星点跟踪变换推算（未经解算）
+    # full hash search, tracking from prior, or propagated from the star-tracker transform (no solve)
+    solve_mode: str = "full"
 
     def to_dict(self) -> dict[str, Any]:
         base = {
@@ -292,6 +410,7 @@ class SolveResult:
             "t_extract_ms": self.t_extract_ms,
             "t_preprocess_ms": self.t_preprocess_ms,
             "large_scale_bg_subtract": self.large_scale_bg_subtract,
+            "solve_mode": self.solve_mode,
         }
         if self.centroid_quality is not None:
             base["centroid_quality"] = _json_safe(self.centroid_quality)
@@ -325,17 +444,26 @@ class PlateSolver:
         frame_shape: tuple[int, ...],
         hint_ra_deg: float = 0.0,
         hint_dec_deg: float = 0.0,
+        hint_radius_deg: float | None = None,
         solve_source: str = "full",
         fov_estimate: float | None = None,
         fov_max_error: float | None = None,
         solve_timeout_ms: int | None = None,
         centroid_rejection_level: int = 3,
+        prior: SolveResult | None = None,
+        cancel_token: SolveCancelToken | None = None,
     ) -> SolveResult:
         """解算画面中心赤道坐标 / Solve frame center RA/Dec.
 
-        hint_ra_deg / hint_dec_deg 对 Tetra3 无影响，仅保留 API 兼容 / Hints ignored by Tetra3.
+        给定 ``hint_radius_deg`` 时视 hint 为可信预测：先只搜索其半径（另加视场半对角线）内的
+        图案，再逐轮放宽至全天；为 None 时忽略 hint。
+        With ``hint_radius_deg`` the hint is a confident prediction: patterns within that radius
+        (plus the FOV half-diagonal) are searched first, widening to the whole sky; None ignores it.
+        给定上一帧成功结果 ``prior`` 时先做姿态跟踪，匹配数或 RMSE 退化才回退全量搜索。
+        With a successful ``prior``, tracks its attitude first and falls back to the full search
+        only when matches or RMSE degrade.
+        ``cancel_token`` 被取消时图案搜索以 CANCELLED 结束 / A cancelled token ends the search as CANCELLED.
         """
-        del hint_ra_deg, hint_dec_deg
         height, width = int(frame_shape[0]), int(frame_shape[1])
         level = max(1, min(5, int(centroid_rejection_level)))
         fov_est = float(fov_estimate if fov_estimate is not None else self.fov_deg)
@@ -406,13 +534,18 @@ class PlateSolver:
 
         try:
             t3 = self._tetra()
-            out = t3.solve_from_centroids(
+            out, mode = self._solve_centroids(
+                t3,
                 centroids,
                 (height, width),
-                fov_estimate=fov_est,
-                fov_max_error=fov_err,
-                solve_timeout=timeout,
-                return_matches=True,
+                fov_est,
+                fov_err,
+                timeout,
+                prior,
+                cancel_token,
+                _sky_prior(
+                    hint_ra_deg, hint_dec_deg, hint_radius_deg, fov_est, (height, width)
+                ),
             )
         except OSError as exc:
             return SolveResult(
@@ -442,6 +575,7 @@ class PlateSolver:
             frame_shape_original=(height, width),
             solve_shape=(height, width),
             centroid_quality=cq,
+            solve_mode=mode,
         )
 
     def solve_from_bgr_frame(
@@ -450,6 +584,7 @@ class PlateSolver:
         max_stars: int,
         hint_ra_deg: float = 0.0,
         hint_dec_deg: float = 0.0,
+        hint_radius_deg: float | None = None,
         solve_source: str = "full",
         fov_estimate: float | None = None,
         fov_max_error: float | None = None,
@@ -458,15 +593,30 @@ class PlateSolver:
         centroid_params: CentroidExtractionParams | None = None,
         large_scale_bg_subtract: bool = False,
         centroid_rejection_level: int = 3,
+        prior: SolveResult | None = None,
+        cancel_token: SolveCancelToken | None = None,
+        background: BackgroundSnapshot | None = None,
+        hot_pixels: HotPixelMap | None = None,
     ) -> SolveResult:
         """与 Tetra3 ``solve_from_image`` 等价：内置 ``get_centroids_from_image`` + ``solve_from_centroids``.
 
-        Cedar-Solve / 官方示例走此提星链（局部背景减除、σ 阈值、连通域矩心），非 OpenCV OTSU。
-        Same pipeline as Tetra3 ``solve_from_image`` (local bg, sigma threshold, scipy labeling).
+        Cedar-Solve / 官方示例走此提星链（局部背景减除、σ 阈值、连通域矩心），非 OpenCV OTSU；
+        ``CentroidExtractionParams.backend`` 选择 scipy（上游）或等价的 OpenCV 向量化实现。
+        Same pipeline as Tetra3 ``solve_from_image`` (local bg, sigma threshold, labeling), run by
+        scipy (upstream) or the equivalent vectorized OpenCV backend.
         可选在提星前做大尺度背景减除（角部光晕等）/ Optional large-scale BG flattening before centroiding.
+        ``background`` 为时间背景模型快照，给定时替代逐帧背景估计 / ``background`` is a temporal
+        background snapshot that replaces per-frame estimation.
+        ``hot_pixels`` 为该画幅的热像素索引，提星前修补 / ``hot_pixels`` are repaired before extraction.
+        ``cancel_token`` 同时作用于提星与图案搜索 / ``cancel_token`` covers both extraction and search.
+        ``frame_bgr`` 也可为单通道 uint8/uint16 视图，直接作为亮度使用（见 :func:`luminance_for_extraction`）。
+        ``frame_bgr`` may also be a single-channel uint8/uint16 view, used directly as luminance.
+        ``hint_radius_deg`` 语义同 :meth:`solve` / ``hint_radius_deg`` as in :meth:`solve`.
         """
-        del hint_ra_deg, hint_dec_deg
-        from tetra3 import get_centroids_from_image  # noqa: PLC0415 — vendor path
+        from tetra3 import (  # noqa: PLC0415 — vendor path
+            SolveCancelled,
+            get_centroids_from_image,
+        )
 
         settings = get_settings()
         side_cap = (
@@ -487,15 +637,15 @@ class PlateSolver:
             else CentroidExtractionParams.from_settings(settings)
         )
         t0_preprocess = time.perf_counter()
-        img, (h0, w0) = resize_bgr_for_extraction(frame_bgr, side_cap)
-        if large_scale_bg_subtract:
-            img = subtract_large_scale_background_bgr(
-                img,
-                downsample_max_side=int(settings.solver_large_scale_bg_downsample),
-            )
-        height, width = int(img.shape[0]), int(img.shape[1])
-        rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        pil_image = Image.fromarray(rgb)
+        gray, (h0, w0) = luminance_for_extraction(
+            frame_bgr,
+            side_cap,
+            large_scale_bg_subtract=large_scale_bg_subtract,
+            downsample_max_side=int(settings.solver_large_scale_bg_downsample),
+            background=background,
+            hot_pixels=hot_pixels,
+        )
+        height, width = int(gray.shape[0]), int(gray.shape[1])
         t_preprocess_ms = (time.perf_counter() - t0_preprocess) * 1000.0
 
         fov_est = float(fov_estimate if fov_estimate is not None else self.fov_deg)
@@ -508,10 +658,30 @@ class PlateSolver:
         t0 = time.perf_counter()
         try:
             centroids = get_centroids_from_image(
-                pil_image,
+                gray,
                 max_returned=max_stars,
+                cancel_token=cancel_token,
                 **centroid_kw,
             )
+        except SolveCancelled:
+            return SolveResult(
+                ra_deg=0.0,
+                dec_deg=0.0,
+                detected_stars=0,
+                solve_source=solve_source,
+                status=_STATUS_NAMES[4],
+                status_code=4,
+                roll_deg=None,
+                fov_deg=None,
+                matches=None,
+                prob=None,
+                rmse_arcsec=None,
+                t_solve_ms=None,
+                t_extract_ms=(time.perf_counter() - t0) * 1000.0,
+                t_preprocess_ms=t_preprocess_ms,
+                large_scale_bg_subtract=large_scale_bg_subtract,
+                raw={"reason": "cancelled_during_extraction"},
+            )
         except (OSError, ValueError, RuntimeError) as exc:
             return SolveResult(
                 ra_deg=0.0,
@@ -582,13 +752,18 @@ class PlateSolver:
 
         try:
             t3 = self._tetra()
-            out = t3.solve_from_centroids(
+            out, mode = self._solve_centroids(
+                t3,
                 cyx_f,
                 (height, width),
-                fov_estimate=fov_est,
-                fov_max_error=fov_err,
-                solve_timeout=timeout,
-                return_matches=True,
+                fov_est,
+                fov_err,
+                timeout,
+                prior,
+                cancel_token,
+                _sky_prior(
+                    hint_ra_deg, hint_dec_deg, hint_radius_deg, fov_est, (height, width)
+                ),
             )
         except OSError as exc:
             return SolveResult(
@@ -622,8 +797,96 @@ class PlateSolver:
             solve_shape=(height, width),
             large_scale_bg_subtract=large_scale_bg_subtract,
             centroid_quality=cq,
+            solve_mode=mode,
         )
 
+    def _solve_centroids(
+        self,
+        t3: Any,
+        centroids_yx: np.ndarray,
+        size: tuple[int, int],
+        fov_est: float,
+        fov_err: float | None,
+        timeout: float,
+        prior: SolveResult | None,
+        cancel_token: SolveCancelToken | None = None,
+        sky_prior: tuple[float, float, float] | None = None,
+    ) -> tuple[dict[str, Any], str]:
+        """先尝试由上一姿态跟踪，质量不足再全量搜索 / Track from prior first, full search on degradation."""
+        if prior is not None:
+            tracked = _track_from_prior(t3, centroids_yx, size, prior, get_settings())
+            if tracked is not None:
+                return tracked, "tracking"
+        out = t3.solve_from_centroids(
+            centroids_yx,
+            size,
+            fov_estimate=fov_est,
+            fov_max_error=fov_err,
+            solve_timeout=timeout,
+            return_matches=True,
+            return_rotation_matrix=True,
+            cancel_token=cancel_token,
+            sky_prior=sky_prior,
+            sky_prior_widening=float(get_settings().solver_hint_widening),
+        )
+        return out, "full"
+
+
+def _sky_prior(
+    hint_ra_deg: float,
+    hint_dec_deg: float,
+    hint_radius_deg: float | None,
+    fov_deg: float,
+    size: tuple[int, int],
+) -> tuple[float, float, float] | None:
+    """可信 hint 转为 Tetra3 ``sky_prior``（半径含视场半对角线）/ Confident hint as Tetra3 ``sky_prior``."""
+    if hint_radius_deg is None or not hint_radius_deg > 0:
+        return None
+    height, width = size
+    half_diagonal = 0.5 * fov_deg * math.hypot(width, height) / max(width, 1)
+    return (
+        float(hint_ra_deg),
+        float(hint_dec_deg),
+        float(hint_radius_deg) + half_diagonal,
+    )
+
+
+def _track_from_prior(
+    t3: Any,
+    centroids_yx: np.ndarray,
+    size: tuple[int, int],
+    prior: SolveResult,
+    settings: Settings,
+) -> dict[str, Any] | None:
+    """跟踪解算；先验不可用或匹配数/RMSE 退化时返回 None / Tracking solve, None when unusable or degraded."""
+    rotation = prior.raw.get("rotation_matrix") if prior.raw else None
+    if (
+        not settings.solver_tracking_enabled
+        or prior.status_code != 1
+        or rotation is None
+        or prior.fov_deg is None
+    ):
+        return None
+    out = t3.solve_from_attitude(
+        centroids_yx,
+        size,
+        rotation,
+        prior.fov_deg,
+        distortion=_maybe_float(prior.raw.get("distortion")),
+        search_radius=float(settings.solver_tracking_search_radius),
+        return_matches=True,
+        return_rotation_matrix=True,
+    )
+    if _maybe_int(out.get("status")) != 1:
+        return None
+    matches = _maybe_int(out.get("Matches")) or 0
+    rmse = _maybe_float(out.get("RMSE"))
+    if matches < int(settings.solver_tracking_min_matches):
+        return None
+    if rmse is None or rmse > float(settings.solver_tracking_max_rmse_arcsec):
+        return None
+    return out
+
 
 def _make_solve_overlay(
     tetra_out: dict[str, Any],
@@ -697,6 +960,7 @@ def _tetra_dict_to_result(
     solve_shape: tuple[int, int] | None = None,
     large_scale_bg_subtract: bool = False,
     centroid_quality: dict[str, Any] | None = None,
+    solve_mode: str = "full",
 ) -> SolveResult:
     """Tetra 返回 dict → SolveResult / Map Tetra output dict to SolveResult."""
     st = out.get("status")
@@ -749,6 +1013,7 @@ def _tetra_dict_to_result(
         raw=raw,
         solve_overlay=overlay,
         centroid_quality=centroid_quality,
+        solve_mode=solve_mode,
     )
 
 
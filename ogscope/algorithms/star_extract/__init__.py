@@ -3,5 +3,16 @@
 """
 
 from ogscope.algorithms.star_extract.extractor import StarExtractor, StarPoint
+from ogscope.algorithms.star_extract.hot_pixels import (
+    HotPixelMap,
+    HotPixelStore,
+    build_hot_pixel_map,
+)
 
-__all__ = ["StarExtractor", "StarPoint"]
+__all__ = [
+    "HotPixelMap",
+    "HotPixelStore",
+    "StarExtractor",
+    "StarPoint",
+    "build_hot_pixel_map",
+]
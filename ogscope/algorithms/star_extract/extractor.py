@@ -4,7 +4,6 @@
 
 from __future__ import annotations
 
-import heapq
 import math
 from dataclasses import dataclass
 from typing import Any
@@ -12,6 +11,8 @@ from typing import Any
 import cv2
 import numpy as np
 
+from ogscope.algorithms.star_extract.hot_pixels import HotPixelMap
+
 
 @dataclass(slots=True)
 class StarPoint:
@@ -27,29 +28,48 @@ class StarPoint:
 
 
 class StarExtractor:
-    """简单星点提取 / Lightweight star extraction"""
+    """简单星点提取 / Lightweight star extraction
+
+    OTSU 二值化后用 ``cv2.connectedComponentsWithStats`` 一次得到各连通域的像素数、包围框与质心，
+    面积、形状与通量过滤全部按数组计算，不再逐轮廓调用 OpenCV，也无需在轮廓过多时缩小重试。
+    After OTSU, one ``cv2.connectedComponentsWithStats`` pass yields every blob's pixel count,
+    bounding box and centroid; area, shape and flux filters run on whole arrays instead of a
+    per-contour OpenCV loop, so there is no need to downscale and retry on noisy frames.
+    """
 
-    # 大图先缩小再提星，降低内存与轮廓数量 / Downscale before extract (RAM + contour count on SBCs)
+    # 大图先缩小再提星，降低内存 / Downscale large frames before extraction (RAM on SBCs)
     _max_input_side: int = 1920
-    # 椒盐噪声多时 OTSU 轮廓可上万，逐轮廓整幅 mask 会 OOM；过多则缩小重试 / Too many contours → downscale & retry
-    _max_contours_before_downscale: int = 6000
-    _min_side_for_downscale: int = 400
     # 几何过滤：与噪点体积区分，减轻 Tetra3 假星导致的 TIMEOUT / Reject noise blobs vs point-like stars
-    _min_star_area: float = 2.0
+    # 连通域像素数下限；开运算后最小残留为 2×2 块 / Min pixel count; opening leaves 2×2 blocks at least
+    _min_star_area: float = 5.0
     _max_star_area_frac: float = (
-        0.0035  # 单连通域面积不超过画幅比例 / Max contour area vs frame
+        0.0035  # 单连通域面积不超过画幅比例 / Max blob area vs frame
     )
-    _min_circularity: float = 0.12  # 4πA/P²；细长热噪、条纹偏低 / Elongated junk is low
+    # 形状代理：包围框填充率 × 短长边比 × 4/π（圆盘约 1）；细长热噪、条纹偏低
+    # Shape proxy: bbox fill × aspect × 4/π (≈1 for a disk); elongated junk and streaks are low
+    _min_circularity: float = 0.12
 
     def __init__(self, max_stars: int = 80) -> None:
         self.max_stars = max_stars
 
-    def extract(self, frame: np.ndarray) -> list[StarPoint]:
-        """提取星点 / Extract star points"""
+    def extract(
+        self,
+        frame: np.ndarray,
+        hot_pixels: HotPixelMap | None = None,
+        *,
+        coord_scale: float = 1.0,
+    ) -> list[StarPoint]:
+        """提取星点；``hot_pixels`` 为该画幅的热像素索引 / Extract star points, repairing ``hot_pixels`` first.
+
+        ``coord_scale`` 把坐标换算到更大的画幅（如 lores 帧上提星、按主流坐标输出）。
+        ``coord_scale`` maps coordinates to a larger frame, e.g. lores extraction in main coordinates.
+        """
         if frame.ndim == 3:
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         else:
             gray = frame.copy()
+        if hot_pixels is not None:
+            gray = hot_pixels.repair(gray, copy=False)
 
         h, w = gray.shape[:2]
         side = max(h, w)
@@ -60,69 +80,65 @@ class StarExtractor:
                 (max(1, int(w * scale0)), max(1, int(h * scale0))),
                 interpolation=cv2.INTER_AREA,
             )
-        return self._extract_gray_scaled(gray, scale=1.0)
+        return self._extract_gray_scaled(gray, scale=coord_scale)
 
     def _extract_gray_scaled(self, gray: np.ndarray, scale: float) -> list[StarPoint]:
         """在灰度图上提星；scale 为相对原图的坐标倍率 / Extract on gray; scale maps coords to original frame."""
         blur = cv2.GaussianBlur(gray, (3, 3), 0)
         _, binary = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        # 去掉孤立椒盐点，减少伪轮廓 / Morph open removes salt noise, fewer false contours
+        # 去掉孤立椒盐点，减少伪连通域 / Morph open removes salt noise, fewer false blobs
         _k = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2, 2))
         binary = cv2.morphologyEx(binary, cv2.MORPH_OPEN, _k)
 
-        contours, _ = cv2.findContours(
-            binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+        # Grana（BBDT）算法求统计量明显快于默认实现 / Grana (BBDT) is much faster with stats
+        count, _labels, stats, centroids = (
+            cv2.connectedComponentsWithStatsWithAlgorithm(
+                binary, 8, cv2.CV_32S, cv2.CCL_GRANA
+            )
         )
+        if count <= 1:
+            return []
 
         h, w = gray.shape[:2]
-        if (
-            len(contours) > self._max_contours_before_downscale
-            and min(h, w) > self._min_side_for_downscale
-        ):
-            small = cv2.resize(
-                gray,
-                (max(1, w // 2), max(1, h // 2)),
-                interpolation=cv2.INTER_AREA,
-            )
-            return self._extract_gray_scaled(small, scale * 2.0)
-
-        # 已缩到最小仍极多轮廓时只保留面积最大的一批，避免 OOM / Cap contour count if still huge
-        if len(contours) > self._max_contours_before_downscale:
-            contours = heapq.nlargest(
-                self._max_contours_before_downscale,
-                contours,
-                key=cv2.contourArea,
+        area = stats[1:, cv2.CC_STAT_AREA].astype(np.float64)
+        box_w = stats[1:, cv2.CC_STAT_WIDTH].astype(np.float64)
+        box_h = stats[1:, cv2.CC_STAT_HEIGHT].astype(np.float64)
+        shape_proxy = (
+            area
+            / (box_w * box_h)
+            * np.minimum(box_w, box_h)
+            / np.maximum(box_w, box_h)
+            * (4.0 / math.pi)
+        )
+        keep = (
+            (area >= self._min_star_area)
+            & (area <= self._max_star_area_frac * float(h * w))
+            & (shape_proxy >= self._min_circularity)
+        )
+        candidates = np.flatnonzero(keep)
+        if candidates.size == 0:
+            return []
+
+        # 前景亮度积分图上按包围框求和：孤立星点即其像素亮度和
+        # Box sums on the integral image of foreground brightness: the pixel sum for isolated stars
+        integral = cv2.integral(cv2.bitwise_and(gray, binary))
+        box = stats[candidates + 1]
+        x0 = box[:, cv2.CC_STAT_LEFT]
+        y0 = box[:, cv2.CC_STAT_TOP]
+        x1 = x0 + box[:, cv2.CC_STAT_WIDTH]
+        y1 = y0 + box[:, cv2.CC_STAT_HEIGHT]
+        flux = integral[y1, x1] - integral[y0, x1] - integral[y1, x0] + integral[y0, x0]
+        if candidates.size > self.max_stars:
+            top = np.argpartition(-flux, self.max_stars - 1)[: self.max_stars]
+        else:
+            top = np.arange(candidates.size)
+        order = top[np.argsort(-flux[top], kind="stable")]
+
+        # 像素中心对齐的缩放 / Scale about pixel centres
+        xy = (centroids[candidates[order] + 1] + 0.5) * scale - 0.5
+        return [
+            StarPoint(x=float(x), y=float(y), flux=float(f), area=float(a))
+            for (x, y), f, a in zip(
+                xy.tolist(), flux[order].tolist(), area[candidates[order]].tolist()
             )
-
-        frame_px = float(h * w)
-        max_area = self._max_star_area_frac * frame_px
-
-        points: list[StarPoint] = []
-        for contour in contours:
-            area = float(cv2.contourArea(contour))
-            if area < self._min_star_area:
-                continue
-            if area > max_area:
-                continue
-            peri = float(cv2.arcLength(contour, True))
-            if peri > 0.0:
-                circ = (4.0 * math.pi * area) / (peri * peri)
-                if circ < self._min_circularity:
-                    continue
-            m = cv2.moments(contour)
-            if m["m00"] <= 0:
-                continue
-            cx = float(m["m10"] / m["m00"]) * scale
-            cy = float(m["m01"] / m["m00"]) * scale
-            # 仅为轮廓包围框分配掩膜，避免每颗候选星都创建全画幅数组
-            # Allocate a mask only for the contour ROI instead of one full-frame array per star.
-            x, y, roi_w, roi_h = cv2.boundingRect(contour)
-            roi = gray[y : y + roi_h, x : x + roi_w]
-            roi_mask = np.zeros((roi_h, roi_w), dtype=np.uint8)
-            shifted = contour - np.array([[[x, y]]], dtype=contour.dtype)
-            cv2.drawContours(roi_mask, [shifted], -1, color=255, thickness=-1)
-            flux = float(cv2.mean(roi, mask=roi_mask)[0] * area)
-            points.append(StarPoint(x=cx, y=cy, flux=flux, area=area))
-
-        points.sort(key=lambda p: p.flux, reverse=True)
-        return points[: self.max_stars]
+        ]
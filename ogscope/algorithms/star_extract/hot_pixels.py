@@ -0,0 +1,274 @@
+"""
+热像素标定 / Hot-pixel calibration
+
+IMX327 高增益下有一批固定的热像素，每帧都会被提星当作星点，再由几何过滤剔除，
+同时抬高图案匹配的组合数。暗场（盖上镜头盖）连拍 N 帧取逐像素中值，明显高于本底的像素
+即为热像素；按 (分辨率, 方向, 曝光, 增益) 保存为扁平索引，提星前只改写这些像素（稀疏操作）。
+The IMX327 at high gain has a fixed set of hot pixels that every frame turns into false stars.
+A per-pixel median over N dark frames finds them; the flat index is stored per
+(resolution, orientation, exposure, gain) and only those pixels are rewritten before extraction.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+
+@dataclass(slots=True, frozen=True)
+class HotPixelMap:
+    """一组传感器参数下的热像素索引 / Hot-pixel index for one set of sensor parameters."""
+
+    width: int
+    height: int
+    exposure_us: int
+    analogue_gain: float
+    # 旋转/镜像标识，帧几何变化后索引失效 / Rotation/mirror tag; indices only hold for this geometry
+    orientation: str
+    # 行优先扁平索引（升序 uint32）/ Row-major flat indices (ascending uint32)
+    indices: np.ndarray
+
+    @property
+    def count(self) -> int:
+        return int(self.indices.size)
+
+    @property
+    def file_name(self) -> str:
+        """由标定参数决定的文件名 / File name derived from the calibration parameters."""
+        gain = f"{self.analogue_gain:g}".replace(".", "p")
+        return (
+            f"hot_pixels_{self.width}x{self.height}_{self.orientation}"
+            f"_exp{self.exposure_us}_gain{gain}.npz"
+        )
+
+    def repair(self, image: np.ndarray, *, copy: bool = True) -> np.ndarray:
+        """以四邻域最小值替换热像素 / Replace hot pixels with the minimum of their 4-neighbours.
+
+        只读写热像素及其邻居；画幅不符时原样返回。支持单通道与多通道（逐通道）图像。
+        Touches only the hot pixels and their neighbours; a frame of another size is returned
+        unchanged. Works per channel on multi-channel images.
+        """
+        h, w = int(image.shape[0]), int(image.shape[1])
+        if (h, w) != (self.height, self.width) or self.indices.size == 0:
+            return image
+        out = image if not copy and image.flags.c_contiguous else image.copy()
+        flat = out.reshape(h * w, -1)
+        idx = self.indices.astype(np.intp)
+        row, col = np.divmod(idx, w)
+        # 边缘像素用自身方向的邻居代替越界邻居 / At the border, reuse the opposite neighbour
+        left = np.where(col > 0, idx - 1, idx + 1)
+        right = np.where(col < w - 1, idx + 1, idx - 1)
+        up = np.where(row > 0, idx - w, idx + w)
+        down = np.where(row < h - 1, idx + w, idx - w)
+        values = np.minimum(
+            np.minimum(flat[left], flat[right]), np.minimum(flat[up], flat[down])
+        )
+        flat[idx] = values
+        return out
+
+    def scaled(self, width: int, height: int) -> HotPixelMap:
+        """映射到同一视场缩放后的画幅（如 lores 流）/ Remap onto a scaled frame of the same field.
+
+        每个热像素落入缩放后包含它的像素；缩小时多个热像素可能合并为一个。
+        Each hot pixel lands on the scaled pixel that contains it; when shrinking, several may
+        merge into one.
+        """
+        width, height = int(width), int(height)
+        if (width, height) == (self.width, self.height):
+            return self
+        row, col = np.divmod(self.indices.astype(np.int64), self.width)
+        row = np.minimum(row * height // self.height, height - 1)
+        col = np.minimum(col * width // self.width, width - 1)
+        return HotPixelMap(
+            width=width,
+            height=height,
+            exposure_us=self.exposure_us,
+            analogue_gain=self.analogue_gain,
+            orientation=self.orientation,
+            indices=np.unique(row * width + col).astype(np.uint32),
+        )
+
+
+def build_hot_pixel_map(
+    frames: list[np.ndarray],
+    *,
+    exposure_us: int,
+    analogue_gain: float,
+    orientation: str = "r0",
+    sigma: float = 6.0,
+    min_excess: float = 8.0,
+    max_fraction: float = 0.002,
+) -> HotPixelMap:
+    """由暗场帧生成热像素索引 / Build a hot-pixel index from dark frames.
+
+    逐像素取时间中值（排除宇宙线等偶发亮点），高于全图中值 ``max(sigma·σ, min_excess)`` 者为热像素，
+    σ 由 MAD 估计。本底超过满量程四分之一或超过 ``max_fraction`` 的像素被判为热像素时认为不是暗场，
+    抛出 ValueError。
+    A temporal per-pixel median drops transients; pixels above the frame median by
+    ``max(sigma·σ, min_excess)`` (σ from the MAD) are hot. Raises ValueError when the level is
+    above a quarter of full scale or more than ``max_fraction`` of the frame qualifies, i.e.
+    the frames were not dark.
+    """
+    if not frames:
+        raise ValueError("至少需要一帧暗场 / At least one dark frame is required")
+    grays = [f if f.ndim == 2 else f.max(axis=2) for f in frames]
+    shape = grays[0].shape
+    if any(g.shape != shape for g in grays):
+        raise ValueError("暗场帧尺寸不一致 / Dark frames differ in size")
+    median = np.median(np.stack(grays), axis=0).astype(np.float32)
+    level = float(np.median(median))
+    full_scale = (
+        float(np.iinfo(grays[0].dtype).max) if grays[0].dtype.kind in "ui" else 1.0
+    )
+    if level > 0.25 * full_scale:
+        raise ValueError(
+            "画面过亮，请盖上镜头盖后重试 / Frames are not dark; cover the lens and retry"
+        )
+    spread = 1.4826 * float(np.median(np.abs(median - level)))
+    threshold = level + max(sigma * spread, min_excess)
+    indices = np.flatnonzero(median.ravel() > threshold).astype(np.uint32)
+    if indices.size > max_fraction * median.size:
+        raise ValueError(
+            f"热像素比例 {indices.size / median.size:.2%} 过高，请盖上镜头盖后重试 / "
+            "Too many hot pixels; cover the lens and retry"
+        )
+    return HotPixelMap(
+        width=int(shape[1]),
+        height=int(shape[0]),
+        exposure_us=int(exposure_us),
+        analogue_gain=float(analogue_gain),
+        orientation=orientation,
+        indices=indices,
+    )
+
+
+class HotPixelStore:
+    """按传感器参数保存热像素索引（每组一个 .npz）/ Hot-pixel indices on disk, one ``.npz`` per set.
+
+    查找时要求分辨率与方向一致；曝光与增益取对数距离最近、且均在两倍以内的一组。
+    Lookups need the same resolution and orientation, then take the nearest set in log
+    exposure/gain, within a factor of two of each.
+    ``output_size`` 把所选索引映射到缩放画幅（如 lores），结果按索引缓存。
+    ``output_size`` remaps the chosen set onto a scaled frame (e.g. lores); results are cached.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._maps: list[HotPixelMap] | None = None
+        # (文件名, 输出尺寸) -> (源索引, 缩放索引) / (file name, output size) -> (source, scaled)
+        self._scaled: dict[
+            tuple[str, tuple[int, int]], tuple[HotPixelMap, HotPixelMap]
+        ] = {}
+
+    def _load_locked(self) -> list[HotPixelMap]:
+        if self._maps is None:
+            maps: list[HotPixelMap] = []
+            for path in sorted(self.root.glob("hot_pixels_*.npz")):
+                try:
+                    with np.load(path) as data:
+                        maps.append(
+                            HotPixelMap(
+                                width=int(data["width"]),
+                                height=int(data["height"]),
+                                exposure_us=int(data["exposure_us"]),
+                                analogue_gain=float(data["analogue_gain"]),
+                                orientation=str(data["orientation"]),
+                                indices=data["indices"].astype(np.uint32),
+                            )
+                        )
+                except (OSError, KeyError, ValueError):
+                    continue
+            self._maps = maps
+        return self._maps
+
+    def maps(self) -> list[HotPixelMap]:
+        """全部已保存的索引 / All stored indices."""
+        with self._lock:
+            return list(self._load_locked())
+
+    def save(self, hot_map: HotPixelMap) -> Path:
+        """保存（同参数覆盖）/ Save, replacing a set with the same parameters."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / hot_map.file_name
+        np.savez(
+            path,
+            width=hot_map.width,
+            height=hot_map.height,
+            exposure_us=hot_map.exposure_us,
+            analogue_gain=hot_map.analogue_gain,
+            orientation=hot_map.orientation,
+            indices=hot_map.indices,
+        )
+        with self._lock:
+            maps = [m for m in self._load_locked() if m.file_name != hot_map.file_name]
+            maps.append(hot_map)
+            self._maps = maps
+        return path
+
+    def clear(self) -> int:
+        """删除全部索引，返回删除数量 / Delete all indices; returns how many were removed."""
+        removed = 0
+        with self._lock:
+            for path in self.root.glob("hot_pixels_*.npz"):
+                path.unlink()
+                removed += 1
+            self._maps = []
+            self._scaled.clear()
+        return removed
+
+    def lookup(
+        self,
+        width: int,
+        height: int,
+        exposure_us: float,
+        analogue_gain: float,
+        orientation: str = "r0",
+        *,
+        output_size: tuple[int, int] | None = None,
+    ) -> HotPixelMap | None:
+        """最匹配的索引，没有则 None / Best matching index, or None.
+
+        ``width``/``height`` 为标定画幅；给定 ``output_size`` (宽, 高) 时返回映射到该尺寸的索引。
+        ``width``/``height`` are the calibrated size; with ``output_size`` (width, height) the
+        match is remapped to that size.
+        """
+        best: HotPixelMap | None = None
+        best_distance = math.inf
+        with self._lock:
+            candidates = self._load_locked()
+        for hot_map in candidates:
+            if (hot_map.width, hot_map.height, hot_map.orientation) != (
+                int(width),
+                int(height),
+                orientation,
+            ):
+                continue
+            d_exp = abs(
+                math.log(max(1.0, float(exposure_us)) / max(1, hot_map.exposure_us))
+            )
+            d_gain = abs(
+                math.log(
+                    max(1e-3, float(analogue_gain)) / max(1e-3, hot_map.analogue_gain)
+                )
+            )
+            if d_exp > math.log(2.0) or d_gain > math.log(2.0):
+                continue
+            if d_exp + d_gain < best_distance:
+                best, best_distance = hot_map, d_exp + d_gain
+        if best is None or output_size is None:
+            return best
+        size = (int(output_size[0]), int(output_size[1]))
+        key = (best.file_name, size)
+        with self._lock:
+            cached = self._scaled.get(key)
+        if cached is not None and cached[0] is best:
+            return cached[1]
+        scaled = best.scaled(*size)
+        with self._lock:
+            self._scaled[key] = (best, scaled)
+        return scaled
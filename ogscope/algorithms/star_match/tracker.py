@@ -1,25 +1,52 @@
 """
 快速跟踪器 / Fast tracker
+
+在上一帧与当前帧星点之间做 KD 树最近邻匹配，再用稳健最小二乘估计相似变换
+（平移、旋转、缩放）。全部为向量化 numpy/scipy 运算，80 颗星亚毫秒级。
+Matches stars between the previous and current frame with a KD-tree nearest-neighbour search,
+then fits a robust least-squares similarity transform (shift, rotation, scale). Everything is
+vectorized numpy/scipy, well under a millisecond for 80 stars.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, field
 from typing import Any
 
 import numpy as np
+from scipy.spatial import cKDTree
 
 from ogscope.algorithms.star_extract import StarPoint
 
+# 粗平移投票所用最亮星数 / Brightest stars per frame used by the coarse shift vote
+_VOTE_STARS = 12
+# 稳健拟合的迭代次数 / Refit rounds of the robust fit
+_FIT_ROUNDS = 2
+
 
 @dataclass(slots=True)
 class TrackResult:
-    """跟踪结果 / Tracking result"""
+    """跟踪结果 / Tracking result
+
+    变换把上一帧像素 ``z``（复数 ``x + iy``）映射为 ``a·z + b``，``a = scale·e^{i·rotation}``；
+    ``delta_x``/``delta_y`` 为参考点（默认画幅中心或上一帧星点质心）的位移。
+    The transform maps previous pixel ``z`` (complex ``x + iy``) to ``a·z + b`` with
+    ``a = scale·e^{i·rotation}``; ``delta_x``/``delta_y`` is the shift of the reference point.
+    """
 
     delta_x: float
     delta_y: float
     matched_points: int
     confidence: float
+    rotation_deg: float = 0.0
+    scale: float = 1.0
+    inliers: int = 0
+    # 内点残差 RMS（像素）/ Inlier residual RMS in pixels
+    residual_px: float | None = None
+    # 内点对，(N, 2) 的 x,y / Inlier pairs as (N, 2) x,y arrays
+    previous_xy: np.ndarray | None = field(default=None, repr=False)
+    current_xy: np.ndarray | None = field(default=None, repr=False)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -27,35 +54,184 @@ class TrackResult:
             "delta_y": self.delta_y,
             "matched_points": self.matched_points,
             "confidence": self.confidence,
+            "rotation_deg": self.rotation_deg,
+            "scale": self.scale,
+            "inliers": self.inliers,
+            "residual_px": self.residual_px,
         }
 
 
 class FastTracker:
-    """基于质心偏移的轻量跟踪 / Lightweight tracking based on centroid shift"""
+    """基于星点匹配的帧间相似变换估计 / Inter-frame similarity transform from matched stars
 
-    def track(self, previous: list[StarPoint], current: list[StarPoint]) -> TrackResult:
-        """估计帧间位移 / Estimate inter-frame shift"""
-        if not previous or not current:
-            return TrackResult(
-                delta_x=0.0, delta_y=0.0, matched_points=0, confidence=0.0
-            )
+    ``match_radius_px`` 为最近邻搜索半径；内点残差门限为 ``3σ``，限制在
+    ``[inlier_px, 3·inlier_px]``；内点少于 ``min_inliers`` 时置信度为 0。
+    ``match_radius_px`` bounds the nearest-neighbour search; the inlier residual gate is ``3σ``
+    clamped to ``[inlier_px, 3·inlier_px]``; fewer than ``min_inliers`` inliers gives zero
+    confidence.
+    """
 
-        prev = np.array(
-            [[p.x, p.y, max(p.flux, 1e-6)] for p in previous], dtype=np.float64
-        )
-        cur = np.array(
-            [[p.x, p.y, max(p.flux, 1e-6)] for p in current], dtype=np.float64
+    def __init__(
+        self,
+        match_radius_px: float = 24.0,
+        inlier_px: float = 2.0,
+        min_inliers: int = 6,
+    ) -> None:
+        self.match_radius_px = float(match_radius_px)
+        self.inlier_px = float(inlier_px)
+        self.min_inliers = max(3, int(min_inliers))
+
+    def track(
+        self,
+        previous: list[StarPoint],
+        current: list[StarPoint],
+        center: tuple[float, float] | None = None,
+    ) -> TrackResult:
+        """估计帧间变换 / Estimate the inter-frame transform
+
+        ``center`` 为报告位移的参考点 (x, y)，缺省为上一帧内点质心。
+        ``center`` is the (x, y) point whose shift is reported; defaults to the inlier centroid.
+        """
+        if len(previous) < self.min_inliers or len(current) < self.min_inliers:
+            return _failed(0)
+
+        prev = np.array([[p.x, p.y, p.flux] for p in previous], dtype=np.float64)
+        cur = np.array([[p.x, p.y, p.flux] for p in current], dtype=np.float64)
+        tree = cKDTree(cur[:, :2])
+
+        # 先按零位移匹配；不足一半时再用亮星投票位移匹配，取匹配更多者
+        # Match at zero shift first; below half, also try the bright-star vote and keep the better
+        best_i, best_j = _match(tree, prev[:, :2], self.match_radius_px)
+        if 2 * len(best_i) < min(len(prev), len(cur)):
+            shift = _vote_shift(prev, cur, self.match_radius_px / 4.0)
+            if shift is not None:
+                i, j = _match(tree, prev[:, :2] + shift, self.match_radius_px)
+                if len(i) > len(best_i):
+                    best_i, best_j = i, j
+        matched = len(best_i)
+        if matched < self.min_inliers:
+            return _failed(matched)
+
+        p = prev[best_i, 0] + 1j * prev[best_i, 1]
+        q = cur[best_j, 0] + 1j * cur[best_j, 1]
+        a, b, inlier = self._robust_fit(p, q)
+        if a is None:
+            return _failed(matched)
+
+        # 用拟合变换收紧半径重匹配，补回初始最近邻漏配的星
+        # Re-match under the fitted transform to recover stars the first pass missed
+        moved = a * (prev[:, 0] + 1j * prev[:, 1]) + b
+        i, j = _match(
+            tree, np.column_stack((moved.real, moved.imag)), 3.0 * self.inlier_px
         )
-        prev_cx = float(np.average(prev[:, 0], weights=prev[:, 2]))
-        prev_cy = float(np.average(prev[:, 1], weights=prev[:, 2]))
-        cur_cx = float(np.average(cur[:, 0], weights=cur[:, 2]))
-        cur_cy = float(np.average(cur[:, 1], weights=cur[:, 2]))
+        if len(i) >= int(inlier.sum()):
+            # 收紧半径内的匹配都在门限附近，一次最小二乘即可 / Tight-radius matches need one plain fit
+            rp = prev[i, 0] + 1j * prev[i, 1]
+            rq = cur[j, 0] + 1j * cur[j, 1]
+            refit = _fit_similarity(rp, rq)
+            if refit is not None:
+                a, b = refit
+                p, q = rp, rq
+                inlier = self._gate(np.abs(a * p + b - q))
+        p, q = p[inlier], q[inlier]
+        count = len(p)
+        if count < self.min_inliers:
+            return _failed(matched)
 
-        matched_points = min(len(previous), len(current))
-        confidence = min(1.0, matched_points / 20.0)
+        residual = float(np.sqrt(np.mean(np.abs(a * p + b - q) ** 2)))
+        ref = complex(*center) if center is not None else complex(p.mean())
+        shift = a * ref + b - ref
+        coverage = count / float(min(len(previous), len(current)))
+        confidence = min(1.0, coverage) * min(1.0, count / (2.0 * self.min_inliers))
         return TrackResult(
-            delta_x=cur_cx - prev_cx,
-            delta_y=cur_cy - prev_cy,
-            matched_points=matched_points,
-            confidence=confidence,
+            delta_x=float(shift.real),
+            delta_y=float(shift.imag),
+            matched_points=matched,
+            confidence=float(confidence),
+            rotation_deg=math.degrees(float(np.angle(a))),
+            scale=float(abs(a)),
+            inliers=count,
+            residual_px=residual,
+            previous_xy=np.column_stack((p.real, p.imag)),
+            current_xy=np.column_stack((q.real, q.imag)),
         )
+
+    def _robust_fit(
+        self, p: np.ndarray, q: np.ndarray
+    ) -> tuple[complex | None, complex, np.ndarray]:
+        """迭代剔除离群对的相似变换最小二乘 / Similarity least squares with iterative outlier rejection.
+
+        首轮以中位平移筛内点，之后按 :meth:`_gate` 门限重拟合。
+        The first round gates on the median shift; later rounds refit under :meth:`_gate`.
+        """
+        d = q - p
+        b = complex(_median(d.real), _median(d.imag))
+        residual = np.abs(d - b)
+        a: complex | None = None
+        for _ in range(_FIT_ROUNDS):
+            inlier = self._gate(residual)
+            fit = _fit_similarity(p[inlier], q[inlier]) if inlier.sum() >= 3 else None
+            if fit is None:
+                return None, b, inlier
+            a, b = fit
+            residual = np.abs(a * p + b - q)
+        return a, b, self._gate(residual)
+
+    def _gate(self, residual: np.ndarray) -> np.ndarray:
+        """内点门限：``3σ``（σ 取 MAD）限制在 ``[inlier_px, 3·inlier_px]``，上限使无关星场无法靠宽松拟合通过。
+        Inlier gate: ``3σ`` (σ from the MAD) clamped to ``[inlier_px, 3·inlier_px]``; the cap keeps
+        unrelated fields from passing as a loose fit.
+        """
+        sigma3 = 3.0 * 1.4826 * _median(residual)
+        return residual <= min(max(self.inlier_px, sigma3), 3.0 * self.inlier_px)
+
+
+def _fit_similarity(p: np.ndarray, q: np.ndarray) -> tuple[complex, complex] | None:
+    """复数形式的相似变换最小二乘 ``q ≈ a·p + b`` / Least-squares similarity ``q ≈ a·p + b`` in complex form."""
+    pm, qm = p.mean(), q.mean()
+    pc = p - pm
+    denom = float(np.dot(pc.real, pc.real) + np.dot(pc.imag, pc.imag))
+    if denom <= 1e-9:
+        return None
+    a = complex(np.vdot(pc, q - qm) / denom)
+    return a, complex(qm - a * pm)
+
+
+def _median(values: np.ndarray) -> float:
+    """上中位数，省去 ``np.median`` 的开销 / Upper median without ``np.median``'s overhead."""
+    k = len(values) // 2
+    return float(np.partition(values, k)[k])
+
+
+def _failed(matched: int) -> TrackResult:
+    return TrackResult(delta_x=0.0, delta_y=0.0, matched_points=matched, confidence=0.0)
+
+
+def _match(
+    tree: cKDTree, points: np.ndarray, radius: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """半径内最近邻，一对一（冲突时取更近者）/ One-to-one nearest neighbours within ``radius``."""
+    dist, j = tree.query(points, k=1, distance_upper_bound=radius)
+    i = np.flatnonzero(np.isfinite(dist))
+    j, dist = j[i], dist[i]
+    order = np.lexsort((dist, j))
+    _, first = np.unique(j[order], return_index=True)
+    keep = order[first]
+    return i[keep], j[keep]
+
+
+def _vote_shift(prev: np.ndarray, cur: np.ndarray, tol: float) -> np.ndarray | None:
+    """最亮星两两位移投票，得到大位移时的粗平移 / Coarse shift by voting over bright-star pair offsets.
+
+    帧间移动超出匹配半径（转动调节旋钮时）时为最近邻匹配提供起点；支持数不足 3 时返回 None。
+    Seeds the nearest-neighbour match when motion exceeds the match radius (knob turning);
+    returns None with fewer than 3 supporting pairs.
+    """
+    pb = prev[np.argsort(-prev[:, 2])[:_VOTE_STARS], :2]
+    cb = cur[np.argsort(-cur[:, 2])[:_VOTE_STARS], :2]
+    offsets = (cb[None, :, :] - pb[:, None, :]).reshape(-1, 2)
+    support = cKDTree(offsets).query_ball_point(offsets, r=tol, return_length=True)
+    best = int(np.argmax(support))
+    if support[best] < 3:
+        return None
+    return offsets[best]
@@ -124,26 +124,44 @@ class Settings(BaseSettings):
         default="fast",
         description="降噪语义模式 off/fast/high_quality / Semantic noise reduction mode",
     )
+    camera_capture_format: str = Field(
+        default="rgb888",
+        description=(
+            "主流采集格式 rgb888/yuv420；yuv420 只把亮度平面交给解算，内存减半 / "
+            "Main stream format rgb888/yuv420; yuv420 hands analysis the Y plane at half the memory"
+        ),
+    )
+    camera_simulated_driver: bool = Field(
+        default=False,
+        description="使用模拟 Picamera2 驱动（无传感器调试）/ Use the simulated Picamera2 driver",
+    )
     camera_lores_enabled: bool = Field(
         default=True,
-        description="启用低分辨率辅助流用于统计 / Enable lores helper stream for stats",
+        description="启用低分辨率辅助流（预览与快速星点统计）/ Enable the lores stream for preview and quick-look",
     )
     camera_lores_width: int = Field(
-        default=320,
+        default=640,
         ge=64,
         le=1280,
-        description="低分辨率辅助流宽度 / Lores helper stream width",
+        description="低分辨率流最大宽度，按主流宽高比取值 / Lores max width; actual size keeps the main aspect",
     )
     camera_lores_height: int = Field(
-        default=240,
+        default=480,
         ge=48,
         le=720,
-        description="低分辨率辅助流高度 / Lores helper stream height",
+        description="低分辨率流最大高度 / Lores max height",
     )
     camera_lores_format: str = Field(
         default="YUV420",
         description="低分辨率辅助流格式 / Lores helper stream format",
     )
+    camera_preview_stream: str = Field(
+        default="lores",
+        description=(
+            "预览与实时跟踪数据源 lores/main；lores 时主流只在全量解算与拍照时读取 / "
+            "Preview and tracking source lores/main; with lores the main stream is read only on demand"
+        ),
+    )
     camera_flip_horizontal: bool = Field(
         default=False,
         description="相机输出水平镜像；与预览/解算同坐标系 / Camera output horizontal flip",
@@ -215,6 +233,10 @@ class Settings(BaseSettings):
         default=None,
         description="default_database.npz 绝对路径；None 则使用 vendor 内 data/default_database.npz / Absolute path to default_database.npz",
     )
+    solver_database_mmap: bool = Field(
+        default=True,
+        description="优先使用内存映射图案库目录，首次预热时由 .npz 一次性转换 / Prefer the memory-mapped DB directory, converted once from .npz on first warm-up",
+    )
     solver_fov_max_error_deg: Optional[float] = Field(
         default=None,
         description="FOV 估计允许误差(度)；None 为库默认 / Max FOV estimate error in degrees",
@@ -223,17 +245,130 @@ class Settings(BaseSettings):
         default=1500,
         description="Tetra3 单次解算超时毫秒 / Tetra3 solve timeout in ms",
     )
+    solver_process_workers: int = Field(
+        default=1,
+        ge=0,
+        le=16,
+        description="解算进程池 worker 数；0 为在本进程线程中解算 / Plate-solve worker processes; 0 solves on in-process threads",
+    )
     static_dir: Path = Field(default=Path("./web/static"), description="静态文件目录")
 
     # 星图解算配置 / Plate solving configuration
     solver_hint_ra_deg: float = Field(default=0.0, description="默认解算RA提示(度)")
     solver_hint_dec_deg: float = Field(default=90.0, description="默认解算Dec提示(度)")
+    solver_hint_radius_deg: float = Field(
+        default=15.0,
+        ge=0.0,
+        le=180.0,
+        description="可信指向预测（传感器/上一解）的首轮搜索半径(度)，另加视场半对角线；0 关闭天区剪枝 / First-pass search radius around a confident pointing prediction in deg, plus the FOV half-diagonal; 0 disables sky pruning",
+    )
+    solver_hint_widening: float = Field(
+        default=3.0,
+        gt=1.0,
+        le=10.0,
+        description="天区剪枝每轮搜索半径放大倍数 / Factor the pruned search radius grows by per pass",
+    )
     solver_fov_deg: float = Field(
         default=11.0, description="视场角(度) / Default FOV estimate (deg)"
     )
+    solver_profile_fov_margin_deg: float = Field(
+        default=1.0,
+        description="设备图案库视场带半宽(度)，库覆盖 solver_fov_deg±该值 / Half-width in deg of the device-profile DB FOV band around solver_fov_deg",
+    )
+    solver_profile_star_max_magnitude: Optional[float] = Field(
+        default=None,
+        description="设备图案库星等极限；None 按视场与星密度自动 / Device-profile DB magnitude limit; None derives it from FOV and star density",
+    )
+    solver_profile_dec_min_deg: Optional[float] = Field(
+        default=None,
+        description="设备图案库视场中心最小赤纬(度)，如极轴校准用 60；None 不限 / Lowest field-centre Dec in deg for the device-profile DB (e.g. 60 for polar alignment); None for no limit",
+    )
+    solver_profile_dec_max_deg: Optional[float] = Field(
+        default=None,
+        description="设备图案库视场中心最大赤纬(度)；None 不限 / Highest field-centre Dec in deg for the device-profile DB; None for no limit",
+    )
     solver_max_stars: int = Field(default=80, description="用于解算的最大星点数量")
     solver_fullsolve_interval_frames: int = Field(
-        default=10, description="实时模式全量解算间隔帧数"
+        default=10,
+        description="实时模式全量解算间隔帧数（仅在关闭自适应调度时使用）/ Realtime full-solve interval in frames (only with adaptive scheduling off)",
+    )
+    solver_fullsolve_adaptive: bool = Field(
+        default=True,
+        description="实时模式按跟踪运动/置信度/解算耗时自适应安排全量解算；关闭时按固定帧间隔 / Schedule realtime full solves adaptively from tracker motion, confidence and solve latency; off uses the fixed frame interval",
+    )
+    solver_fullsolve_min_interval_sec: float = Field(
+        default=1.0,
+        ge=0.1,
+        le=60.0,
+        description="自适应全量解算最小间隔(秒)，实际不低于近期解算耗时 / Minimum adaptive full-solve interval in seconds, never below recent solve latency",
+    )
+    solver_fullsolve_max_interval_sec: float = Field(
+        default=15.0,
+        ge=1.0,
+        le=600.0,
+        description="静止且跟踪可靠时全量解算的最大间隔(秒) / Maximum full-solve interval in seconds while still and tracking reliably",
+    )
+    solver_fullsolve_motion_deg_s: float = Field(
+        default=0.1,
+        ge=0.001,
+        le=20.0,
+        description="视轴角速度超过该值(度/秒)视为正在调节，按最小间隔全量解算 / Boresight speed (deg/s) above which the mount counts as moving and full solves run at the minimum interval",
+    )
+    solver_fullsolve_min_confidence: float = Field(
+        default=0.5,
+        ge=0.0,
+        le=1.0,
+        description="星点跟踪置信度低于该值时尽快全量解算 / Run a full solve soon when star-tracker confidence drops below this",
+    )
+    solver_realtime_min_stars: int = Field(
+        default=4,
+        ge=1,
+        le=50,
+        description="实时模式送解算所需最少星点数，不足的帧被质量过滤跳过 / Minimum stars for a realtime frame to be solved; fewer are skipped by the quality filter",
+    )
+    realtime_stream_max_clients: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="实时结果推送（SSE/WebSocket）最大订阅数 / Maximum realtime result stream subscribers (SSE/WebSocket)",
+    )
+    solver_tracking_enabled: bool = Field(
+        default=True,
+        description="实时模式在两次全量解算之间用上一姿态做跟踪解算 / Track from the previous attitude between full solves in realtime mode",
+    )
+    solver_tracker_propagation: bool = Field(
+        default=True,
+        description="两次解算之间由星点跟踪变换直接推算指向，跟踪不可靠时才送跟踪解算 / Between solves, update pointing from the star-tracker transform; fall back to a tracking solve when it is unreliable",
+    )
+    solver_tracker_match_radius_px: float = Field(
+        default=24.0,
+        ge=1.0,
+        le=500.0,
+        description="星点跟踪最近邻匹配半径(主流像素)，更大位移由亮星投票覆盖 / Star-tracker nearest-neighbour match radius in main-frame pixels; larger motion is covered by the bright-star vote",
+    )
+    solver_tracker_min_inliers: int = Field(
+        default=6,
+        ge=3,
+        le=50,
+        description="星点跟踪接受变换所需最少内点数 / Minimum inlier pairs for the star tracker to accept a transform",
+    )
+    solver_tracking_min_matches: int = Field(
+        default=8,
+        ge=3,
+        le=50,
+        description="跟踪解算接受所需最少匹配星数，不足则回退全量搜索 / Minimum matched stars to accept a tracking solve before falling back",
+    )
+    solver_tracking_max_rmse_arcsec: float = Field(
+        default=120.0,
+        gt=0.0,
+        le=3600.0,
+        description="跟踪解算允许的最大 RMSE(角秒) / Maximum tracking solve RMSE in arcsec",
+    )
+    solver_tracking_search_radius: float = Field(
+        default=0.05,
+        gt=0.0,
+        le=1.0,
+        description="跟踪首轮匹配半径(画幅宽度比例)，覆盖帧间移动 / First-pass tracking match radius as a fraction of frame width",
     )
     # Tetra3 get_centroids_from_image 默认（可环境覆盖）/ Defaults for centroid extraction
     solver_centroid_sigma: float = Field(
@@ -268,6 +403,10 @@ class Settings(BaseSettings):
         default=None,
         description="长细比上限；None 为不限制 / Max major/minor axis ratio, None to disable",
     )
+    solver_centroid_backend: str = Field(
+        default="opencv",
+        description="提星实现：opencv 为向量化快速实现，结果与 scipy（上游）一致 / Centroid backend: opencv is the vectorized fast path, matching scipy (upstream)",
+    )
     solver_max_image_side: int = Field(
         default=1280,
         description="提星前长边上限（像素），与默认采集长边对齐 / Max long side before extraction",
@@ -295,6 +434,45 @@ class Settings(BaseSettings):
         le=2048,
         description="大尺度背景减除：小图长边上限（像素），越小越快 / Large-scale BG downsample max side",
     )
+    solver_background_refresh_frames: int = Field(
+        default=30,
+        ge=1,
+        le=10000,
+        description=(
+            "实时解算的大尺度背景每 N 帧重新估计一次（曝光/增益变化时立即重估）"
+            " / Realtime large-scale background is re-estimated every N frames (immediately on exposure/gain change)"
+        ),
+    )
+    solver_hot_pixel_correction: bool = Field(
+        default=True,
+        description=(
+            "提星前修补已标定的热像素（需先做暗场标定）"
+            " / Repair calibrated hot pixels before extraction (needs a dark-frame calibration)"
+        ),
+    )
+    solver_hot_pixel_calibration_frames: int = Field(
+        default=16,
+        ge=3,
+        le=64,
+        description="暗场标定采集帧数 / Dark frames captured per hot-pixel calibration",
+    )
+    solver_hot_pixel_sigma: float = Field(
+        default=6.0,
+        ge=2.0,
+        le=50.0,
+        description=(
+            "热像素阈值：暗场中值高于本底的 σ 倍数 / Hot-pixel threshold in σ above the dark-frame level"
+        ),
+    )
+    solver_background_smoothing: float = Field(
+        default=0.3,
+        ge=0.0,
+        le=1.0,
+        description=(
+            "背景刷新时新估计的权重（指数滑动平均，1 为不平滑）"
+            " / Weight of a fresh estimate when refreshing the background (EMA; 1 disables smoothing)"
+        ),
+    )
     star_analysis_target_fps: float = Field(
         default=0.5,
         description="星空分析目标帧率（默认 2 秒 1 帧）/ Target star-analysis FPS (one frame per 2 seconds)",
@@ -361,6 +539,15 @@ class Settings(BaseSettings):
         default="auto",
         description="预览编码器 auto/turbojpeg/opencv / Preview encoder: auto/turbojpeg/opencv",
     )
+    preview_rendition_cache_kb: int = Field(
+        default=4096,
+        ge=0,
+        le=65536,
+        description=(
+            "非默认格式/质量编码结果缓存上限（KB），同帧多客户端只编码一次 / "
+            "Memory cap in KB for non-default encoded renditions shared across stream clients"
+        ),
+    )
     debug_preview_min_interval_ms: int = Field(
         default=150,
         ge=0,
@@ -398,8 +585,19 @@ class Settings(BaseSettings):
     keep_raw_cache: bool = Field(
         default=False,
         description=(
-            "是否常驻 raw 帧缓存（占内存）；分析路径可同步抓帧 / "
-            "Retain raw frame cache in RAM; analysis can sync-grab when false"
+            "是否常驻 raw 帧缓存（占内存）；lores 预览时抓帧循环每帧同时读取主流；分析路径可同步抓帧 / "
+            "Retain raw frame cache in RAM; with a lores preview the grabber also reads main "
+            "each tick; analysis can sync-grab when false"
+        ),
+    )
+    analysis_frame_ring_slots: int = Field(
+        default=3,
+        ge=0,
+        le=8,
+        description=(
+            "分析用主流环形缓冲槽数；预览运行时解算租用抓帧循环的帧而不重复采集，0=关闭 / "
+            "Main-frame ring slots for analysis; while the preview runs, solves lease grabber "
+            "frames instead of capturing again; 0 disables"
         ),
     )
 
@@ -557,7 +755,20 @@ class Settings(BaseSettings):
 
     @model_validator(mode="after")
     def _apply_development_mode_defaults(self) -> "Settings":
-        """开发模式默认提升日志级别（避免与显式 WARNING/ERROR 冲突）/ Dev mode bumps log level unless explicitly quiet."""
+        """开发模式默认提升日志级别（避免与显式 WARNING/ERROR 冲突）/ Dev mode bumps log level unless explicitly quiet.
+
+        同时拒绝全量解算最小间隔大于最大间隔的配置 / Also rejects a full-solve minimum interval
+        above the maximum.
+        """
+        if (
+            self.solver_fullsolve_min_interval_sec
+            > self.solver_fullsolve_max_interval_sec
+        ):
+            raise ValueError(
+                "solver_fullsolve_min_interval_sec 不能大于 solver_fullsolve_max_interval_sec / "
+                "solver_fullsolve_min_interval_sec must not exceed "
+                "solver_fullsolve_max_interval_sec"
+            )
         if not bool(self.development_mode):
             return self
         if str(self.log_level).upper() == "INFO":
@@ -71,10 +71,13 @@ _CATALOG_SECTIONS: tuple[
             "camera_auto_exposure_max_us",
             "camera_ae_flicker_mode",
             "camera_noise_reduction_mode",
+            "camera_capture_format",
+            "camera_simulated_driver",
             "camera_lores_enabled",
             "camera_lores_width",
             "camera_lores_height",
             "camera_lores_format",
+            "camera_preview_stream",
             "camera_flip_horizontal",
             "camera_flip_vertical",
             "camera_white_balance_mode",
@@ -92,12 +95,14 @@ _CATALOG_SECTIONS: tuple[
             "shared_preview_fps",
             "preview_jpeg_quality",
             "preview_encoder",
+            "preview_rendition_cache_kb",
             "debug_preview_min_interval_ms",
             "camera_probe_timeout_sec",
             "camera_grab_failures_offline",
             "camera_idle_shutdown_sec",
             "camera_frame_stale_timeout_sec",
             "keep_raw_cache",
+            "analysis_frame_ring_slots",
             "stream_max_mjpeg_clients",
             "stream_mjpeg_frame_fetch_timeout_ms",
         ),
@@ -136,6 +141,7 @@ _CATALOG_SECTIONS: tuple[
             "analysis_dir",
             "plate_solve_dir",
             "solver_tetra_database_path",
+            "solver_database_mmap",
             "static_dir",
         ),
     ),
@@ -147,9 +153,29 @@ _CATALOG_SECTIONS: tuple[
         (
             "solver_hint_ra_deg",
             "solver_hint_dec_deg",
+            "solver_hint_radius_deg",
+            "solver_hint_widening",
             "solver_fov_deg",
+            "solver_profile_fov_margin_deg",
+            "solver_profile_star_max_magnitude",
+            "solver_profile_dec_min_deg",
+            "solver_profile_dec_max_deg",
             "solver_max_stars",
             "solver_fullsolve_interval_frames",
+            "solver_fullsolve_adaptive",
+            "solver_fullsolve_min_interval_sec",
+            "solver_fullsolve_max_interval_sec",
+            "solver_fullsolve_motion_deg_s",
+            "solver_fullsolve_min_confidence",
+            "solver_realtime_min_stars",
+            "realtime_stream_max_clients",
+            "solver_tracking_enabled",
+            "solver_tracker_propagation",
+            "solver_tracker_match_radius_px",
+            "solver_tracker_min_inliers",
+            "solver_tracking_min_matches",
+            "solver_tracking_max_rmse_arcsec",
+            "solver_tracking_search_radius",
             "solver_centroid_sigma",
             "solver_centroid_max_area",
             "solver_centroid_min_area",
@@ -158,12 +184,19 @@ _CATALOG_SECTIONS: tuple[
             "solver_centroid_bg_sub_mode",
             "solver_centroid_sigma_mode",
             "solver_centroid_max_axis_ratio",
+            "solver_centroid_backend",
             "solver_max_image_side",
             "solver_max_stars_hard_cap",
             "solver_max_image_side_hard_cap",
             "solver_large_scale_bg_downsample",
+            "solver_background_refresh_frames",
+            "solver_background_smoothing",
+            "solver_hot_pixel_correction",
+            "solver_hot_pixel_calibration_frames",
+            "solver_hot_pixel_sigma",
             "solver_fov_max_error_deg",
             "solver_timeout_ms",
+            "solver_process_workers",
         ),
     ),
     (
@@ -12,6 +12,7 @@ from ogscope.__version__ import __version__
 from ogscope.config import get_settings
 from ogscope.core.capabilities import capability_map
 from ogscope.core.realtime import realtime_solve_service
+from ogscope.core.realtime.broadcast import ResultSubscription
 from ogscope.domain.camera.services import (
     camera_domain_service,
     file_domain_service,
@@ -224,6 +225,14 @@ class CoreContractService:
             "fullsolve_count": int(status.get("fullsolve_count", 0)),
         }
 
+    def subscribe_analysis_results(
+        self, *, include_tracking: bool = True, detail: str = "summary"
+    ) -> ResultSubscription | None:
+        """订阅实时结果推送，订阅数已满时返回 None / Subscribe to pushed results; None when full."""
+        return realtime_solve_service.results.subscribe(
+            include_tracking=include_tracking, detail=detail
+        )
+
     async def stop_analysis(self) -> dict[str, Any]:
         """结束实时分析 / Stop realtime analysis."""
         result = await realtime_solve_service.stop()
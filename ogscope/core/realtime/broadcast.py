@@ -0,0 +1,132 @@
+"""
+实时解算结果推送 / Push delivery of realtime solve results
+
+每个订阅者只保留“最新一条未发送快照”：客户端读得慢时中间结果被合并（latest-only），
+内存与积压都不随客户端速度增长。发送时与该订阅者上次收到的快照做差分，只带变化字段，
+首条消息为完整快照。
+Each subscriber holds at most one unsent snapshot: a slow client has intermediate results
+coalesced (latest only), so neither memory nor backlog grows with client speed. Each message is
+the difference from what that subscriber last received, so unchanged fields are left out; the
+first message is the full snapshot.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+# 默认精简推送时去掉的大字段 / Heavy result fields left out of summary streams
+HEAVY_RESULT_FIELDS = ("tetra", "solve_overlay", "centroid_quality")
+
+_MISSING = object()
+
+
+def snapshot_delta(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    """两份快照的差分：变化或新增的键取新值，消失的键为 None；嵌套字典逐层比较。
+    Difference of two snapshots: changed or new keys carry the new value, vanished keys map to
+    None, and nested dicts are compared recursively.
+    """
+    delta: dict[str, Any] = {}
+    for key, value in current.items():
+        old = previous.get(key, _MISSING)
+        if old == value:
+            continue
+        if isinstance(old, dict) and isinstance(value, dict):
+            delta[key] = snapshot_delta(old, value)
+        else:
+            delta[key] = value
+    for key in previous.keys() - current.keys():
+        delta[key] = None
+    return delta
+
+
+class ResultSubscription:
+    """单个客户端的推送通道 / Push channel for one client."""
+
+    def __init__(self, hub: ResultHub, *, include_tracking: bool, detail: str) -> None:
+        self._hub = hub
+        self.include_tracking = include_tracking
+        self.detail = detail
+        self._pending: dict[str, Any] | None = None
+        self._sent: dict[str, Any] = {}
+        self._ready = asyncio.Event()
+        # 未及发送即被更新快照覆盖的条数 / Snapshots replaced before they could be sent
+        self.coalesced = 0
+
+    def offer(self, snapshot: dict[str, Any]) -> None:
+        if self._pending is not None:
+            self.coalesced += 1
+        self._pending = snapshot
+        self._ready.set()
+
+    async def next(self) -> dict[str, Any]:
+        """等待下一条消息（相对上次发送的差分）/ Wait for the next message (delta since the last one)."""
+        while self._pending is None:
+            self._ready.clear()
+            await self._ready.wait()
+        snapshot, self._pending = self._pending, None
+        self._ready.clear()
+        delta = snapshot_delta(self._sent, snapshot)
+        self._sent = snapshot
+        return delta
+
+    def close(self) -> None:
+        self._hub._discard(self)
+
+
+class ResultHub:
+    """实时结果的发布/订阅中心 / Publish/subscribe hub for realtime results."""
+
+    def __init__(self, max_subscribers: int) -> None:
+        self.max_subscribers = max(1, int(max_subscribers))
+        self._subscribers: set[ResultSubscription] = set()
+        self._seq = 0
+        self._latest: dict[str, Any] | None = None
+        self._latest_summary: dict[str, Any] | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(
+        self, *, include_tracking: bool = True, detail: str = "summary"
+    ) -> ResultSubscription | None:
+        """新建订阅，已满时返回 None；立即收到当前快照 / Subscribe; None when full.
+
+        新订阅者马上收到当前完整快照，无需等待下一次解算。
+        A new subscriber gets the current full snapshot right away.
+        """
+        if len(self._subscribers) >= self.max_subscribers:
+            return None
+        sub = ResultSubscription(self, include_tracking=include_tracking, detail=detail)
+        self._subscribers.add(sub)
+        if self._latest is not None:
+            sub.offer(self._variant(detail))
+        return sub
+
+    def publish(self, snapshot: dict[str, Any], *, tracking: bool = False) -> None:
+        """发布新快照；``tracking`` 为跟踪解算结果 / Publish a snapshot; ``tracking`` marks tracker updates."""
+        self._seq += 1
+        self._latest = {**snapshot, "seq": self._seq}
+        self._latest_summary = None
+        for sub in self._subscribers:
+            if tracking and not sub.include_tracking:
+                continue
+            sub.offer(self._variant(sub.detail))
+
+    def _variant(self, detail: str) -> dict[str, Any]:
+        latest = self._latest or {}
+        if detail == "full":
+            return latest
+        if self._latest_summary is None:
+            summary = dict(latest)
+            result = summary.get("result")
+            if isinstance(result, dict):
+                summary["result"] = {
+                    k: v for k, v in result.items() if k not in HEAVY_RESULT_FIELDS
+                }
+            self._latest_summary = summary
+        return self._latest_summary
+
+    def _discard(self, sub: ResultSubscription) -> None:
+        self._subscribers.discard(sub)
@@ -0,0 +1,100 @@
+"""
+实时解算流水线基础件 / Building blocks for the realtime solve pipeline
+
+各阶段之间用容量固定的“最新优先”队列连接：下游来不及处理时丢弃最旧的待处理项，
+保证每个阶段拿到的总是最新帧，且积压不会增长。
+Stages are joined by bounded latest-wins queues: when a downstream stage falls behind, the
+oldest pending item is dropped, so every stage works on the newest frame and backlog never grows.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class StageStats:
+    """单个阶段的耗时与计数 / Timing and counters for one stage."""
+
+    processed: int = 0
+    # 排队期间被更新的帧顶替的项数 / Items superseded by a newer one while queued
+    dropped: int = 0
+    latency_ms: deque[float] = field(default_factory=lambda: deque(maxlen=60))
+
+    def record(self, elapsed_ms: float) -> None:
+        self.processed += 1
+        self.latency_ms.append(float(elapsed_ms))
+
+    def to_dict(self) -> dict[str, Any]:
+        samples = self.latency_ms
+        return {
+            "processed": int(self.processed),
+            "dropped": int(self.dropped),
+            "avg_ms": round(sum(samples) / len(samples), 2) if samples else 0.0,
+            "last_ms": round(samples[-1], 2) if samples else 0.0,
+        }
+
+
+class LatestQueue(Generic[T]):
+    """满时丢弃最旧项的有界队列 / Bounded queue that drops its oldest item when full.
+
+    ``on_drop`` 在丢弃项上调用，用于释放其持有的资源（如帧租约）。
+    ``on_drop`` is called on each discarded item to free what it holds (e.g. a frame lease).
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1,
+        stats: StageStats | None = None,
+        on_drop: Callable[[T], None] | None = None,
+    ) -> None:
+        self._queue: asyncio.Queue[T] = asyncio.Queue(maxsize=max(1, int(maxsize)))
+        self._stats = stats
+        self._on_drop = on_drop
+
+    def put(self, item: T) -> None:
+        """非阻塞放入；已满时先丢弃最旧项 / Put without blocking, dropping the oldest item if full."""
+        if self._queue.full():
+            self._discard(self._queue.get_nowait())
+        self._queue.put_nowait(item)
+
+    def offer(self, item: T, keep: Callable[[T], bool]) -> bool:
+        """像 :meth:`put`，但最旧的待处理项满足 ``keep`` 时保留它并丢弃新项；返回是否放入。
+        Like :meth:`put`, but when the oldest pending item satisfies ``keep`` it stays and the new
+        item is dropped instead. Returns whether ``item`` was queued.
+        """
+        if not self._queue.full():
+            self._queue.put_nowait(item)
+            return True
+        pending = [self._queue.get_nowait() for _ in range(self._queue.qsize())]
+        if keep(pending[0]):
+            for queued in pending:
+                self._queue.put_nowait(queued)
+            self._discard(item)
+            return False
+        self._discard(pending[0])
+        for queued in pending[1:]:
+            self._queue.put_nowait(queued)
+        self._queue.put_nowait(item)
+        return True
+
+    async def get(self) -> T:
+        return await self._queue.get()
+
+    def clear(self) -> None:
+        """丢弃全部待处理项（不计入丢帧）/ Discard everything pending (not counted as drops)."""
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if self._on_drop is not None:
+                self._on_drop(item)
+
+    def _discard(self, item: T) -> None:
+        if self._stats is not None:
+            self._stats.dropped += 1
+        if self._on_drop is not None:
+            self._on_drop(item)
@@ -0,0 +1,148 @@
+"""
+实时模式全量解算自适应调度 / Adaptive full-solve scheduling for realtime mode
+
+全量解算（图案哈希搜索）是实时模式里最耗 CPU 的一步。静止且跟踪可靠时拉长到最大间隔，
+转动调节或跟踪置信度下降时缩短到最小间隔；最小间隔不低于近期全量解算耗时，避免解算排队。
+Full solves (pattern-hash search) are the most CPU-hungry step of realtime mode. While the mount
+is still and tracking is reliable they stretch to the maximum interval; while it is being turned
+or tracking confidence drops they tighten to the minimum interval, which never goes below recent
+full-solve latency so solves do not queue up.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+# 最小间隔相对近期全量解算耗时的倍数 / Minimum interval as a multiple of recent full-solve latency
+_LATENCY_FACTOR = 1.5
+# 运动速度与解算耗时的指数平滑系数 / Smoothing factor for motion speed and solve latency
+_EMA_ALPHA = 0.5
+
+
+@dataclass(slots=True)
+class ScheduleDecision:
+    """一次调度决策 / One scheduling decision."""
+
+    fullsolve: bool
+    # no_fix / retry / low_confidence / motion / max_interval / min_interval / steady
+    reason: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"fullsolve": self.fullsolve, "reason": self.reason}
+
+
+class FullSolveScheduler:
+    """按跟踪运动、置信度、距上次成功解算时间与解算耗时决定何时全量解算。
+    Decides when to run a full solve from tracker motion, match confidence, time since the last
+    good solve and recent solve latency.
+
+    时间均为 ``time.monotonic()`` 秒 / All times are ``time.monotonic()`` seconds.
+    """
+
+    def __init__(
+        self,
+        min_interval_sec: float = 1.0,
+        max_interval_sec: float = 15.0,
+        motion_deg_s: float = 0.1,
+        min_confidence: float = 0.5,
+    ) -> None:
+        self.min_interval_sec = max(0.0, float(min_interval_sec))
+        self.max_interval_sec = max(self.min_interval_sec, float(max_interval_sec))
+        self.motion_deg_s = float(motion_deg_s)
+        self.min_confidence = float(min_confidence)
+        self._last_attempt: float | None = None
+        self._last_success: float | None = None
+        self._last_failed = False
+        # 平滑后的视轴角速度（度/秒）与最近一次跟踪置信度 / Smoothed boresight speed and last confidence
+        self._motion: float | None = None
+        self._confidence: float | None = None
+        self._latency_ms: float | None = None
+        self._last: ScheduleDecision | None = None
+        self._reasons: Counter[str] = Counter()
+
+    def effective_min_interval_sec(self) -> float:
+        """最小间隔，不低于近期全量解算耗时 / Minimum interval, never below recent solve latency."""
+        latency = (self._latency_ms or 0.0) / 1000.0 * _LATENCY_FACTOR
+        return max(self.min_interval_sec, latency)
+
+    def decide(self, now: float) -> ScheduleDecision:
+        """本帧是否全量解算；决定全量时记为一次尝试 / Whether this frame gets a full solve."""
+        if self._last_attempt is not None and (
+            now - self._last_attempt < self.effective_min_interval_sec()
+        ):
+            decision = ScheduleDecision(False, "min_interval")
+        elif self._last_success is None:
+            decision = ScheduleDecision(True, "no_fix")
+        elif self._last_failed:
+            decision = ScheduleDecision(True, "retry")
+        elif self._confidence is not None and self._confidence < self.min_confidence:
+            decision = ScheduleDecision(True, "low_confidence")
+        elif self._motion is not None and self._motion >= self.motion_deg_s:
+            decision = ScheduleDecision(True, "motion")
+        elif now - self._last_success >= self.max_interval_sec:
+            decision = ScheduleDecision(True, "max_interval")
+        else:
+            decision = ScheduleDecision(False, "steady")
+        if decision.fullsolve:
+            self._last_attempt = now
+        self._last = decision
+        self._reasons[decision.reason] += 1
+        return decision
+
+    def observe_track(
+        self,
+        shift_px: float,
+        confidence: float,
+        deg_per_px: float | None,
+        dt_sec: float,
+    ) -> None:
+        """记录一次帧间跟踪；``confidence`` 为 0 表示跟踪失败 / Record one inter-frame track."""
+        self._confidence = float(confidence)
+        if confidence <= 0.0 or deg_per_px is None or dt_sec <= 0.0:
+            return
+        speed = float(shift_px) * float(deg_per_px) / float(dt_sec)
+        self._motion = (
+            speed
+            if self._motion is None
+            else _EMA_ALPHA * speed + (1.0 - _EMA_ALPHA) * self._motion
+        )
+
+    def observe_latency(self, elapsed_ms: float) -> None:
+        """记录一次全量解算耗时 / Record one full-solve latency."""
+        self._latency_ms = (
+            float(elapsed_ms)
+            if self._latency_ms is None
+            else _EMA_ALPHA * float(elapsed_ms) + (1.0 - _EMA_ALPHA) * self._latency_ms
+        )
+
+    def observe_solve(self, success: bool, now: float, *, fullsolve: bool) -> None:
+        """记录解算器结果；任何成功匹配都是绝对定位 / Record a solver result; any match is an absolute fix.
+
+        只有全量解算的失败才触发重试 / Only failed full solves trigger a retry.
+        """
+        if success:
+            self._last_success = now
+            self._last_failed = False
+        elif fullsolve:
+            self._last_failed = True
+
+    def to_dict(self, now: float) -> dict[str, Any]:
+        def since(t: float | None) -> float | None:
+            return None if t is None else round(now - t, 3)
+
+        return {
+            "adaptive": True,
+            "last_decision": self._last.to_dict() if self._last is not None else None,
+            "reasons": dict(self._reasons),
+            "min_interval_sec": round(self.effective_min_interval_sec(), 3),
+            "max_interval_sec": self.max_interval_sec,
+            "since_success_sec": since(self._last_success),
+            "since_attempt_sec": since(self._last_attempt),
+            "motion_deg_s": None if self._motion is None else round(self._motion, 4),
+            "track_confidence": self._confidence,
+            "solve_latency_ms": (
+                None if self._latency_ms is None else round(self._latency_ms, 1)
+            ),
+        }
@@ -1,20 +1,45 @@
 """
 实时解算服务 / Realtime solving service
+
+解算按阶段组织：取帧 → 提星 → 质量过滤 → 解算 → 发布。每个阶段是独立协程，阶段间用容量为 1 的
+最新优先队列连接；提星在专用线程中执行，不阻塞事件循环，且与上一帧的解算（进程池）重叠进行。
+Solving runs as stages: acquire → extract → quality-filter → solve → publish. Each stage is its
+own coroutine joined by one-slot latest-wins queues; extraction runs on a dedicated thread, off
+the event loop, and overlaps with the previous frame's solve in the process pool.
 """
 
 from __future__ import annotations
 
 import asyncio
+import math
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any
 
-from ogscope.algorithms.plate_solve import PlateSolver, SolveResult
-from ogscope.algorithms.plate_solve.sensor_context import attach_sensor_prediction
+from ogscope.algorithms.plate_solve import (
+    AsyncPlateSolver,
+    PlateSolver,
+    SolveCancelToken,
+    SolveResult,
+    propagate_solve,
+)
+from ogscope.algorithms.plate_solve.sensor_context import (
+    attach_sensor_prediction,
+    sensor_hint,
+)
 from ogscope.algorithms.star_extract import StarExtractor, StarPoint
+from ogscope.algorithms.star_match import FastTracker
 from ogscope.config import effective_solver_max_stars, get_settings
+from ogscope.core.realtime.broadcast import ResultHub
+from ogscope.core.realtime.pipeline import LatestQueue, StageStats
+from ogscope.core.realtime.scheduler import FullSolveScheduler
+from ogscope.domain.camera.calibration import hot_pixels_for_frame
+from ogscope.domain.camera.frame_ring import FrameLease
 from ogscope.web.camera_shared import get_camera_manager
 
+STAGES = ("acquire", "extract", "filter", "solve", "publish")
+
 
 @dataclass(slots=True)
 class RealtimeState:
@@ -23,10 +48,47 @@ class RealtimeState:
     running: bool = False
     frame_count: int = 0
     fullsolve_count: int = 0
+    tracking_count: int = 0
+    # 由星点跟踪变换推算、未经解算器的帧数 / Frames whose pointing came from the star tracker alone
+    propagated_count: int = 0
+    # 星点过少未送解算的帧数 / Frames not solved for too few stars
+    rejected_count: int = 0
     last_result: dict[str, Any] | None = None
     last_error: str = ""
 
 
+@dataclass(slots=True)
+class _FrameJob:
+    """流经各阶段的一帧 / One frame moving through the stages."""
+
+    frame_id: int
+    fullsolve: bool
+    frame: Any
+    camera: Any
+    frame_shape: tuple[int, ...]
+    coord_scale: float
+    acquired_mono: float
+    lease: FrameLease | None = None
+    stars: list[StarPoint] | None = None
+    tracking: bool = False
+
+    def release(self) -> None:
+        """释放帧（及其租约），提星后不再需要像素 / Drop the pixels (and lease) once extracted."""
+        self.frame = None
+        if self.lease is not None:
+            self.lease.release()
+            self.lease = None
+
+
+@dataclass(slots=True)
+class _PoseAnchor:
+    """已知姿态的一帧，星点跟踪由此推算后续帧 / A frame with known attitude that tracking starts from."""
+
+    acquired_mono: float
+    stars: list[StarPoint]
+    solve: SolveResult
+
+
 class RealtimeSolveService:
     """实时解算器：周期性 Tetra3 全量解算 / Realtime solver with periodic Tetra3"""
 
@@ -38,12 +100,47 @@ class RealtimeSolveService:
             fov_max_error_deg=settings.solver_fov_max_error_deg,
             solve_timeout_ms=settings.solver_timeout_ms,
         )
+        self.async_solver = AsyncPlateSolver(self.solver)
+        self.tracker = FastTracker(
+            match_radius_px=settings.solver_tracker_match_radius_px,
+            min_inliers=settings.solver_tracker_min_inliers,
+        )
         self.state = RealtimeState()
-        self._task: asyncio.Task[None] | None = None
+        # 结果推送（SSE/WebSocket 订阅者）/ Result push to SSE/WebSocket subscribers
+        self.results = ResultHub(int(settings.realtime_stream_max_clients))
+        self._tasks: list[asyncio.Task[None]] = []
+        self._stats: dict[str, StageStats] = {name: StageStats() for name in STAGES}
+        self._end_to_end_ms = StageStats()
+        # 提星专用线程：单线程，StarExtractor 不会被并发调用 / Single extraction thread
+        self._extract_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="ogscope-extract"
+        )
+        self._extract_queue: LatestQueue[_FrameJob] | None = None
+        self._filter_queue: LatestQueue[_FrameJob] | None = None
+        self._solve_queue: LatestQueue[_FrameJob] | None = None
+        self._publish_queue: LatestQueue[tuple[_FrameJob, SolveResult]] | None = None
+        self._acquired = 0
+        # 是否已在相机管理器注册为分析消费者 / Whether we hold an analysis consumer slot
+        self._holds_analysis = False
         self._previous_stars: list[StarPoint] | None = None
         self._hint_ra = settings.solver_hint_ra_deg
         self._hint_dec = settings.solver_hint_dec_deg
+        # 可信 hint（传感器预测或上一成功解）的首轮搜索半径；None 为不剪枝
+        # First-pass radius for a confident hint (sensor or last match); None disables pruning
+        self._hint_radius: float | None = None
+        self._hint_radius_setting = float(settings.solver_hint_radius_deg)
         self._fullsolve_interval = max(1, settings.solver_fullsolve_interval_frames)
+        # None 时按固定帧间隔全量解算 / None falls back to the fixed frame interval
+        self._scheduler: FullSolveScheduler | None = self._new_scheduler()
+        self._tracking_enabled = bool(settings.solver_tracking_enabled)
+        self._min_stars = max(1, int(settings.solver_realtime_min_stars))
+        # 上一次成功解算，作为跟踪先验 / Last successful solve, used as tracking prior
+        self._track_prior: SolveResult | None = None
+        self._propagation = bool(settings.solver_tracker_propagation)
+        self._anchor: _PoseAnchor | None = None
+        self._last_track: dict[str, Any] | None = None
+        # 进行中解算的取消令牌，stop() 时取消 / Token of the in-flight solve, cancelled by stop()
+        self._inflight_token: SolveCancelToken | None = None
         self._fov_estimate: float | None = None
         self._fov_max_error: float | None = None
         self._solve_timeout_ms: int | None = None
@@ -76,21 +173,71 @@ class RealtimeSolveService:
         self._fov_max_error = fov_max_error
         self._solve_timeout_ms = solve_timeout_ms
         self._solve_context = solve_context
+        self._hint_radius = None
+        predicted = sensor_hint(solve_context)
+        if predicted is not None:
+            self._hint_ra, self._hint_dec = predicted
+            self._hint_radius = self._hint_radius_setting
         self.state = RealtimeState(running=True)
         self._previous_stars = None
-        self._task = asyncio.create_task(self._loop())
+        self._track_prior = None
+        self._anchor = None
+        self._last_track = None
+        if self._scheduler is not None:
+            self._scheduler = self._new_scheduler()
+        self._acquired = 0
+        self._stats = {name: StageStats() for name in STAGES}
+        self._end_to_end_ms = StageStats()
+        if not self._holds_analysis:
+            # 预览同时运行时，全量解算租用抓帧循环的主流帧而不是再采集一次
+            # With the preview running, full solves lease the grabber's main frames.
+            await get_camera_manager().acquire_analysis_consumer()
+            self._holds_analysis = True
+        release = _FrameJob.release
+        self._extract_queue = LatestQueue(1, self._stats["extract"], release)
+        self._filter_queue = LatestQueue(1, self._stats["filter"], release)
+        self._solve_queue = LatestQueue(1, self._stats["solve"], release)
+        self._publish_queue = LatestQueue(1, self._stats["publish"])
+        self._publish_snapshot()
+        self._tasks = [
+            asyncio.create_task(stage())
+            for stage in (
+                self._acquire_stage,
+                self._extract_stage,
+                self._filter_stage,
+                self._solve_stage,
+                self._publish_stage,
+            )
+        ]
         return {"success": True, "message": "实时解算已启动 / Realtime solver started"}
 
     async def stop(self) -> dict[str, Any]:
         """停止实时解算 / Stop realtime solving"""
         self.state.running = False
-        if self._task and not self._task.done():
-            self._task.cancel()
-            try:
-                await self._task
-            except asyncio.CancelledError:
-                pass
-        self._task = None
+        if self._inflight_token is not None:
+            self._inflight_token.cancel()
+        loop = asyncio.get_running_loop()
+        # 只等待本事件循环的阶段任务；所属循环已关闭的任务无需也无法取消
+        # Only await stage tasks of this loop; tasks whose loop already closed cannot be cancelled.
+        pending = [
+            task
+            for task in self._tasks
+            if not task.done() and not task.get_loop().is_closed()
+        ]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(
+            *(task for task in pending if task.get_loop() is loop),
+            return_exceptions=True,
+        )
+        self._tasks = []
+        for queue in (self._extract_queue, self._filter_queue, self._solve_queue):
+            if queue is not None:
+                queue.clear()
+        if self._holds_analysis:
+            self._holds_analysis = False
+            await get_camera_manager().release_analysis_consumer()
+        self._publish_snapshot()
         return {"success": True, "message": "实时解算已停止 / Realtime solver stopped"}
 
     async def get_status(self) -> dict[str, Any]:
@@ -99,15 +246,27 @@ class RealtimeSolveService:
             "running": self.state.running,
             "frame_count": self.state.frame_count,
             "fullsolve_count": self.state.fullsolve_count,
+            "tracking_count": self.state.tracking_count,
+            "propagated_count": self.state.propagated_count,
+            "rejected_count": self.state.rejected_count,
+            "last_track": self._last_track,
+            "scheduler": (
+                self._scheduler.to_dict(time.monotonic())
+                if self._scheduler is not None
+                else {"adaptive": False, "interval_frames": self._fullsolve_interval}
+            ),
+            "stages": {name: stats.to_dict() for name, stats in self._stats.items()},
+            "end_to_end_ms": self._end_to_end_ms.to_dict()["avg_ms"],
             "last_result": self.state.last_result,
             "last_error": self.state.last_error,
         }
 
-    async def _loop(self) -> None:
-        """后台循环 / Background loop"""
+    async def _acquire_stage(self) -> None:
+        """取帧阶段：按分析间隔取帧并交给提星 / Acquire stage: fetch frames at the analysis interval."""
         last_started_mono = 0.0
         last_frame_id = -1
         while self.state.running:
+            lease = None
             try:
                 remaining = self._analysis_interval_sec - (
                     time.monotonic() - last_started_mono
@@ -119,10 +278,18 @@ class RealtimeSolveService:
                 if not cam or not getattr(cam, "is_capturing", False):
                     await asyncio.sleep(0.1)
                     continue
+                use_fullsolve = self._wants_fullsolve()
+                # 星点统计与跟踪用 lores 帧，只有全量解算才租用主流帧（提星后释放）
+                # Star counting and tracking run on lores; only full solves lease the main frame.
                 # 必须与共享预览走同一套读锁 + 线程卸载，禁止在事件循环线程里直接 capture_array
                 # Must share the same read lock as shared preview; never call capture_array on the event-loop thread.
+                t0 = time.perf_counter()
                 try:
-                    frame, frame_id, _ts = await manager.get_raw_frame()
+                    if use_fullsolve:
+                        lease = await manager.lease_raw_frame(newer_than=last_frame_id)
+                        frame, frame_id = lease.frame, lease.frame_id
+                    else:
+                        frame, frame_id, _ts = await manager.get_lores_frame()
                 except RuntimeError:
                     await asyncio.sleep(0.1)
                     continue
@@ -134,50 +301,278 @@ class RealtimeSolveService:
                     continue
                 last_frame_id = frame_id
                 last_started_mono = time.monotonic()
-                stars = self.extractor.extract(frame)
+                frame_shape = manager.main_frame_shape() or tuple(frame.shape[:2])
+                job = _FrameJob(
+                    frame_id=frame_id,
+                    fullsolve=use_fullsolve,
+                    frame=frame,
+                    camera=cam,
+                    frame_shape=frame_shape,
+                    coord_scale=float(frame_shape[1]) / float(frame.shape[1]),
+                    acquired_mono=last_started_mono,
+                    lease=lease,
+                )
+                lease = None
+                self._acquired += 1
+                self._stats["acquire"].record((time.perf_counter() - t0) * 1000.0)
+                self._extract_queue.put(job)
+            except Exception as exc:  # noqa: BLE001
+                self.state.last_error = str(exc)
+                await asyncio.sleep(0.1)
+            finally:
+                if lease is not None:
+                    lease.release()
+
+    def _extract_sync(self, job: _FrameJob) -> list[StarPoint]:
+        """在提星线程中执行，结束后释放帧 / Runs on the extraction thread; frees the frame after."""
+        try:
+            return self.extractor.extract(
+                job.frame,
+                # lores 帧按主流标定映射 / Lores frames use the main-size calibration, remapped
+                hot_pixels=hot_pixels_for_frame(job.frame, job.camera, job.frame_shape),
+                coord_scale=job.coord_scale,
+            )
+        finally:
+            # 即使协程被取消，线程结束时也会释放租约 / Released by the thread even if the stage is cancelled
+            job.release()
+
+    async def _extract_stage(self) -> None:
+        """提星阶段（专用线程）/ Extract stage, on the dedicated thread."""
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._extract_queue.get()
+            try:
+                t0 = time.perf_counter()
+                job.stars = await loop.run_in_executor(
+                    self._extract_executor, self._extract_sync, job
+                )
+                self._stats["extract"].record((time.perf_counter() - t0) * 1000.0)
                 self.state.frame_count += 1
+                self._filter_queue.put(job)
+            except Exception as exc:  # noqa: BLE001
+                self.state.last_error = str(exc)
+
+    async def _filter_stage(self) -> None:
+        """质量过滤：星点过少不送解算，并决定全量或跟踪 / Quality filter and full/tracking choice."""
+        while True:
+            job = await self._filter_queue.get()
+            try:
+                self._filter_job(job)
+            except Exception as exc:  # noqa: BLE001
+                self.state.last_error = str(exc)
 
-                use_fullsolve = (
-                    self.state.frame_count % self._fullsolve_interval == 0
-                    or self._previous_stars is None
+    def _filter_job(self, job: _FrameJob) -> None:
+        t0 = time.perf_counter()
+        stars = job.stars or []
+        self._previous_stars = stars
+        # 两次全量解算之间若有可用先验，则逐帧跟踪解算（毫秒级）
+        # Between full solves, track every frame from the previous attitude (ms-scale).
+        job.tracking = (
+            not job.fullsolve
+            and self._tracking_enabled
+            and self._track_prior is not None
+        )
+        if len(stars) < self._min_stars:
+            self._stats["filter"].record((time.perf_counter() - t0) * 1000.0)
+            self.state.rejected_count += 1
+            return
+        # 星点跟踪可靠时直接由变换推算指向，不占用解算进程
+        # When the star tracker is reliable, pointing comes from its transform without a solve
+        propagated = (
+            None
+            if job.fullsolve
+            else self._propagate(job.acquired_mono, stars, job.frame_shape)
+        )
+        self._stats["filter"].record((time.perf_counter() - t0) * 1000.0)
+        if propagated is not None:
+            self._publish_queue.put((job, propagated))
+        elif job.fullsolve:
+            self._solve_queue.put(job)
+        elif job.tracking:
+            # 跟踪作业不顶替排队中的全量解算 / A tracking job never replaces a pending full solve
+            self._solve_queue.offer(job, keep=lambda pending: pending.fullsolve)
+
+    async def _solve_stage(self) -> None:
+        """解算阶段：经进程池解算，期间下一帧继续提星 / Solve stage; the next frame extracts meanwhile."""
+        while True:
+            job = await self._solve_queue.get()
+            try:
+                t0 = time.perf_counter()
+                solved = await self._solve_frame(
+                    job.frame_shape, job.stars or [], job.tracking
                 )
-                if use_fullsolve:
-                    solved = await asyncio.to_thread(
-                        self._solve_frame_sync,
-                        frame,
-                        stars,
-                    )
-                    self._apply_solve_result(solved)
-                    self.state.fullsolve_count += 1
-                self._previous_stars = stars
+                elapsed_ms = (time.perf_counter() - t0) * 1000.0
+                self._stats["solve"].record(elapsed_ms)
+                if job.fullsolve and self._scheduler is not None:
+                    self._scheduler.observe_latency(elapsed_ms)
+                self._publish_queue.put((job, solved))
             except Exception as exc:  # noqa: BLE001
                 self.state.last_error = str(exc)
-                await asyncio.sleep(0.1)
 
-    def _solve_frame_sync(
+    async def _publish_stage(self) -> None:
+        """发布阶段：写入结果与跟踪先验 / Publish stage: store the result and tracking prior."""
+        while True:
+            job, solved = await self._publish_queue.get()
+            try:
+                self._publish_job(job, solved)
+            except Exception as exc:  # noqa: BLE001
+                self.state.last_error = str(exc)
+
+    def _publish_job(self, job: _FrameJob, solved: SolveResult) -> None:
+        t0 = time.perf_counter()
+        carried = None
+        if solved.solve_mode != "propagated":
+            if self._scheduler is not None:
+                self._scheduler.observe_solve(
+                    solved.status_code == 1, time.monotonic(), fullsolve=job.fullsolve
+                )
+            if solved.status_code == 1:
+                carried = self._reanchor(job, solved)
+        self._apply_solve_result(solved)
+        if carried is not None:
+            # 解算结果属于较旧的帧，发布沿跟踪推到最新帧后的指向
+            # The solve is for an older frame; publish it carried forward to the newest one
+            self._apply_solve_result(carried)
+        if solved.solve_mode == "propagated":
+            self.state.propagated_count += 1
+        elif solved.solve_mode == "tracking":
+            self.state.tracking_count += 1
+        else:
+            self.state.fullsolve_count += 1
+        self._publish_snapshot(tracking=solved.solve_mode != "full")
+        self._stats["publish"].record((time.perf_counter() - t0) * 1000.0)
+        self._end_to_end_ms.record((time.monotonic() - job.acquired_mono) * 1000.0)
+
+    def _publish_snapshot(self, *, tracking: bool = False) -> None:
+        """向推送订阅者发布当前状态 / Push the current state to stream subscribers."""
+        self.results.publish(
+            {
+                "running": self.state.running,
+                "frame_count": self.state.frame_count,
+                "fullsolve_count": self.state.fullsolve_count,
+                "tracking_count": self.state.tracking_count,
+                "propagated_count": self.state.propagated_count,
+                "rejected_count": self.state.rejected_count,
+                "last_error": self.state.last_error,
+                "result": self.state.last_result,
+            },
+            tracking=tracking,
+        )
+
+    def _new_scheduler(self) -> FullSolveScheduler | None:
+        settings = get_settings()
+        if not settings.solver_fullsolve_adaptive:
+            return None
+        return FullSolveScheduler(
+            min_interval_sec=settings.solver_fullsolve_min_interval_sec,
+            max_interval_sec=settings.solver_fullsolve_max_interval_sec,
+            motion_deg_s=settings.solver_fullsolve_motion_deg_s,
+            min_confidence=settings.solver_fullsolve_min_confidence,
+        )
+
+    def _wants_fullsolve(self) -> bool:
+        """本帧是否全量解算 / Whether the next frame gets a full solve."""
+        if self._scheduler is not None:
+            return self._scheduler.decide(time.monotonic()).fullsolve
+        return (
+            self._acquired + 1
+        ) % self._fullsolve_interval == 0 or self._previous_stars is None
+
+    def _propagate(
+        self, acquired_mono: float, stars: list[StarPoint], frame_shape: tuple[int, ...]
+    ) -> SolveResult | None:
+        """由锚点帧跟踪到本帧并推算姿态，不可靠时返回 None / Track from the anchor and carry its attitude.
+
+        成功时本帧成为新锚点 / On success this frame becomes the new anchor.
+        """
+        anchor = self._anchor
+        if (
+            not self._propagation
+            or anchor is None
+            or acquired_mono <= anchor.acquired_mono
+        ):
+            return None
+        height, width = float(frame_shape[0]), float(frame_shape[1])
+        track = self.tracker.track(
+            anchor.stars, stars, center=(width / 2.0, height / 2.0)
+        )
+        self._last_track = track.to_dict()
+        if self._scheduler is not None:
+            self._scheduler.observe_track(
+                math.hypot(track.delta_x, track.delta_y),
+                track.confidence,
+                float(anchor.solve.fov_deg) / width if anchor.solve.fov_deg else None,
+                acquired_mono - anchor.acquired_mono,
+            )
+        if track.previous_xy is None or track.current_xy is None:
+            return None
+        solved = propagate_solve(
+            anchor.solve,
+            track.previous_xy,
+            track.current_xy,
+            frame_shape,
+            residual_px=track.residual_px,
+        )
+        if solved is None:
+            return None
+        solved.detected_stars = len(stars)
+        self._anchor = _PoseAnchor(acquired_mono, stars, solved)
+        return solved
+
+    def _reanchor(self, job: _FrameJob, solved: SolveResult) -> SolveResult | None:
+        """以解算成功的帧为新锚点；若已有更新的帧被推算过，返回推到该帧的结果。
+        Make the solved frame the anchor; if a newer frame was already propagated, return the
+        solve carried forward to it.
+        """
+        newer = self._anchor
+        self._anchor = _PoseAnchor(job.acquired_mono, job.stars or [], solved)
+        if newer is None or newer.acquired_mono <= job.acquired_mono:
+            return None
+        return self._propagate(newer.acquired_mono, newer.stars, job.frame_shape)
+
+    async def _solve_frame(
         self,
-        frame: Any,
+        frame_shape: tuple[int, ...],
         stars: list[StarPoint],
+        tracking: bool = False,
     ) -> SolveResult:
-        """同步解算单帧（线程池中调用）/ Sync solve for one frame."""
-        return self.solver.solve(
-            stars=stars,
-            frame_shape=frame.shape,
-            hint_ra_deg=self._hint_ra,
-            hint_dec_deg=self._hint_dec,
-            solve_source="realtime",
-            fov_estimate=self._fov_estimate,
-            fov_max_error=self._fov_max_error,
-            solve_timeout_ms=self._solve_timeout_ms,
-        )
+        """经解算进程池解算单帧 / Solve one frame through the solver process pool.
+
+        星点坐标须为主流坐标，``frame_shape`` 为主流画幅 / Stars are in main-frame coordinates.
+
+        ``tracking`` 为真时以上一成功结果为先验，退化时求解器自动回退全量搜索。
+        With ``tracking``, the last good result is the prior; the solver falls back on degradation.
+        ``stop()`` 会取消进行中的解算 / ``stop()`` cancels the in-flight solve.
+        """
+        token = SolveCancelToken()
+        self._inflight_token = token
+        try:
+            return await self.async_solver.solve(
+                stars=stars,
+                frame_shape=frame_shape,
+                hint_ra_deg=self._hint_ra,
+                hint_dec_deg=self._hint_dec,
+                hint_radius_deg=self._hint_radius,
+                solve_source="realtime",
+                fov_estimate=self._fov_estimate,
+                fov_max_error=self._fov_max_error,
+                solve_timeout_ms=self._solve_timeout_ms,
+                prior=self._track_prior if tracking else None,
+                cancel_token=token,
+            )
+        finally:
+            self._inflight_token = None
 
     def _apply_solve_result(self, solved: SolveResult) -> None:
         """写入解算结果 / Persist solve result"""
         row = solved.to_dict()
         attach_sensor_prediction(row, self._solve_context)
         self.state.last_result = row
-        self._hint_ra = solved.ra_deg
-        self._hint_dec = solved.dec_deg
+        self._track_prior = solved if solved.status_code == 1 else None
+        if solved.status_code == 1:
+            self._hint_ra = solved.ra_deg
+            self._hint_dec = solved.dec_deg
+            self._hint_radius = self._hint_radius_setting
 
 
 realtime_solve_service = RealtimeSolveService()
@@ -0,0 +1,154 @@
+"""
+相机暗场标定：热像素索引的采集与查找 / Dark-frame calibration: capturing and looking up hot pixels.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ogscope.algorithms.star_extract import (
+    HotPixelMap,
+    HotPixelStore,
+    build_hot_pixel_map,
+)
+from ogscope.config import get_settings
+
+
+def orientation_tag(camera: Any) -> str:
+    """输出帧的旋转/镜像标识，如 ``r90h`` / Rotation/mirror tag of output frames, e.g. ``r90h``."""
+    tag = f"r{int(getattr(camera, 'rotation', 0) or 0)}"
+    if getattr(camera, "flip_horizontal", False):
+        tag += "h"
+    if getattr(camera, "flip_vertical", False):
+        tag += "v"
+    return tag
+
+
+def sensor_key(camera: Any) -> tuple[Any, ...]:
+    """曝光、增益与帧方向；任一变化即视为另一组传感器状态 / Exposure, gain and orientation of the camera."""
+    return (
+        getattr(camera, "exposure_us", None),
+        getattr(camera, "analogue_gain", None),
+        getattr(camera, "digital_gain", None),
+        orientation_tag(camera),
+    )
+
+
+@lru_cache(maxsize=1)
+def _store_for(root: Path) -> HotPixelStore:
+    return HotPixelStore(root)
+
+
+def get_hot_pixel_store() -> HotPixelStore:
+    """``data_dir/calibration/hot_pixels`` 下的热像素库 / Hot-pixel store under ``data_dir``."""
+    return _store_for(get_settings().data_dir / "calibration" / "hot_pixels")
+
+
+def _current_camera() -> Any | None:
+    from ogscope.web.camera_shared import get_camera_manager  # noqa: PLC0415
+
+    return get_camera_manager().get_camera_instance()
+
+
+def hot_pixels_for_frame(
+    frame: Any, camera: Any | None = None, main_shape: tuple[int, ...] | None = None
+) -> HotPixelMap | None:
+    """当前相机参数下与该帧画幅匹配的热像素索引 / Hot-pixel index matching this frame and camera state.
+
+    未开启 ``solver_hot_pixel_correction``、无相机或未标定时返回 None。
+    None when ``solver_hot_pixel_correction`` is off, there is no camera, or nothing is calibrated.
+    ``main_shape`` 为主流画幅：帧是同视场的缩放流（lores）时按主流标定查找并映射到帧尺寸。
+    ``main_shape`` is the main-stream size: for a scaled stream of the same field (lores) the
+    main-size calibration is looked up and remapped to the frame.
+    """
+    if not get_settings().solver_hot_pixel_correction:
+        return None
+    camera = camera if camera is not None else _current_camera()
+    if camera is None or getattr(camera, "exposure_us", None) is None:
+        return None
+    shape = getattr(frame, "shape", None)
+    if not shape or len(shape) < 2:
+        return None
+    source = main_shape if main_shape and len(main_shape) >= 2 else shape
+    return get_hot_pixel_store().lookup(
+        width=int(source[1]),
+        height=int(source[0]),
+        exposure_us=float(camera.exposure_us),
+        analogue_gain=float(getattr(camera, "analogue_gain", 1.0) or 1.0),
+        orientation=orientation_tag(camera),
+        output_size=(int(shape[1]), int(shape[0])),
+    )
+
+
+async def calibrate_hot_pixels(frames: int | None = None) -> dict[str, Any]:
+    """盖上镜头盖后采集 N 帧暗场并保存热像素索引 / Capture N dark frames and store the hot-pixel index.
+
+    使用相机当前的曝光、增益、分辨率与方向；同参数的旧索引被覆盖。
+    Uses the camera's current exposure, gain, size and orientation; replaces an existing set.
+    """
+    from ogscope.web.camera_shared import get_camera_manager  # noqa: PLC0415
+
+    settings = get_settings()
+    count = max(
+        3,
+        int(
+            frames
+            if frames is not None
+            else settings.solver_hot_pixel_calibration_frames
+        ),
+    )
+    manager = get_camera_manager()
+    await manager.ensure_started()
+    camera = manager.get_camera_instance()
+    if camera is None:
+        raise RuntimeError("相机不可用 / Camera not available")
+
+    exposure_s = float(getattr(camera, "exposure_us", 0) or 0) / 1e6
+    deadline = time.monotonic() + 5.0 + count * max(1.0, 3.0 * exposure_s)
+    captured: list[np.ndarray] = []
+    last_id = -1
+    while len(captured) < count:
+        if time.monotonic() > deadline:
+            raise RuntimeError(
+                f"暗场采集超时（{len(captured)}/{count} 帧）/ Dark-frame capture timed out"
+            )
+        frame, frame_id, _ts = await manager.get_raw_frame()
+        if frame is None or frame_id == last_id:
+            await asyncio.sleep(0.02)
+            continue
+        last_id = frame_id
+        captured.append(np.asarray(frame))
+
+    hot_map = await asyncio.to_thread(
+        build_hot_pixel_map,
+        captured,
+        exposure_us=int(camera.exposure_us),
+        analogue_gain=float(getattr(camera, "analogue_gain", 1.0) or 1.0),
+        orientation=orientation_tag(camera),
+        sigma=float(settings.solver_hot_pixel_sigma),
+    )
+    path = get_hot_pixel_store().save(hot_map)
+    return {
+        "success": True,
+        "frames": count,
+        **hot_map_summary(hot_map),
+        "file": path.name,
+    }
+
+
+def hot_map_summary(hot_map: HotPixelMap) -> dict[str, Any]:
+    """API 用摘要 / Summary for API responses."""
+    return {
+        "width": hot_map.width,
+        "height": hot_map.height,
+        "orientation": hot_map.orientation,
+        "exposure_us": hot_map.exposure_us,
+        "analogue_gain": hot_map.analogue_gain,
+        "hot_pixels": hot_map.count,
+    }
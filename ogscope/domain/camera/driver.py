@@ -67,3 +67,110 @@ class LinuxpyV4L2Driver:
         raise NotImplementedError(
             "linuxpy driver is reserved but not implemented / linuxpy 驱动已预留但未实现"
         )
+
+
+class _SimulatedRequest:
+    """模拟采集请求 / Simulated capture request."""
+
+    def __init__(self, arrays: dict[str, Any], metadata: dict[str, Any]):
+        self._arrays = arrays
+        self._metadata = metadata
+
+    def make_array(self, name: str) -> Any:
+        return self._arrays.get(name)
+
+    def get_metadata(self) -> dict[str, Any]:
+        return dict(self._metadata)
+
+    def release(self) -> None:
+        return None
+
+
+class SimulatedPicamera2:
+    """无传感器时代替 Picamera2 的模拟驱动 / Picamera2 stand-in for running without the sensor.
+
+    实现 IMX327 驱动用到的接口子集，按配置的格式（RGB888 / YUV420）产出固定的合成星场，
+    YUV420 缓冲布局与 Picamera2 相同（``(H*3/2, W)``，Y/U/V 平面顺序排列）。
+    Implements the subset of the API the IMX327 driver uses and renders a fixed synthetic
+    star field in the configured format; YUV420 arrays use Picamera2's ``(H*3/2, W)`` layout.
+    """
+
+    camera_properties = {"Model": "simulated-imx327"}
+
+    def __init__(self, seed: int = 0, stars: int = 150):
+        self.camera_controls: dict[str, Any] = {}
+        self.controls: dict[str, Any] = {}
+        self.started = False
+        self._seed = int(seed)
+        self._stars = int(stars)
+        self._config: dict[str, Any] = {}
+        self._scenes: dict[tuple[int, int], Any] = {}
+        self._sequence = 0
+
+    def create_video_configuration(self, **kwargs: Any) -> dict[str, Any]:
+        return dict(kwargs)
+
+    create_still_configuration = create_video_configuration
+
+    def configure(self, config: dict[str, Any]) -> None:
+        self._config = dict(config)
+
+    def set_controls(self, controls: dict[str, Any]) -> None:
+        self.controls.update(controls)
+
+    def start(self) -> None:
+        self.started = True
+
+    def stop(self) -> None:
+        self.started = False
+
+    def _scene(self, width: int, height: int) -> Any:
+        """按尺寸缓存的 uint8 灰度星场；星点取归一化坐标，各流几何一致 / uint8 star field per size.
+
+        星点位置为归一化坐标，因此 main 与 lores 是同一片天区的不同缩放。
+        Star positions are normalised, so main and lores show the same field at different scales.
+        """
+        import cv2
+        import numpy as np
+
+        key = (width, height)
+        if key not in self._scenes:
+            rng = np.random.default_rng(self._seed)
+            u = rng.uniform(0.02, 0.98, self._stars)
+            v = rng.uniform(0.02, 0.98, self._stars)
+            amp = rng.uniform(40.0, 2000.0, self._stars).astype(np.float32)
+            scale = width / 1280.0
+            image = np.full((height, width), 12.0, dtype=np.float32)
+            xs = np.clip(np.round(u * width - 0.5).astype(int), 0, width - 1)
+            ys = np.clip(np.round(v * height - 0.5).astype(int), 0, height - 1)
+            np.add.at(image, (ys, xs), amp * scale * scale)
+            image = cv2.GaussianBlur(image, (0, 0), max(0.7, 1.6 * scale))
+            self._scenes[key] = np.clip(image, 0, 255).astype(np.uint8)
+        return self._scenes[key]
+
+    def _render(self, stream: dict[str, Any] | None) -> Any:
+        import numpy as np
+
+        if not stream:
+            return None
+        width, height = (int(v) for v in stream.get("size", (640, 480)))
+        gray = self._scene(width, height)
+        fmt = str(stream.get("format", "RGB888")).upper()
+        if fmt in {"YUV420", "I420", "YU12"}:
+            buf = np.full((height * 3 // 2, width), 128, dtype=np.uint8)
+            buf[:height] = gray
+            return buf
+        return np.repeat(gray[:, :, None], 3, axis=2)
+
+    def capture_request(self) -> _SimulatedRequest:
+        self._sequence += 1
+        arrays = {
+            "main": self._render(self._config.get("main")),
+            "lores": self._render(self._config.get("lores")),
+        }
+        metadata = {
+            "ExposureTime": self.controls.get("ExposureTime"),
+            "AnalogueGain": self.controls.get("AnalogueGain"),
+            "SensorTimestamp": self._sequence,
+        }
+        return _SimulatedRequest(arrays, metadata)
@@ -7,8 +7,17 @@ import time
 from dataclasses import dataclass
 from typing import Any, Protocol
 
+import numpy as np
+
+from ogscope.domain.camera.yuv import YUV420_FORMATS, i420_buffer
+
 logger = logging.getLogger(__name__)
 
+# PyTurboJPEG 1.8 的 encode_from_yuv 按 4 字节对齐平面行（不可配置），紧凑 I420 的色度行
+# 宽为 width/2，宽度须为 8 的倍数 / PyTurboJPEG 1.8's encode_from_yuv assumes plane rows padded
+# to 4 bytes (not configurable); packed I420 chroma rows are width/2, so width must be a multiple of 8.
+_TURBO_YUV_WIDTH_MULTIPLE = 8
+
 
 @dataclass(slots=True)
 class EncodedImage:
@@ -43,6 +52,12 @@ class OpenCVEncoder:
         """按源格式转换给 OpenCV；相机默认 RGB888 / Convert source frame for OpenCV."""
         fmt = str(source_format or "RGB888").upper()
         try:
+            if fmt in YUV420_FORMATS:
+                # 有完整 I420 缓冲时还原彩色，否则按灰度编码 Y 平面 / Colour from I420, else gray Y plane
+                buf = i420_buffer(frame)
+                if buf is not None:
+                    return cv2_module.cvtColor(buf, cv2_module.COLOR_YUV2BGR_I420)
+                return frame
             if getattr(frame, "ndim", 0) == 3 and int(frame.shape[2]) >= 3:
                 if fmt in {"RGB888", "RGB", "RGB24"}:
                     return cv2_module.cvtColor(frame, cv2_module.COLOR_RGB2BGR)
@@ -93,11 +108,21 @@ class TurboJPEGEncoder:
     name = "turbojpeg"
 
     def __init__(self) -> None:
-        from turbojpeg import TJPF_BGR, TJPF_RGB, TurboJPEG
+        from turbojpeg import (
+            TJPF_BGR,
+            TJPF_GRAY,
+            TJPF_RGB,
+            TJSAMP_420,
+            TJSAMP_GRAY,
+            TurboJPEG,
+        )
 
         self._jpeg = TurboJPEG()
         self._tjpf_rgb = TJPF_RGB
         self._tjpf_bgr = TJPF_BGR
+        self._tjpf_gray = TJPF_GRAY
+        self._tjsamp_420 = TJSAMP_420
+        self._tjsamp_gray = TJSAMP_GRAY
 
     @classmethod
     def available(cls) -> bool:
@@ -111,17 +136,49 @@ class TurboJPEGEncoder:
     def encode_jpeg(
         self, frame: Any, *, quality: int = 75, source_format: str = "RGB888"
     ) -> EncodedImage | None:
-        """编码 JPEG；TurboJPEG 支持直接输入 RGB/BGR / Encode JPEG from RGB/BGR."""
+        """编码 JPEG；TurboJPEG 直接输入 RGB/BGR、I420 平面或灰度 / Encode JPEG from RGB/BGR, I420 or gray.
+
+        YUV420 帧直接交给 ``encode_from_yuv``，跳过 RGB 转换（宽度不满足其行对齐时先转 BGR）；
+        单通道帧按灰度 JPEG 编码。
+        YUV420 frames go straight to ``encode_from_yuv`` with no RGB step (via BGR when the width
+        does not meet its row padding); mono frames become grayscale JPEGs.
+        """
         fmt = str(source_format or "RGB888").upper()
-        pixel_format = (
-            self._tjpf_bgr if fmt in {"BGR888", "BGR", "BGR24"} else self._tjpf_rgb
-        )
+        quality = int(max(10, min(100, quality)))
         try:
-            data = self._jpeg.encode(
-                frame,
-                quality=int(max(10, min(100, quality))),
-                pixel_format=pixel_format,
-            )
+            buf = i420_buffer(frame) if fmt in YUV420_FORMATS else None
+            if buf is not None and int(frame.shape[1]) % _TURBO_YUV_WIDTH_MULTIPLE == 0:
+                data = self._jpeg.encode_from_yuv(
+                    buf,
+                    int(frame.shape[0]),
+                    int(frame.shape[1]),
+                    quality=quality,
+                    jpeg_subsample=self._tjsamp_420,
+                )
+            elif buf is not None:
+                import cv2
+
+                data = self._jpeg.encode(
+                    cv2.cvtColor(buf, cv2.COLOR_YUV2BGR_I420),
+                    quality=quality,
+                    pixel_format=self._tjpf_bgr,
+                )
+            elif getattr(frame, "ndim", 0) == 2:
+                data = self._jpeg.encode(
+                    np.asarray(frame)[:, :, None],
+                    quality=quality,
+                    pixel_format=self._tjpf_gray,
+                    jpeg_subsample=self._tjsamp_gray,
+                )
+            else:
+                pixel_format = (
+                    self._tjpf_bgr
+                    if fmt in {"BGR888", "BGR", "BGR24"}
+                    else self._tjpf_rgb
+                )
+                data = self._jpeg.encode(
+                    frame, quality=quality, pixel_format=pixel_format
+                )
             return EncodedImage(bytes(data), self.name, source_format)
         except Exception as exc:
             logger.debug("TurboJPEG encode failed / TurboJPEG 编码失败: %s", exc)
@@ -0,0 +1,191 @@
+"""
+主流原始帧环形缓冲 / Ring of raw main-stream frames
+
+抓帧循环把主流帧复制进少量预分配槽位；分析端租用（lease）最新一帧，拿到只读视图而不是副本，
+租约释放前该槽位不会被覆盖。所有槽位都被租用时丢弃新帧而不是分配新内存，因此内存上限为
+``槽数 × 单帧大小``。
+The grabber copies main-stream frames into a few preallocated slots. Analysis consumers lease
+the newest one and get a read-only view instead of a copy; a leased slot is never overwritten
+until released. When every slot is pinned the new frame is dropped rather than allocating, so
+memory stays at ``slots × frame size``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+
+import numpy as np
+
+from ogscope.domain.camera.yuv import i420_buffer, luma_frame
+
+
+@dataclass(slots=True)
+class _Slot:
+    buffer: np.ndarray | None = None
+    # 缓冲是 I420 时为 Y 平面高度，否则 0 / Y-plane height when the buffer is I420, else 0
+    luma_height: int = 0
+    frame_id: int = -1
+    timestamp: float = 0.0
+    refs: int = 0
+
+
+class FrameLease:
+    """租用的只读帧，``release()`` 后槽位可被复用 / A leased read-only frame; ``release()`` frees the slot.
+
+    可作上下文管理器使用；重复释放无副作用。
+    Usable as a context manager; releasing twice is harmless.
+    """
+
+    __slots__ = ("frame", "frame_id", "timestamp", "_ring", "_slot")
+
+    def __init__(
+        self,
+        frame: Any,
+        frame_id: int,
+        timestamp: float,
+        ring: FrameRing | None = None,
+        slot: _Slot | None = None,
+    ) -> None:
+        self.frame = frame
+        self.frame_id = frame_id
+        self.timestamp = timestamp
+        self._ring = ring
+        self._slot = slot
+
+    @property
+    def pinned(self) -> bool:
+        """是否仍占用环形缓冲槽位 / Whether the lease still pins a ring slot."""
+        return self._slot is not None
+
+    def release(self) -> None:
+        if self._ring is not None and self._slot is not None:
+            self._ring._unpin(self._slot)
+        self._slot = None
+
+    def detach(self) -> Any:
+        """复制出可长期持有的帧并释放租约 / Copy the frame out and release the lease.
+
+        未占用槽位的租约本就持有独立帧，直接返回。
+        A lease that pins nothing already owns its frame and returns it as is.
+        """
+        frame = self.frame
+        if self.pinned:
+            buf = i420_buffer(frame)
+            if buf is not None:
+                frame = luma_frame(buf.copy(), int(frame.shape[0]))
+            else:
+                frame = np.array(frame)
+        self.release()
+        return frame
+
+    def __enter__(self) -> FrameLease:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.release()
+
+
+class FrameRing:
+    """固定槽数的原始帧环形缓冲 / Fixed-size ring of raw frames.
+
+    ``write`` 在抓帧线程调用，``lease_latest`` 与释放在事件循环中调用，内部加锁。
+    ``write`` runs on the grabber thread while leases are taken and released on the event loop;
+    all access is locked.
+    """
+
+    def __init__(self, slots: int) -> None:
+        # 最新帧槽位不被覆盖，至少需要两个槽 / The newest slot is never overwritten, so use at least two
+        count = int(slots)
+        self._slots = [_Slot() for _ in range(max(2, count) if count > 0 else 0)]
+        self._lock = Lock()
+        self._latest: _Slot | None = None
+        self._next = 0
+        self.writes = 0
+        self.overruns = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._slots)
+
+    def write(self, frame: Any, frame_id: int, timestamp: float) -> bool:
+        """把一帧复制进空闲槽位；全部被租用时丢弃并返回 False / Copy a frame into a free slot.
+
+        I420 帧（:class:`~ogscope.domain.camera.yuv.YUV420Frame`）复制完整缓冲，租出时仍是带色度的
+        Y 平面视图。
+        I420 frames copy their full buffer and are leased back as Y-plane views with chroma.
+        """
+        source = i420_buffer(frame)
+        luma_height = int(frame.shape[0]) if source is not None else 0
+        if source is None:
+            source = np.asarray(frame)
+        with self._lock:
+            slot = self._free_slot_locked()
+            if slot is None:
+                self.overruns += 1
+                return False
+            # 槽位被占用期间不会走到这里，因此原地覆盖安全 / Only unpinned slots are reused in place
+            if (
+                slot.buffer is None
+                or slot.buffer.shape != source.shape
+                or slot.buffer.dtype != source.dtype
+            ):
+                slot.buffer = np.empty_like(source)
+            np.copyto(slot.buffer, source)
+            slot.luma_height = luma_height
+            slot.frame_id = int(frame_id)
+            slot.timestamp = float(timestamp)
+            self._latest = slot
+            self.writes += 1
+            return True
+
+    def _free_slot_locked(self) -> _Slot | None:
+        count = len(self._slots)
+        for step in range(count):
+            slot = self._slots[(self._next + step) % count]
+            if slot.refs == 0 and slot is not self._latest:
+                self._next = (self._next + step + 1) % count
+                return slot
+        return None
+
+    def lease_latest(self, newer_than: int | None = None) -> FrameLease | None:
+        """租用最新一帧；没有（或不比 ``newer_than`` 新）时返回 None / Lease the newest frame, if any."""
+        with self._lock:
+            slot = self._latest
+            if slot is None or slot.buffer is None:
+                return None
+            if newer_than is not None and slot.frame_id <= newer_than:
+                return None
+            slot.refs += 1
+            view = slot.buffer.view()
+            view.flags.writeable = False
+            frame = luma_frame(view, slot.luma_height) if slot.luma_height else view
+            return FrameLease(frame, slot.frame_id, slot.timestamp, self, slot)
+
+    def _unpin(self, slot: _Slot) -> None:
+        with self._lock:
+            slot.refs = max(0, slot.refs - 1)
+
+    def clear(self) -> None:
+        """释放全部缓冲 / Drop all buffers.
+
+        未释放租约的视图仍持有各自的内存，消费者丢弃后回收。
+        Views from outstanding leases keep their own memory until the consumer drops them.
+        """
+        with self._lock:
+            self._slots = [_Slot() for _ in self._slots]
+            self._latest = None
+            self._next = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "raw_ring_slots": len(self._slots),
+                "raw_ring_pinned": sum(1 for s in self._slots if s.refs > 0),
+                "raw_ring_bytes": sum(
+                    s.buffer.nbytes for s in self._slots if s.buffer is not None
+                ),
+                "raw_ring_writes": int(self.writes),
+                "raw_ring_overruns": int(self.overruns),
+            }
@@ -0,0 +1,111 @@
+"""
+YUV420（I420）帧工具 / YUV420 (I420) frame helpers
+
+YUV420 采集时主流每像素 1.5 字节（RGB888 为 3 字节），亮度平面即解算所需的全部信息。
+相机把紧凑的 I420 缓冲（Y、U、V 三个平面顺序排列）包装为 :class:`YUV420Frame`：它本身是 Y 平面的
+零拷贝视图，分析端当作单通道帧使用；编码端通过 :func:`i420_buffer` 取回完整缓冲直接编码 JPEG。
+With YUV420 capture the main stream is 1.5 bytes per pixel instead of 3, and the luminance
+plane is all the solver needs. The camera wraps the packed I420 buffer (Y, U, V planes back to
+back) as a :class:`YUV420Frame`: a zero-copy view of the Y plane that analysis treats as a
+mono frame, while encoders recover the full buffer via :func:`i420_buffer`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+YUV420_FORMATS = {"YUV420", "I420", "YU12"}
+
+
+class YUV420Frame(np.ndarray):
+    """附带完整 I420 缓冲的 Y 平面视图 / Y-plane view that carries its full I420 buffer."""
+
+    i420: np.ndarray | None
+
+    def __array_finalize__(self, obj: Any) -> None:
+        self.i420 = getattr(obj, "i420", None)
+
+
+def i420_planes(
+    buf: np.ndarray, width: int, height: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """紧凑 I420 缓冲的 Y/U/V 平面视图 / Y, U and V plane views of a packed I420 buffer."""
+    flat = buf.reshape(-1)
+    y_size = width * height
+    c_size = (width // 2) * (height // 2)
+    y = flat[:y_size].reshape(height, width)
+    u = flat[y_size : y_size + c_size].reshape(height // 2, width // 2)
+    v = flat[y_size + c_size : y_size + 2 * c_size].reshape(height // 2, width // 2)
+    return y, u, v
+
+
+def pack_i420(buf: np.ndarray, width: int, height: int) -> np.ndarray:
+    """把驱动给出的 ``(H*3/2, stride)`` 缓冲整理为紧凑 I420 / Pack a ``(H*3/2, stride)`` buffer tightly.
+
+    行宽等于画面宽时原样返回（零拷贝）；有行填充时逐平面复制去掉填充。
+    Returned as-is (no copy) when the stride equals the width; otherwise each plane is
+    copied without its row padding.
+    """
+    stride = int(buf.shape[1])
+    if stride == width and buf.flags.c_contiguous:
+        return buf
+    out = np.empty((height * 3 // 2, width), dtype=np.uint8)
+    y, u, v = i420_planes(out, width, height)
+    y[...] = buf[:height, :width]
+    chroma = np.ascontiguousarray(buf[height:]).reshape(-1)
+    c_rows, c_stride = height // 2, stride // 2
+    u[...] = chroma[: c_rows * c_stride].reshape(c_rows, c_stride)[:, : width // 2]
+    v[...] = chroma[c_rows * c_stride : 2 * c_rows * c_stride].reshape(
+        c_rows, c_stride
+    )[:, : width // 2]
+    return out
+
+
+def map_i420(
+    buf: np.ndarray,
+    width: int,
+    height: int,
+    fn: Callable[[np.ndarray, bool], np.ndarray],
+) -> tuple[np.ndarray, int, int]:
+    """逐平面做几何变换并重新打包 / Apply a geometric transform per plane and repack.
+
+    ``fn(plane, is_chroma)`` 须对三个平面做同样的几何变换（色度平面尺寸为一半）。
+    ``fn(plane, is_chroma)`` must apply the same geometry to all planes (chroma is half size).
+    Returns ``(buffer, width, height)``.
+    """
+    y, u, v = i420_planes(buf, width, height)
+    y2 = fn(y, False)
+    out_h, out_w = int(y2.shape[0]), int(y2.shape[1])
+    out = np.empty((out_h * 3 // 2, out_w), dtype=np.uint8)
+    oy, ou, ov = i420_planes(out, out_w, out_h)
+    oy[...] = y2
+    ou[...] = fn(u, True)
+    ov[...] = fn(v, True)
+    return out, out_w, out_h
+
+
+def luma_frame(buf: np.ndarray, height: int) -> YUV420Frame:
+    """紧凑 I420 缓冲的 Y 平面（零拷贝）/ Zero-copy Y plane of a packed I420 buffer."""
+    frame = buf[:height].view(YUV420Frame)
+    frame.i420 = buf
+    return frame
+
+
+def i420_buffer(frame: Any) -> np.ndarray | None:
+    """取回 Y 平面视图背后的完整 I420 缓冲 / The full I420 buffer behind a Y-plane view.
+
+    只有帧确实是整幅 Y 平面（而非切片或派生数组）时才返回，否则 None。
+    Only returned when the frame really is the whole Y plane, not a slice or derived array.
+    """
+    buf = getattr(frame, "i420", None)
+    if buf is None or getattr(frame, "ndim", 0) != 2:
+        return None
+    height, width = int(frame.shape[0]), int(frame.shape[1])
+    if buf.shape != (height * 3 // 2, width) or width % 2 or height % 2:
+        return None
+    if frame.__array_interface__["data"][0] != buf.__array_interface__["data"][0]:
+        return None
+    return buf
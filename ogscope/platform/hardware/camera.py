@@ -10,7 +10,18 @@ from typing import Any, Optional
 
 import numpy as np
 
-from ogscope.domain.camera.driver import CameraCapabilities, LinuxpyV4L2Driver
+from ogscope.domain.camera.driver import (
+    CameraCapabilities,
+    LinuxpyV4L2Driver,
+    SimulatedPicamera2,
+)
+from ogscope.domain.camera.yuv import (
+    YUV420_FORMATS,
+    i420_planes,
+    luma_frame,
+    map_i420,
+    pack_i420,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -74,10 +85,20 @@ class IMX327MIPICamera(CameraInterface):
         self._last_metadata: dict[str, Any] = {}
         self.driver_name = "picamera2-imx327"
         self.backend_name = "picamera2/libcamera"
-        self.output_pixel_format = "RGB888"
+        # 主流采集格式：rgb888 | yuv420（仅亮度进入分析，彩色预览直接由 I420 编码）
+        # Main stream format: rgb888 | yuv420 (analysis gets the Y plane; previews encode from I420)
+        self.capture_format = (
+            "yuv420"
+            if str(config.get("capture_format", "rgb888")).lower() == "yuv420"
+            else "rgb888"
+        )
+        # 用模拟 Picamera2 代替真实传感器 / Use the simulated Picamera2 instead of the sensor
+        self.simulated = bool(config.get("simulated", False))
         self._frame_duration_limits: tuple[int, int] | None = None
         self._lores_available = False
         self._last_lores_stats: dict[str, Any] = {}
+        # 实际配置的 lores 尺寸 / Actually configured lores size
+        self._lores_size: tuple[int, int] = (0, 0)
 
         # 相机参数 / Camera parameters
         requested_width = int(config.get("width", 640))
@@ -106,8 +127,8 @@ class IMX327MIPICamera(CameraInterface):
             config.get("noise_reduction_mode", config.get("noise_reduction", "fast"))
         )
         self.lores_enabled = bool(config.get("lores_enabled", True))
-        self.lores_width = self._align_even(int(config.get("lores_width", 320)))
-        self.lores_height = self._align_even(int(config.get("lores_height", 240)))
+        self.lores_width = self._align_even(int(config.get("lores_width", 640)))
+        self.lores_height = self._align_even(int(config.get("lores_height", 480)))
         self.lores_format = str(config.get("lores_format", "YUV420"))
         # 采样模式与尺寸（supersample: 采集分辨率可高于输出分辨率） / Sampling mode and size (supersample: acquisition resolution can be higher than output resolution)
         self.sampling_mode = config.get(
@@ -129,6 +150,55 @@ class IMX327MIPICamera(CameraInterface):
             f"初始化 IMX327 MIPI 相机: {self.width}x{self.height}@{self.fps}fps"
         )
 
+    @property
+    def output_pixel_format(self) -> str:
+        """``capture_image`` 输出帧的像素格式 / Pixel format of frames returned by ``capture_image``.
+
+        RGB888：HxWx3；YUV420：附带 I420 缓冲的 Y 平面；GRAY8：YUV420 采集下的黑白模式（仅 Y 平面）。
+        RGB888: HxWx3; YUV420: Y plane carrying its I420 buffer; GRAY8: mono mode on YUV420 capture.
+        """
+        if self.capture_format != "yuv420":
+            return "RGB888"
+        return "GRAY8" if self.color_mode == "mono" else "YUV420"
+
+    def _main_stream_format(self) -> str:
+        return "YUV420" if self.capture_format == "yuv420" else "RGB888"
+
+    @property
+    def lores_available(self) -> bool:
+        """lores 流是否已配置成功 / Whether the lores stream is configured."""
+        return bool(self._lores_available)
+
+    @property
+    def lores_pixel_format(self) -> str:
+        """``capture_lores_image`` 输出帧的像素格式 / Pixel format of ``capture_lores_image`` frames."""
+        if str(self.lores_format).upper() not in YUV420_FORMATS:
+            return "RGB888"
+        return "GRAY8" if self.color_mode == "mono" else "YUV420"
+
+    def output_frame_shape(self) -> tuple[int, int]:
+        """主流输出帧的 (高, 宽)，已计入旋转 / (height, width) of main frames after rotation."""
+        if self.rotation in (90, 270):
+            return int(self.output_width), int(self.output_height)
+        return int(self.output_height), int(self.output_width)
+
+    def _lores_stream_size(self) -> tuple[int, int]:
+        """lores 配置框内、与采集画幅同宽高比的尺寸 / Lores size inside the configured box at the capture aspect.
+
+        lores 由 ISP 从同一画幅缩放而来，宽高比一致时其星点坐标只差一个统一倍率。
+        The ISP scales lores from the same field, so with equal aspect its star coordinates
+        differ from the main frame by one uniform factor.
+        """
+        scale = min(
+            1.0,
+            self.lores_width / float(self.capture_width),
+            self.lores_height / float(self.capture_height),
+        )
+        return (
+            self._align_even(round(self.capture_width * scale)),
+            self._align_even(round(self.capture_height * scale)),
+        )
+
     @staticmethod
     def _to_number(value: Any) -> Optional[float]:
         try:
@@ -294,7 +364,7 @@ class IMX327MIPICamera(CameraInterface):
         return mode, capture_w, capture_h, output_width, output_height
 
     def _resize_preserve_fov(
-        self, image: np.ndarray, target_width: int, target_height: int
+        self, image: np.ndarray, target_width: int, target_height: int, fill: int = 0
     ) -> np.ndarray:
         """整幅等比缩放后必要时黑边填充，不裁切画面中心 / Uniform scale + letterbox; no center crop."""
         import cv2
@@ -318,7 +388,7 @@ class IMX327MIPICamera(CameraInterface):
         right = pad_x - left
         top = pad_y // 2
         bottom = pad_y - top
-        border_value = (0, 0, 0) if len(resized.shape) == 3 else 0
+        border_value = (fill, fill, fill) if len(resized.shape) == 3 else fill
         return cv2.copyMakeBorder(
             resized,
             top,
@@ -458,13 +528,17 @@ class IMX327MIPICamera(CameraInterface):
         """创建含可选 lores 的视频配置 / Create video config with optional lores stream."""
         if not self.camera:
             raise RuntimeError("camera missing")
-        main = {"size": (self.capture_width, self.capture_height), "format": "RGB888"}
+        main = {
+            "size": (self.capture_width, self.capture_height),
+            "format": self._main_stream_format(),
+        }
         if self.lores_enabled:
+            self._lores_size = self._lores_stream_size()
             try:
                 cfg = self.camera.create_video_configuration(
                     main=main,
                     lores={
-                        "size": (self.lores_width, self.lores_height),
+                        "size": self._lores_size,
                         "format": self.lores_format,
                     },
                     buffer_count=self.PREVIEW_BUFFER_COUNT,
@@ -482,19 +556,18 @@ class IMX327MIPICamera(CameraInterface):
             buffer_count=self.PREVIEW_BUFFER_COUNT,
         )
 
-    def _collect_lores_stats(self, request: Any) -> None:
-        """从 lores 流提取轻量亮度统计 / Extract lightweight luminance stats from lores stream."""
+    def _collect_lores_stats(self, request: Any) -> Any:
+        """从 lores 流提取轻量亮度统计，返回 lores 数组 / Extract lores luminance stats; returns the array."""
         if not self._lores_available:
-            return
+            return None
+        lores = None
         try:
             lores = request.make_array("lores")
             if lores is None:
-                return
-            if (
-                len(getattr(lores, "shape", ())) == 2
-                and lores.shape[0] >= self.lores_height
-            ):
-                y_plane = lores[: self.lores_height, :]
+                return None
+            lores_h = self._lores_size[1]
+            if len(getattr(lores, "shape", ())) == 2 and lores.shape[0] >= lores_h:
+                y_plane = lores[:lores_h, :]
             elif len(getattr(lores, "shape", ())) >= 3:
                 y_plane = lores[..., 0]
             else:
@@ -506,6 +579,7 @@ class IMX327MIPICamera(CameraInterface):
             }
         except Exception as e:
             logger.debug("读取 lores 统计失败 / Failed to read lores stats: %s", e)
+        return lores
 
     def _camera_capabilities(self) -> dict[str, Any]:
         """汇总相机能力供 API/UI 降级 / Summarize camera capabilities for API/UI fallback."""
@@ -514,8 +588,8 @@ class IMX327MIPICamera(CameraInterface):
             driver=self.driver_name,
             backend=self.backend_name,
             lores_stream=bool(self._lores_available),
-            lores_width=self.lores_width if self._lores_available else 0,
-            lores_height=self.lores_height if self._lores_available else 0,
+            lores_width=self._lores_size[0] if self._lores_available else 0,
+            lores_height=self._lores_size[1] if self._lores_available else 0,
             lores_format=self.lores_format if self._lores_available else "",
             ae_flicker=("AeFlickerMode" in cc or "AeFlickerPeriod" in cc),
             manual_digital_gain="DigitalGain" in cc,
@@ -635,12 +709,17 @@ class IMX327MIPICamera(CameraInterface):
     def initialize(self) -> bool:
         """初始化 MIPI 相机 / Initialize MIPI camera"""
         try:
-            from picamera2 import Picamera2
+            if self.simulated:
+                self.camera = SimulatedPicamera2()
+                self.driver_name = "simulated-imx327"
+                self.backend_name = "simulated"
+            else:
+                from picamera2 import Picamera2
 
-            self.camera = Picamera2()
+                self.camera = Picamera2()
 
-            # 配置主流 + 可选 lores 流；RGB888 保证预览/解算色序一致
-            # Configure main + optional lores stream; RGB888 keeps preview/solve color order stable.
+            # 配置主流 + 可选 lores 流；RGB888 保证预览/解算色序一致，YUV420 只多出色度平面
+            # Configure main + optional lores stream; RGB888 keeps colour order stable, YUV420 halves memory.
             camera_config = self._create_video_configuration()
 
             self.camera.configure(camera_config)
@@ -753,57 +832,169 @@ class IMX327MIPICamera(CameraInterface):
                 self._collect_lores_stats(request)
             finally:
                 request.release()
+            return self._finish_main(image)
 
-            # 如果是 RAW 格式，需要转换为 RGB / If it is RAW format, it needs to be converted to RGB
-            if len(image.shape) == 2:  # RAW 格式 / RAW format
-                # 这里需要实现 RAW 到 RGB 的转换 / Here you need to implement RAW to RGB conversion
-                # 暂时返回原始数据 / Temporarily return to original data
-                pass
+        except Exception as e:
+            logger.error(f"捕获图像失败: {e}")
+            return None
+
+    def capture_streams(self) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """同一请求取主流与 lores，返回 (main, lores) / Main and lores frames from one request.
 
-            # 输出重采样（仅当采集与输出不一致） / Output resampling only when capture/output differ
+        预览编码 lores、同时分析需要主流时使用，避免为两路各等待一帧。lores 不可用时第二项为 None。
+        For when the preview encodes lores while analysis needs main, so the two streams do not
+        each wait for a frame. The second item is None when lores is unavailable.
+        """
+        if not (self.is_initialized and self.is_capturing):
+            return None, None
+        try:
+            request = self.camera.capture_request()
             try:
-                if (self.output_width, self.output_height) != (
-                    image.shape[1],
-                    image.shape[0],
-                ):
-                    original_shape = image.shape[:2]
-                    image = self._resize_preserve_fov(
-                        image,
-                        self.output_width,
-                        self.output_height,
-                    )
-                    logger.debug(
-                        f"输出重采样: {original_shape[1]}x{original_shape[0]} -> {self.output_width}x{self.output_height}"
-                    )
-            except Exception as e:
-                logger.warning(f"输出重采样失败（忽略，使用原图）: {e}")
+                image = request.make_array("main")
+                self._last_metadata = dict(request.get_metadata() or {})
+                lores = self._collect_lores_stats(request)
+            finally:
+                request.release()
+            main = self._finish_main(image)
+            return main, self._finish_lores(lores) if lores is not None else None
+        except Exception as e:
+            logger.error(f"捕获主流与 lores 失败: {e}")
+            return None, None
+
+    def _finish_main(self, image: np.ndarray) -> np.ndarray:
+        """主流后处理：重采样、旋转、镜像与颜色模式 / Post-process a main-stream array."""
+        if self.capture_format == "yuv420":
+            return self._finish_yuv420(
+                image, self.capture_width, self.output_width, self.output_height
+            )
 
-            # 应用旋转 / Apply rotation
-            if self.rotation != 0:
-                image = self.apply_rotation(image, self.rotation)
+        # 如果是 RAW 格式，需要转换为 RGB / If it is RAW format, it needs to be converted to RGB
+        if len(image.shape) == 2:  # RAW 格式 / RAW format
+            # 这里需要实现 RAW 到 RGB 的转换 / Here you need to implement RAW to RGB conversion
+            # 暂时返回原始数据 / Temporarily return to original data
+            pass
+
+        # 输出重采样（仅当采集与输出不一致） / Output resampling only when capture/output differ
+        try:
+            if (self.output_width, self.output_height) != (
+                image.shape[1],
+                image.shape[0],
+            ):
+                original_shape = image.shape[:2]
+                image = self._resize_preserve_fov(
+                    image,
+                    self.output_width,
+                    self.output_height,
+                )
+                logger.debug(
+                    f"输出重采样: {original_shape[1]}x{original_shape[0]} -> {self.output_width}x{self.output_height}"
+                )
+        except Exception as e:
+            logger.warning(f"输出重采样失败（忽略，使用原图）: {e}")
 
-            image = self._apply_flip(image)
+        # 应用旋转 / Apply rotation
+        if self.rotation != 0:
+            image = self.apply_rotation(image, self.rotation)
 
-            # 应用颜色模式转换 / Apply color mode conversion
-            if self.color_mode == "mono" and len(image.shape) == 3:
-                # 将彩色图像转换为灰度 / Convert color image to grayscale
-                import cv2
+        image = self._apply_flip(image)
 
-                gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-                # 转换为3通道灰度图像（保持兼容性） / Convert to 3-channel grayscale image (maintain compatibility)
-                image = cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
-                logger.debug("应用黑白模式转换")
+        # 应用颜色模式转换 / Apply color mode conversion
+        if self.color_mode == "mono" and len(image.shape) == 3:
+            # 将彩色图像转换为灰度 / Convert color image to grayscale
+            import cv2
 
-            if isinstance(image, np.ndarray) and not image.flags["C_CONTIGUOUS"]:
-                # 旋转/镜像可能产生负 stride 视图，编码器会被迫慢速复制；这里统一整理为连续内存。
-                # Rotation/flip may create negative-stride views; make contiguous before encoding/analysis.
-                image = np.ascontiguousarray(image)
+            gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+            # 转换为3通道灰度图像（保持兼容性） / Convert to 3-channel grayscale image (maintain compatibility)
+            image = cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB)
+            logger.debug("应用黑白模式转换")
 
-            return image
+        if isinstance(image, np.ndarray) and not image.flags["C_CONTIGUOUS"]:
+            # 旋转/镜像可能产生负 stride 视图，编码器会被迫慢速复制；这里统一整理为连续内存。
+            # Rotation/flip may create negative-stride views; make contiguous before encoding/analysis.
+            image = np.ascontiguousarray(image)
 
+        return image
+
+    def _finish_yuv420(
+        self, image: np.ndarray, width: int, out_width: int, out_height: int
+    ) -> np.ndarray:
+        """YUV420 帧后处理：逐平面重采样、旋转、镜像 / Resample, rotate and flip a YUV420 frame per plane.
+
+        不做任何颜色转换。彩色模式返回附带 I420 缓冲的 Y 平面视图；黑白模式只处理并返回 Y 平面。
+        No colour conversion at all. Colour mode returns a Y-plane view carrying the I420 buffer;
+        mono mode only transforms and returns the Y plane.
+        """
+        height = int(image.shape[0]) * 2 // 3
+        width = min(int(width), int(image.shape[1]))
+        buf = pack_i420(image, width, height)
+        resize = (out_width, out_height) != (width, height)
+        geometry = self.rotation != 0 or self.flip_horizontal or self.flip_vertical
+
+        def transform(plane: np.ndarray, chroma: bool) -> np.ndarray:
+            if resize:
+                scale = 2 if chroma else 1
+                plane = self._resize_preserve_fov(
+                    plane,
+                    out_width // scale,
+                    out_height // scale,
+                    fill=128 if chroma else 0,
+                )
+            if self.rotation != 0:
+                plane = self.apply_rotation(plane, self.rotation)
+            return self._apply_flip(plane)
+
+        if self.color_mode == "mono":
+            luma = i420_planes(buf, width, height)[0]
+            if resize or geometry:
+                luma = transform(luma, False)
+            return np.ascontiguousarray(luma)
+        if resize or geometry:
+            buf, width, height = map_i420(buf, width, height, transform)
+        return luma_frame(buf, height)
+
+    def capture_lores_image(self) -> Optional[np.ndarray]:
+        """只取 lores 流，几何与主流输出一致 / Capture only the lores stream, matching main-frame geometry.
+
+        不复制主流缓冲，供预览编码与快速星点统计使用；输出是主流输出的等比缩小（同样的重采样、
+        旋转与镜像）。lores 不可用时返回 None。
+        Skips the main buffer entirely; for preview encoding and quick-look extraction. The result
+        is a uniformly scaled-down main frame (same resampling, rotation and flips). None when
+        lores is unavailable.
+        """
+        if not (self.is_initialized and self.is_capturing and self._lores_available):
+            return None
+        try:
+            request = self.camera.capture_request()
+            try:
+                lores = self._collect_lores_stats(request)
+                self._last_metadata = dict(request.get_metadata() or {})
+            finally:
+                request.release()
+            return self._finish_lores(lores) if lores is not None else None
         except Exception as e:
-            logger.error(f"捕获图像失败: {e}")
+            logger.error(f"捕获 lores 图像失败: {e}")
+            return None
+
+    def _finish_lores(self, lores: np.ndarray) -> np.ndarray:
+        """lores 后处理，输出为主流输出的等比缩小 / Post-process lores into a scaled-down main frame."""
+        lores_w = self._lores_size[0]
+        k = lores_w / float(self.capture_width)
+        out_w = self._align_even(round(self.output_width * k))
+        out_h = self._align_even(round(self.output_height * k))
+        if lores.ndim == 2:
+            return self._finish_yuv420(lores, lores_w, out_w, out_h)
+        if (int(lores.shape[1]), int(lores.shape[0])) != (out_w, out_h):
+            lores = self._resize_preserve_fov(lores, out_w, out_h)
+        if self.rotation != 0:
+            lores = self.apply_rotation(lores, self.rotation)
+        return np.ascontiguousarray(self._apply_flip(lores))
+
+    def get_lores_frame(self) -> Optional[np.ndarray]:
+        """获取一帧 lores 图像（预览/快速分析）/ Get one lores frame (preview / quick look)."""
+        if not self.is_initialized:
+            logger.error("相机未初始化")
             return None
+        return self.capture_lores_image()
 
     def apply_rotation(self, image: np.ndarray, rotation: int) -> np.ndarray:
         """应用图像旋转 / Apply image rotation"""
@@ -1090,7 +1281,7 @@ class IMX327MIPICamera(CameraInterface):
                 still_cfg = self.camera.create_still_configuration(
                     main={
                         "size": (self.capture_width, self.capture_height),
-                        "format": "RGB888",
+                        "format": self._main_stream_format(),
                     }
                 )
                 self.camera.configure(still_cfg)
@@ -1160,6 +1351,8 @@ class IMX327MIPICamera(CameraInterface):
                 "output_width": self.output_width,
                 "output_height": self.output_height,
                 "color_mode": self.color_mode,
+                "capture_format": self.capture_format,
+                "pixel_format": self.output_pixel_format,
                 "white_balance_mode": self.white_balance_mode,
                 "white_balance_gain_r": self.white_balance_gain_r,
                 "white_balance_gain_b": self.white_balance_gain_b,
@@ -1175,8 +1368,8 @@ class IMX327MIPICamera(CameraInterface):
                 "ae_exposure_value": self.ae_exposure_value,
                 "lores_enabled": self.lores_enabled,
                 "lores_available": self._lores_available,
-                "lores_width": self.lores_width,
-                "lores_height": self.lores_height,
+                "lores_width": self._lores_size[0] or self.lores_width,
+                "lores_height": self._lores_size[1] or self.lores_height,
                 "lores_format": self.lores_format,
                 "lores_stats": self._last_lores_stats,
                 "control_ranges": self.get_manual_control_ranges(),
@@ -1453,7 +1646,7 @@ class IMX327MIPICamera(CameraInterface):
             # 更新颜色模式 / Update color mode
             self.color_mode = color_mode
 
-            # 颜色模式只影响输出转换，不改变主流 RGB888 配置 / Color mode only changes output conversion.
+            # 颜色模式只影响输出转换，不改变主流格式配置 / Color mode only changes output conversion.
             camera_config = self._create_video_configuration()
 
             self.camera.configure(camera_config)
@@ -4,7 +4,7 @@
 
 import mimetypes
 
-from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile
+from fastapi import APIRouter, File, Form, HTTPException, Query, Request, UploadFile
 from fastapi.responses import FileResponse, PlainTextResponse
 
 from ogscope.domain.analysis.services import analysis_domain_service
@@ -264,10 +264,12 @@ async def analysis_lab_settings():
 
 
 @router.post("/analysis/solve/frame")
-async def solve_analysis_frame(body: AnalysisSolveVideoFrameRequest):
+async def solve_analysis_frame(body: AnalysisSolveVideoFrameRequest, request: Request):
     """相机或视频单帧解算 / Solve one frame from camera or pool video."""
     try:
-        return await analysis_service.solve_video_frame(body)
+        return await analysis_service.solve_video_frame(
+            body, is_disconnected=request.is_disconnected
+        )
     except RuntimeError as exc:
         raise HTTPException(status_code=503, detail=str(exc)) from exc
     except FileNotFoundError as exc:
@@ -278,6 +280,7 @@ async def solve_analysis_frame(body: AnalysisSolveVideoFrameRequest):
 
 @router.post("/analysis/solve/frame_upload")
 async def solve_uploaded_frame(
+    request: Request,
     file: UploadFile = File(...),
     payload: str = Form(
         ...,
@@ -297,6 +300,7 @@ async def solve_uploaded_frame(
             overlay_topn_count=extras.get("overlay_topn_count"),
             enable_polar_guide=extras.get("enable_polar_guide"),
             solve_interval_ms=extras.get("solve_interval_ms"),
+            is_disconnected=request.is_disconnected,
         )
     except HTTPException:
         raise
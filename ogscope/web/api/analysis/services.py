@@ -10,6 +10,7 @@ import math
 import shutil
 import time
 import uuid
+from collections.abc import Awaitable, Callable
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -20,18 +21,26 @@ import cv2
 import numpy as np
 
 from ogscope.algorithms.plate_solve import (
+    AsyncPlateSolver,
+    BackgroundSnapshot,
     CentroidExtractionParams,
     PlateSolver,
+    SolveCancelToken,
+    TemporalBackgroundModel,
     centroid_extraction_preview,
     merge_centroid_params,
 )
-from ogscope.algorithms.plate_solve.sensor_context import attach_sensor_prediction
+from ogscope.algorithms.plate_solve.sensor_context import (
+    attach_sensor_prediction,
+    sensor_hint,
+)
 from ogscope.algorithms.star_extract import StarExtractor
 from ogscope.config import (
     effective_solver_max_image_side,
     effective_solver_max_stars,
     get_settings,
 )
+from ogscope.domain.camera.calibration import hot_pixels_for_frame, sensor_key
 from ogscope.domain.camera.sidecar import merge_capture_sidecar_into_info
 from ogscope.domain.shared.filesystem import (
     DEV_CAPTURES_DIR,
@@ -145,8 +154,10 @@ class AnalysisService:
         self.jobs_root.mkdir(parents=True, exist_ok=True)
         self.results_root.mkdir(parents=True, exist_ok=True)
         # 解算专用线程池（避免与相机预览等争用默认线程池）；默认单 worker 降低 Zero 2W 等低内存设备上并发解算的内存峰值 / Dedicated executor for solving; default 1 worker to reduce peak RAM on low-memory boards
+        # 启用解算进程池时线程只等待 worker 结果（不持 GIL），线程数与进程数一致 / With the process pool, threads only wait on workers (GIL released), one per process
         self._solver_executor = ThreadPoolExecutor(
-            max_workers=1, thread_name_prefix="solver"
+            max_workers=max(1, int(settings.solver_process_workers)),
+            thread_name_prefix="solver",
         )
         self._solver_max_stars = effective_solver_max_stars(settings)
         self.extractor = StarExtractor(max_stars=self._solver_max_stars)
@@ -155,8 +166,11 @@ class AnalysisService:
             fov_max_error_deg=settings.solver_fov_max_error_deg,
             solve_timeout_ms=settings.solver_timeout_ms,
         )
+        # 进程池门面；solver_process_workers=0 时在本进程解算 / Process-pool façade, in-process when disabled
+        self.async_solver = AsyncPlateSolver(self.solver, self._solver_executor)
         self.default_hint_ra = settings.solver_hint_ra_deg
         self.default_hint_dec = settings.solver_hint_dec_deg
+        self._hint_radius_deg = float(settings.solver_hint_radius_deg)
         self._jobs: dict[str, AnalysisJob] = {}
         self._lab = AnalysisLabStore(settings)
         self._overlay_topn_default = 3
@@ -167,6 +181,8 @@ class AnalysisService:
             "camera": RealtimeSolveGateState(),
             "file": RealtimeSolveGateState(),
         }
+        # 实时帧的大尺度背景按来源保存，避免逐帧重新估计 / Per-source temporal backgrounds for realtime frames
+        self._background_models: dict[str, TemporalBackgroundModel] = {}
 
     @staticmethod
     def _clamp_centroid_rejection_level(v: int | None) -> int:
@@ -221,6 +237,34 @@ class AnalysisService:
         state = self._realtime_gate_states.get(source)
         return bool(state and state.in_flight)
 
+    def _background_snapshot(
+        self, source: str, frame: Any, key: Any | None = None
+    ) -> BackgroundSnapshot:
+        """记入一帧实时画面并取背景快照 / Feed a realtime frame to its background model.
+
+        相机来源以曝光、增益与帧方向为键，参数变化时立即重新估计背景；其他来源用 ``key``（如文件名）。
+        The camera source is keyed by exposure, gain and orientation, so changing them re-estimates at once;
+        other sources use ``key`` (e.g. the file name).
+        """
+        model = self._background_models.get(source)
+        if model is None:
+            settings = get_settings()
+            model = self._background_models.setdefault(
+                source,
+                TemporalBackgroundModel(
+                    refresh_interval_frames=settings.solver_background_refresh_frames,
+                    smoothing=settings.solver_background_smoothing,
+                    downsample_max_side=settings.solver_large_scale_bg_downsample,
+                ),
+            )
+        if source == "camera":
+            from ogscope.web.camera_shared import get_camera_manager
+
+            camera = get_camera_manager().get_camera_instance()
+            if camera is not None:
+                key = sensor_key(camera)
+        return model.update(frame, key)
+
     def _resolve_realtime_interval_ms(
         self, requested_ms: int | None
     ) -> tuple[int, int]:
@@ -962,8 +1006,13 @@ class AnalysisService:
         overlay_topn_count: int | None = None,
         enable_polar_guide: bool | None = None,
         solve_interval_ms: int | None = None,
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
     ) -> dict[str, Any]:
-        """解析上传的单帧图像并解算 / Solve a single uploaded frame (multipart)."""
+        """解析上传的单帧图像并解算 / Solve a single uploaded frame (multipart).
+
+        外层超时或 ``is_disconnected`` 报告客户端断开时取消进行中的解算。
+        Cancels the in-flight solve on the outer timeout or when ``is_disconnected`` reports it.
+        """
         settings = get_settings()
         requested_interval_ms, effective_interval_ms = (
             self._resolve_realtime_interval_ms(solve_interval_ms)
@@ -990,9 +1039,11 @@ class AnalysisService:
                     solve_params.solve_timeout_ms,
                 )
             )
-            loop = asyncio.get_running_loop()
+            cancel_token = SolveCancelToken()
 
             def _run() -> dict[str, Any]:
+                # 上传帧彼此无关，逐帧估计背景而不共用时间模型
+                # Uploads are unrelated frames: estimate the background per frame, no temporal model
                 return self._solve_bgr_to_row(
                     frame,
                     solve_params.hint_ra_deg,
@@ -1008,14 +1059,14 @@ class AnalysisService:
                         solve_params.centroid_rejection_level
                     ),
                     solve_context=solve_params.solve_context,
+                    cancel_token=cancel_token,
                 )
 
             hard_timeout_sec = max(
                 0.2, float(settings.star_analysis_request_timeout_ms) / 1000.0
             )
-            row = await asyncio.wait_for(
-                loop.run_in_executor(self._solver_executor, _run),
-                timeout=hard_timeout_sec,
+            row = await self._run_cancellable_solve(
+                _run, cancel_token, hard_timeout_sec, is_disconnected
             )
             self._attach_overlay_ext(
                 row,
@@ -1140,6 +1191,48 @@ class AnalysisService:
             json.dumps(job.to_dict(), ensure_ascii=False, indent=2), encoding="utf-8"
         )
 
+    async def _run_cancellable_solve(
+        self,
+        run: Callable[[], dict[str, Any]],
+        cancel_token: SolveCancelToken,
+        timeout_sec: float,
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
+    ) -> dict[str, Any]:
+        """在解算线程池运行；超时、断开或被取消时取消令牌以立即释放 worker。
+
+        Runs ``run`` on the solver executor. A timeout, client disconnect or task cancellation
+        cancels ``cancel_token`` so the worker is freed instead of finishing a stale search.
+        """
+        loop = asyncio.get_running_loop()
+        watcher = (
+            asyncio.create_task(
+                self._cancel_on_disconnect(is_disconnected, cancel_token)
+            )
+            if is_disconnected is not None
+            else None
+        )
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(self._solver_executor, run), timeout=timeout_sec
+            )
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            cancel_token.cancel()
+            raise
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+
+    @staticmethod
+    async def _cancel_on_disconnect(
+        is_disconnected: Callable[[], Awaitable[bool]], cancel_token: SolveCancelToken
+    ) -> None:
+        """轮询客户端连接，断开即取消解算 / Poll the client; cancel the solve on disconnect."""
+        while not cancel_token.is_set():
+            if await is_disconnected():
+                cancel_token.cancel()
+                return
+            await asyncio.sleep(0.05)
+
     def _solve_bgr_to_row(
         self,
         frame_bgr: Any,
@@ -1154,24 +1247,48 @@ class AnalysisService:
         large_scale_bg_subtract: bool = False,
         centroid_rejection_level: int | None = None,
         solve_context: Any | None = None,
+        cancel_token: SolveCancelToken | None = None,
+        background_source: str | None = None,
+        background_key: Any | None = None,
     ) -> dict[str, Any]:
-        """BGR 帧送 Tetra3 解算 / Plate-solve one BGR frame."""
+        """BGR 帧送 Tetra3 解算 / Plate-solve one BGR frame.
+
+        ``solve_context`` 能给出传感器预测指向时，以其为可信 hint 剪枝天区搜索。
+        A sensor-predicted pointing from ``solve_context`` prunes the sky search as a confident hint.
+        ``background_source`` 标识连续的实时帧来源，大尺度背景减除改用该来源的时间背景模型；
+        ``background_key`` 变化时重新开始。
+        ``background_source`` names a realtime frame stream whose temporal background model then
+        replaces per-frame large-scale background estimation; a new ``background_key`` restarts it.
+        """
         cr_level = self._clamp_centroid_rejection_level(
             centroid_rejection_level
             if centroid_rejection_level is not None
             else self._centroid_rejection_default
         )
-        solved = self.solver.solve_from_bgr_frame(
+        hint_ra = hint_ra_deg if hint_ra_deg is not None else self.default_hint_ra
+        hint_dec = hint_dec_deg if hint_dec_deg is not None else self.default_hint_dec
+        hint_radius: float | None = None
+        predicted = sensor_hint(solve_context)
+        if predicted is not None:
+            hint_ra, hint_dec = predicted
+            hint_radius = self._hint_radius_deg
+        background = (
+            self._background_snapshot(background_source, frame_bgr, background_key)
+            if large_scale_bg_subtract and background_source is not None
+            else None
+        )
+        # 相机帧修补已标定的热像素 / Camera frames get their calibrated hot pixels repaired
+        hot_pixels = (
+            hot_pixels_for_frame(frame_bgr) if background_source == "camera" else None
+        )
+        solved = self.async_solver.solve_from_bgr_frame_sync(
             frame_bgr=frame_bgr,
             max_stars=self._clamp_max_stars(
                 int(max_stars if max_stars is not None else self._solver_max_stars)
             ),
-            hint_ra_deg=(
-                hint_ra_deg if hint_ra_deg is not None else self.default_hint_ra
-            ),
-            hint_dec_deg=(
-                hint_dec_deg if hint_dec_deg is not None else self.default_hint_dec
-            ),
+            hint_ra_deg=hint_ra,
+            hint_dec_deg=hint_dec,
+            hint_radius_deg=hint_radius,
             solve_source="full",
             fov_estimate=fov_estimate,
             fov_max_error=fov_max_error,
@@ -1180,6 +1297,9 @@ class AnalysisService:
             max_image_side=max_image_side,
             large_scale_bg_subtract=large_scale_bg_subtract,
             centroid_rejection_level=cr_level,
+            cancel_token=cancel_token,
+            background=background,
+            hot_pixels=hot_pixels,
         )
         row = {"frame_index": 0, **solved.to_dict()}
         attach_sensor_prediction(row, solve_context)
@@ -1245,6 +1365,8 @@ class AnalysisService:
             raise ValueError("无法打开视频 / Unable to open video")
         hint_ra = hint_ra_deg if hint_ra_deg is not None else self.default_hint_ra
         hint_dec = hint_dec_deg if hint_dec_deg is not None else self.default_hint_dec
+        # 上一帧解出后其指向即为可信 hint / After a match, its pointing is a confident hint
+        hint_radius: float | None = None
         results: list[dict[str, Any]] = []
         idx = -1
         processed = 0
@@ -1259,19 +1381,22 @@ class AnalysisService:
             if idx % step != 0:
                 continue
             stars = self.extractor.extract(frame)
-            solved = self.solver.solve(
+            solved = self.async_solver.solve_sync(
                 stars=stars,
                 frame_shape=frame.shape,
                 hint_ra_deg=hint_ra,
                 hint_dec_deg=hint_dec,
+                hint_radius_deg=hint_radius,
                 solve_source="full",
                 fov_estimate=fov_estimate,
                 fov_max_error=fov_max_error,
                 solve_timeout_ms=solve_timeout_ms,
                 centroid_rejection_level=cr_level,
             )
-            hint_ra = solved.ra_deg
-            hint_dec = solved.dec_deg
+            if solved.status_code == 1:
+                hint_ra = solved.ra_deg
+                hint_dec = solved.dec_deg
+                hint_radius = self._hint_radius_deg
             results.append({"frame_index": idx, **solved.to_dict()})
             processed += 1
             job.progress = min(0.99, processed / full_limit)
@@ -1281,9 +1406,14 @@ class AnalysisService:
         return results
 
     async def solve_video_frame(
-        self, body: AnalysisSolveVideoFrameRequest
+        self,
+        body: AnalysisSolveVideoFrameRequest,
+        is_disconnected: Callable[[], Awaitable[bool]] | None = None,
     ) -> dict[str, Any]:
-        """相机或视频文件单帧解算 / Single-frame solve from camera or video file."""
+        """相机或视频文件单帧解算 / Single-frame solve from camera or video file.
+
+        外层超时或客户端断开时取消进行中的解算 / Cancels the in-flight solve on timeout or disconnect.
+        """
         if body.source == "camera":
             try:
                 from ogscope.web.api.debug.services import is_recording_active
@@ -1355,11 +1485,10 @@ class AnalysisService:
                     body.solve_profile, body.centroid, body.solve_timeout_ms
                 )
             )
-            loop = asyncio.get_running_loop()
-
             cr_frame = self._clamp_centroid_rejection_level(
                 body.centroid_rejection_level
             )
+            cancel_token = SolveCancelToken()
 
             def _run() -> dict[str, Any]:
                 return self._solve_bgr_to_row(
@@ -1375,14 +1504,16 @@ class AnalysisService:
                     bool(body.large_scale_bg_subtract),
                     cr_frame,
                     solve_context=body.solve_context,
+                    cancel_token=cancel_token,
+                    background_source=body.source,
+                    background_key=body.input_name,
                 )
 
             hard_timeout_sec = max(
                 0.2, float(settings.star_analysis_request_timeout_ms) / 1000.0
             )
-            row = await asyncio.wait_for(
-                loop.run_in_executor(self._solver_executor, _run),
-                timeout=hard_timeout_sec,
+            row = await self._run_cancellable_solve(
+                _run, cancel_token, hard_timeout_sec, is_disconnected
             )
             # 二次分析与极轴引导（失败降级，不影响基础解算）
             self._attach_overlay_ext(
@@ -2,7 +2,19 @@
 Core v1 标准契约路由 / Core v1 standard contract routes.
 """
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+from typing import Literal
+
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import StreamingResponse
 
 from ogscope.core.application import core_contract_service
 from ogscope.domain.shared.filesystem import ensure_safe_basename
@@ -56,6 +68,103 @@ async def core_get_analysis_result() -> CoreAnalysisResultResponse:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
+# SSE 空闲保活间隔（秒）/ SSE keep-alive interval while idle (seconds)
+_SSE_KEEPALIVE_SEC = 15.0
+
+
+def _stream_full() -> HTTPException:
+    return HTTPException(status_code=503, detail="too many result stream clients")
+
+
+@router.get("/core/v1/analysis/stream")
+async def core_stream_analysis_results(
+    request: Request,
+    tracking: bool = Query(
+        True, description="是否推送跟踪帧结果 / Include tracker updates"
+    ),
+    detail: Literal["summary", "full"] = Query(
+        "summary",
+        description="summary 去掉大字段，full 为完整结果 / summary drops heavy fields",
+    ),
+) -> StreamingResponse:
+    """实时结果推送（SSE）/ Push realtime results over Server-Sent Events.
+
+    每条 ``data`` 是相对本连接上一条消息的差分；客户端读得慢时只收到最新结果。
+    Each ``data`` line is a delta against this connection's previous message; slow clients only
+    get the newest result.
+    """
+    sub = core_contract_service.subscribe_analysis_results(
+        include_tracking=tracking, detail=detail
+    )
+    if sub is None:
+        raise _stream_full()
+
+    async def event_generator():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    delta = await asyncio.wait_for(
+                        sub.next(), timeout=_SSE_KEEPALIVE_SEC
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                payload = json.dumps(delta, separators=(",", ":"), default=str)
+                yield f"id: {delta.get('seq', '')}\ndata: {payload}\n\n"
+        finally:
+            sub.close()
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/core/v1/analysis/ws")
+async def core_ws_analysis_results(
+    websocket: WebSocket,
+    tracking: bool = True,
+    detail: Literal["summary", "full"] = "summary",
+) -> None:
+    """实时结果推送（WebSocket），消息格式同 SSE / Push realtime results over WebSocket (same deltas as SSE)."""
+    sub = core_contract_service.subscribe_analysis_results(
+        include_tracking=tracking, detail=detail
+    )
+    if sub is None:
+        await websocket.close(code=1013, reason="too many result stream clients")
+        return
+    await websocket.accept()
+    # 客户端不发消息；单独读取以便空闲时也能及时发现断开
+    # Clients send nothing; reading separately notices a disconnect even while idle
+    closed = asyncio.create_task(_wait_ws_disconnect(websocket))
+    try:
+        while True:
+            pending = asyncio.create_task(sub.next())
+            done, _ = await asyncio.wait(
+                {pending, closed}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if closed in done:
+                pending.cancel()
+                break
+            delta = pending.result()
+            await websocket.send_text(
+                json.dumps(delta, separators=(",", ":"), default=str)
+            )
+    except WebSocketDisconnect:
+        pass
+    finally:
+        closed.cancel()
+        sub.close()
+
+
+async def _wait_ws_disconnect(websocket: WebSocket) -> None:
+    while True:
+        message = await websocket.receive()
+        if message.get("type") == "websocket.disconnect":
+            return
+
+
 @router.post(
     "/core/v1/analysis/stop",
     response_model=CoreAnalysisControlResponse,
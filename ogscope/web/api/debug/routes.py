@@ -11,6 +11,11 @@ from fastapi.responses import FileResponse, StreamingResponse
 from ogscope.config import get_settings
 from ogscope.core.application import core_contract_service
 from ogscope.core.realtime import realtime_solve_service
+from ogscope.domain.camera.calibration import (
+    calibrate_hot_pixels,
+    get_hot_pixel_store,
+    hot_map_summary,
+)
 from ogscope.domain.camera.services import (
     DebugCameraService,
     DebugFileService,
@@ -376,6 +381,40 @@ async def delete_camera_preset(preset_name: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ==================== 暗场标定 ==================== / ==================== Dark-frame Calibration ====================
+
+
+@router.post("/debug/camera/calibration/hot-pixels")
+async def calibrate_camera_hot_pixels(
+    frames: int | None = Query(default=None, ge=3, le=64),
+):
+    """盖上镜头盖后采集暗场并保存热像素索引 / Capture dark frames (lens covered) and store hot pixels"""
+    try:
+        return await calibrate_hot_pixels(frames)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/debug/camera/calibration/hot-pixels")
+async def list_camera_hot_pixels():
+    """列出已保存的热像素索引 / List stored hot-pixel indices"""
+    try:
+        return {"items": [hot_map_summary(m) for m in get_hot_pixel_store().maps()]}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/debug/camera/calibration/hot-pixels")
+async def clear_camera_hot_pixels():
+    """删除全部热像素索引 / Delete all hot-pixel indices"""
+    try:
+        return {"success": True, "deleted": get_hot_pixel_store().clear()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # ==================== 文件管理 ==================== / ==================== File Management ====================
 
 
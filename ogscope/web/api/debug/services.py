@@ -13,6 +13,7 @@ from typing import Any, Optional
 from fastapi import HTTPException
 
 from ogscope.domain.camera.sidecar import merge_capture_sidecar_into_info
+from ogscope.domain.camera.yuv import i420_buffer
 from ogscope.domain.shared.filesystem import (
     DEV_CAPTURES_DIR,
     IMAGE_EXTENSIONS,
@@ -378,23 +379,15 @@ class DebugCameraService:
         if snap is None:
             return 503, None, 0
 
-        fmt = image_format.lower()
-        q = int(max(10, min(100, int(quality))))
-        default_q = int(manager.preview_jpeg_quality)
-
         if since_frame_id is not None and since_frame_id == snap.frame_id:
             return 304, None, snap.frame_id
 
-        if fmt == "jpeg" and q == default_q and snap.jpeg_frame is not None:
-            return 200, snap.jpeg_frame, snap.frame_id
-
-        raw, _fid, _ts = await manager.get_raw_frame()
-        encoded = await asyncio.to_thread(manager.encode_frame, raw, image_format, q)
-        if encoded is None:
+        # 非默认编码按 (frame_id, 格式, 质量) 共享缓存，多客户端每帧只编码一次
+        # Non-default renditions are cached per (frame_id, format, quality): one encode per frame
+        data, frame_id = await manager.get_rendition(image_format, int(quality))
+        if data is None:
             return 500, None, snap.frame_id
-        snap2 = await manager.get_cached_frame_snapshot()
-        sid = int(snap2.frame_id) if snap2 is not None else int(snap.frame_id)
-        return 200, encoded, sid
+        return 200, data, int(frame_id or snap.frame_id)
 
     @staticmethod
     async def capture_image():
@@ -441,9 +434,13 @@ class DebugCameraService:
 
             # 相机输出为 RGB888，OpenCV 写文件前需要转 BGR，避免红蓝通道互换。
             # Camera output is RGB888; convert to BGR before OpenCV writes files to avoid R/B swap.
+            # YUV420 采集时由 I420 缓冲还原彩色 / YUV420 capture: restore colour from the I420 buffer
             image_for_write = image
             try:
-                if getattr(image, "ndim", 0) == 3 and int(image.shape[2]) >= 3:
+                i420 = i420_buffer(image)
+                if i420 is not None:
+                    image_for_write = cv2.cvtColor(i420, cv2.COLOR_YUV2BGR_I420)
+                elif getattr(image, "ndim", 0) == 3 and int(image.shape[2]) >= 3:
                     image_for_write = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
             except Exception:
                 image_for_write = image
@@ -612,7 +609,14 @@ class DebugCameraService:
                                 image = None
                             if image is not None:
                                 try:
-                                    bgr = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+                                    bgr = cv2.cvtColor(
+                                        image,
+                                        (
+                                            cv2.COLOR_GRAY2BGR
+                                            if image.ndim == 2
+                                            else cv2.COLOR_RGB2BGR
+                                        ),
+                                    )
                                 except Exception:
                                     bgr = image
                                 video_writer.write(bgr)
@@ -182,6 +182,7 @@ class CentroidParamsPayload(BaseModel):
     bg_sub_mode: Optional[str] = None
     sigma_mode: Optional[str] = None
     max_axis_ratio: Optional[float] = None
+    backend: Optional[Literal["scipy", "opencv"]] = None
 
     @field_validator("filtsize")
     @classmethod
@@ -576,11 +577,26 @@ class CoreStreamStatusResponse(BaseModel):
     preview_consumers: int = 0
     analysis_consumers: int = 0
     recording_consumers: int = 0
+    capture_average_ms: float = 0.0
     jpeg_average_encode_ms: float = 0.0
+    pipeline_latency_ms: float = 0.0
+    pipeline_dropped_frames: int = 0
     jpeg_cached_bytes: int = 0
     preview_encoder: str = ""
     jpeg_encode_failures: int = 0
     jpeg_source_format: str = ""
+    preview_stream: str = ""
+    preview_width: int = 0
+    preview_height: int = 0
+    rendition_cache_entries: int = 0
+    rendition_cache_bytes: int = 0
+    rendition_cache_hits: int = 0
+    rendition_encodes: int = 0
+    raw_ring_slots: int = 0
+    raw_ring_pinned: int = 0
+    raw_ring_bytes: int = 0
+    raw_ring_writes: int = 0
+    raw_ring_overruns: int = 0
     camera_driver: str = ""
     camera_backend: str = ""
     lores_enabled: bool = False
@@ -72,9 +72,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
 
     async def _warm_solver() -> None:
         try:
-            from ogscope.algorithms.plate_solve.solver import warmup_tetra3
+            from ogscope.algorithms.plate_solve import warmup_solver
 
-            await asyncio.to_thread(warmup_tetra3)
+            await asyncio.to_thread(warmup_solver)
             logger.info("解算器已预热 / Plate solver warmed up")
         except Exception as e:
             logger.warning(
@@ -120,6 +120,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
             await asyncio.wait_for(get_camera_manager().stop(), timeout=8.0)
     except Exception as e:
         logger.warning(f"关闭相机失败 / Failed to stop camera on shutdown: {e}")
+    try:
+        from ogscope.algorithms.plate_solve import shutdown_solver_pool
+
+        shutdown_solver_pool()
+    except Exception as e:
+        logger.warning(f"关闭解算进程池失败 / Failed to stop solver pool: {e}")
     try:
         await asyncio.wait_for(stop_hardware_plane(), timeout=6.0)
     except Exception as e:
@@ -8,9 +8,10 @@ import asyncio
 import logging
 import os
 import time
-from collections import deque
+from collections import OrderedDict, deque
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from threading import Lock
 from typing import Any, Callable
 
@@ -20,6 +21,13 @@ from ogscope.domain.camera.encoding import (
     OpenCVEncoder,
     create_preview_encoder,
 )
+from ogscope.domain.camera.frame_ring import FrameLease, FrameRing
+
+
+@lru_cache(maxsize=1)
+def _shared_jpeg_encoder() -> Any:
+    """一次性编码用的共享编码器，避免每次重新测速 / Shared encoder for one-off encodes (benchmarked once)."""
+    return create_preview_encoder("auto")
 
 
 @dataclass(slots=True)
@@ -47,6 +55,9 @@ class CameraManager:
         self._frame_id = 0
         self._capture_sequence = 0
         self._latest_raw = None
+        # 抓帧循环最近一帧 lores（小图，常驻）/ Latest lores frame from the grabber (small, always kept)
+        self._latest_lores = None
+        self._latest_lores_seq = 0
         self._latest_jpeg: bytes | None = None
         self._latest_ts = 0.0
         self._latest_w = 0
@@ -60,7 +71,24 @@ class CameraManager:
         self._last_jpeg_encoder = getattr(self._preview_encoder, "name", "opencv")
         self._last_jpeg_source_format = "RGB888"
         self._jpeg_encode_failures = 0
+        # 非默认格式/质量的编码缓存：(frame_id, 格式, 质量) -> 字节，按总字节 LRU 淘汰
+        # Non-default renditions keyed by (frame_id, format, quality), LRU-evicted by total bytes
+        self._renditions: OrderedDict[tuple[int, str, int], bytes] = OrderedDict()
+        self._rendition_bytes = 0
+        self._rendition_max_bytes = int(settings.preview_rendition_cache_kb) * 1024
+        self._rendition_inflight: dict[tuple[int, str, int], asyncio.Future] = {}
+        # 无预览源帧时为编码同步读取的主流帧 (frame_id, 帧)，同帧编码全部结束即释放
+        # Main frame read for renditions; dropped once every encode for its frame_id finishes
+        self._rendition_source: tuple[int, Any] | None = None
+        self._rendition_hits = 0
+        self._rendition_encodes = 0
+        self._png_encoder = OpenCVEncoder()
         self._target_fps = max(1, int(settings.shared_preview_fps))
+        # 预览数据源：lores 时主流只在解算/拍照时读取 / Preview source; with lores, main is read on demand
+        self._preview_stream = str(
+            getattr(settings, "camera_preview_stream", "lores")
+        ).lower()
+        self._last_preview_stream = "main"
         self._probe_timeout_sec = max(0.5, float(settings.camera_probe_timeout_sec))
         self._stale_timeout_sec = max(
             0.5, float(settings.camera_frame_stale_timeout_sec)
@@ -77,12 +105,28 @@ class CameraManager:
         self._capture_timestamps: deque[float] = deque(maxlen=120)
         self._jpeg_timestamps: deque[float] = deque(maxlen=120)
         self._jpeg_encode_ms: deque[float] = deque(maxlen=60)
+        # 流水线各阶段耗时与丢帧 / Per-stage pipeline timing and drops
+        self._capture_ms: deque[float] = deque(maxlen=60)
+        self._pipeline_latency_ms: deque[float] = deque(maxlen=60)
+        self._pipeline_dropped = 0
         self._jpeg_executor = ThreadPoolExecutor(
             max_workers=1, thread_name_prefix="ogscope-jpeg"
         )
         # 是否常驻 raw 帧缓存；默认关闭以降低内存占用（分析路径可同步抓帧）
         # Whether to retain raw frame cache; default off to reduce RAM (analysis can sync-grab).
         self._keep_raw_cache = bool(settings.keep_raw_cache)
+        # 持续分析消费者请求租帧时抓帧循环同时把主流写入环形缓冲，分析端租用而非再次采集
+        # While a long-lived analysis consumer waits for a frame the grabber also fills this
+        # ring, so analysis leases frames instead of capturing again.
+        self._raw_ring = FrameRing(int(settings.analysis_frame_ring_slots))
+        # 持续分析消费者数；为 0 时单次取帧自行同步读取主流
+        # Long-lived analysis consumers; at 0 one-off reads grab main themselves.
+        self._ring_holders = 0
+        # 正在等待环形缓冲帧的调用数；为 0 时抓帧循环只读预览流
+        # Calls waiting for a ring frame; at 0 the grabber reads only the preview stream.
+        self._ring_waiters = 0
+        # 抓帧循环写入环形缓冲后置位，唤醒等待租帧的调用 / Set after a grabber ring write to wake waiters
+        self._ring_written: asyncio.Event | None = None
         self._logger = logging.getLogger(__name__)
 
     @property
@@ -116,9 +160,11 @@ class CameraManager:
             "noise_reduction_mode": getattr(
                 settings, "camera_noise_reduction_mode", "fast"
             ),
+            "capture_format": getattr(settings, "camera_capture_format", "rgb888"),
+            "simulated": bool(getattr(settings, "camera_simulated_driver", False)),
             "lores_enabled": bool(getattr(settings, "camera_lores_enabled", True)),
-            "lores_width": int(getattr(settings, "camera_lores_width", 320)),
-            "lores_height": int(getattr(settings, "camera_lores_height", 240)),
+            "lores_width": int(getattr(settings, "camera_lores_width", 640)),
+            "lores_height": int(getattr(settings, "camera_lores_height", 480)),
             "lores_format": getattr(settings, "camera_lores_format", "YUV420"),
             "rotation": 180,
             "flip_horizontal": bool(getattr(settings, "camera_flip_horizontal", False)),
@@ -152,12 +198,42 @@ class CameraManager:
             return camera
         return None
 
-    def _encode_preview_jpeg_sync(self, frame) -> EncodedImage | None:
-        source_format = str(
+    @property
+    def pixel_format(self) -> str:
+        """原始帧像素格式（RGB888 / YUV420 / GRAY8）/ Pixel format of raw frames."""
+        return str(
             getattr(self._camera, "output_pixel_format", None)
             or getattr(self._camera, "pixel_format", None)
             or "RGB888"
         )
+
+    @property
+    def lores_pixel_format(self) -> str:
+        """lores 帧像素格式 / Pixel format of lores frames."""
+        return str(getattr(self._camera, "lores_pixel_format", None) or "YUV420")
+
+    def _active_preview_stream(self) -> str:
+        """预览实际使用的流；相机无 lores 时回退主流 / Stream the preview uses; main when lores is missing."""
+        if (
+            self._preview_stream == "lores"
+            and getattr(self._camera, "lores_available", False)
+            and hasattr(self._camera, "get_lores_frame")
+        ):
+            return "lores"
+        return "main"
+
+    def main_frame_shape(self) -> tuple[int, int] | None:
+        """主流帧 (高, 宽)，用于把 lores 坐标换算回主流 / Main frame (height, width) for lores coordinates."""
+        shape_fn = getattr(self._camera, "output_frame_shape", None)
+        if not callable(shape_fn):
+            return None
+        height, width = shape_fn()
+        return int(height), int(width)
+
+    def _encode_preview_jpeg_sync(
+        self, frame, source_format: str | None = None
+    ) -> EncodedImage | None:
+        source_format = source_format or self.pixel_format
         try:
             encoded = self._preview_encoder.encode_jpeg(
                 frame, quality=int(self._jpeg_quality), source_format=source_format
@@ -178,11 +254,14 @@ class CameraManager:
             )
             return None
 
-    def _read_frame_sync(self):
+    def _read_frame_sync(self, stream: str = "main"):
         with self._read_lock:
             if self._camera is None or not getattr(self._camera, "is_capturing", False):
                 return None
-            frame = self._camera.get_video_frame()
+            if stream == "lores":
+                frame = self._camera.get_lores_frame()
+            else:
+                frame = self._camera.get_video_frame()
             if frame is not None:
                 now = time.monotonic()
                 self._capture_sequence += 1
@@ -190,6 +269,41 @@ class CameraManager:
                 self._capture_timestamps.append(now)
             return frame
 
+    def _grab_sync(self, stream: str, fill_ring: bool, keep_main: bool = False):
+        """抓帧循环读取预览帧，需要时顺带写入主流环形缓冲 / Grabber read, optionally filling the ring.
+
+        返回 (预览帧, 主流帧)；主流帧仅在预览走主流、``fill_ring`` 或 ``keep_main`` 时读取，否则为 None。
+        ``fill_ring`` 或 ``keep_main`` 且预览走 lores 时，主流与 lores 取自同一请求，不额外采集。
+        Returns (preview, main); main is only read for a main-stream preview, ``fill_ring`` or
+        ``keep_main`` and is None otherwise. With a lores preview, main and lores then come from
+        the same request.
+        """
+        if not (fill_ring or keep_main):
+            frame = self._read_frame_sync(stream)
+            return frame, frame if stream == "main" else None
+        if stream == "main" or not hasattr(self._camera, "capture_streams"):
+            main = preview = self._read_frame_sync("main")
+        else:
+            with self._read_lock:
+                if self._camera is None or not getattr(
+                    self._camera, "is_capturing", False
+                ):
+                    return None, None
+                main, lores = self._camera.capture_streams()
+                if main is not None:
+                    now = time.monotonic()
+                    self._capture_sequence += 1
+                    self._last_capture_success_mono = now
+                    self._capture_timestamps.append(now)
+            preview = lores
+        if main is not None and fill_ring:
+            self._raw_ring.write(main, self._capture_sequence, time.time())
+        return preview, main
+
+    def _ring_active(self) -> bool:
+        """本次抓帧是否需要写入环形缓冲 / Whether this grabber tick should fill the ring."""
+        return self._raw_ring.enabled and self._ring_waiters > 0
+
     def _camera_is_fresh(self) -> bool:
         """判断运行中的相机是否仍有新鲜帧 / Check whether a running camera is still fresh."""
         if self._camera is None or not getattr(self._camera, "is_capturing", False):
@@ -272,6 +386,28 @@ class CameraManager:
                     self._latest_jpeg = None
             self._schedule_idle_shutdown()
 
+    async def acquire_analysis_consumer(self) -> None:
+        """注册持续分析消费者（如实时解算）/ Register a long-lived analysis consumer.
+
+        持有期间若共享抓帧在运行，:meth:`lease_raw_frame` 请求其下一帧主流写入环形缓冲并租用。
+        While held and the shared grabber runs, :meth:`lease_raw_frame` asks it to write its next
+        main frame into the ring and leases that.
+        """
+        self._analysis_consumers += 1
+        self._ring_holders += 1
+        self._cancel_idle_shutdown()
+
+    async def release_analysis_consumer(self) -> None:
+        """释放分析消费者；最后一路离开时释放环形缓冲 / Release an analysis consumer."""
+        self._ring_holders = max(0, self._ring_holders - 1)
+        self._release_analysis()
+        self._schedule_idle_shutdown()
+
+    def _release_analysis(self) -> None:
+        self._analysis_consumers = max(0, self._analysis_consumers - 1)
+        if self._analysis_consumers == 0:
+            self._raw_ring.clear()
+
     async def acquire_recording_consumer(self) -> None:
         """注册录像消费者 / Register a recording consumer."""
         self._recording_consumers += 1
@@ -345,6 +481,7 @@ class CameraManager:
             self._last_capture_success_mono = 0.0
             with self._frame_lock:
                 self._latest_raw = None
+                self._latest_lores = None
                 self._latest_jpeg = None
                 self._latest_ts = 0.0
                 self._latest_w = 0
@@ -441,6 +578,7 @@ class CameraManager:
             await self._stop_grabber_locked()
         elif self._grabber_task is current:
             self._grabber_task = None
+            self._raw_ring.clear()
         await asyncio.to_thread(self._safe_stop_capture_sync)
         await asyncio.to_thread(self._safe_close_camera_sync)
         self._camera = None
@@ -448,6 +586,7 @@ class CameraManager:
         self._stream_started_at = 0.0
         with self._frame_lock:
             self._latest_raw = None
+            self._latest_lores = None
             self._latest_jpeg = None
             self._latest_ts = 0.0
             self._latest_w = 0
@@ -459,6 +598,13 @@ class CameraManager:
         self._grabber_task = asyncio.create_task(self._grabber_loop())
 
     async def _stop_grabber_locked(self) -> None:
+        with self._frame_lock:
+            # 抓帧停止后 lores 不再更新，避免快速分析读到陈旧帧 / Lores stops advancing with the grabber
+            self._latest_lores = None
+        self._raw_ring.clear()
+        self._renditions.clear()
+        self._rendition_bytes = 0
+        self._rendition_source = None
         if not self._grabber_task:
             return
         self._grabber_task.cancel()
@@ -473,65 +619,112 @@ class CameraManager:
         self._grabber_task = None
 
     async def _grabber_loop(self) -> None:
-        loop = asyncio.get_running_loop()
+        """两级流水线：采集与编码并行，中间为容量 1 的最新帧槽 / Two-stage capture/encode pipeline.
+
+        采集阶段按目标帧率读帧放入槽位，编码阶段在 JPEG 线程中编码并发布；编码未跟上时旧帧被新帧
+        覆盖（latest-wins）。可达帧率因此为 1/max(采集, 编码)，而不是 1/(采集 + 编码)。
+        The capture stage paces reads at the target FPS and drops them into a one-slot queue; the
+        encode stage encodes on the JPEG thread and publishes. A frame still waiting when the next
+        one arrives is replaced (latest wins), so throughput is 1/max(capture, encode).
+        """
+        slot: asyncio.Queue = asyncio.Queue(maxsize=1)
+        encoder = asyncio.create_task(self._encode_stage(slot))
         try:
-            while True:
-                interval = 1.0 / float(max(1, self._target_fps))
-                t0 = time.time()
-                try:
-                    frame = await asyncio.to_thread(self._read_frame_sync)
-                    if frame is not None:
-                        self._consecutive_grab_failures = 0
-                        encode_t0 = time.perf_counter()
-                        encoded = await loop.run_in_executor(
-                            self._jpeg_executor, self._encode_preview_jpeg_sync, frame
-                        )
-                        encode_ms = (time.perf_counter() - encode_t0) * 1000.0
-                        if encoded is None:
-                            self._jpeg_encode_failures += 1
-                            await asyncio.sleep(max(0.0, interval - (time.time() - t0)))
-                            continue
-                        jpeg = encoded.data
-                        h = int(getattr(frame, "shape", [0, 0])[0] or 0)
-                        w = int(getattr(frame, "shape", [0, 0])[1] or 0)
-                        with self._frame_lock:
-                            self._frame_id += 1
-                            # 默认不保留 raw，避免与 JPEG 双份常驻；需要时设 OGSCOPE_KEEP_RAW_CACHE=1
-                            # By default do not retain raw to avoid dual large buffers; set env to keep.
-                            self._latest_raw = frame if self._keep_raw_cache else None
-                            self._latest_jpeg = jpeg
-                            self._latest_ts = time.time()
-                            self._latest_w = w
-                            self._latest_h = h
-                            self._last_jpeg_encoder = encoded.encoder
-                            self._last_jpeg_source_format = encoded.source_format
-                        now_mono = time.monotonic()
-                        self._jpeg_timestamps.append(now_mono)
-                        self._jpeg_encode_ms.append(encode_ms)
-                    else:
-                        self._consecutive_grab_failures += 1
-                        if self._consecutive_grab_failures >= self._max_grab_failures:
-                            self._logger.warning(
-                                "连续抓帧失败，标记相机离线 / Consecutive grab failures, mark camera offline"
-                            )
-                            async with self._control_lock:
-                                await self._invalidate_camera_locked(
-                                    "相机数据流中断 / Camera stream lost"
-                                )
-                            return
-                except Exception as e:
+            await self._capture_stage(slot)
+        finally:
+            encoder.cancel()
+            await asyncio.gather(encoder, return_exceptions=True)
+
+    async def _capture_stage(self, slot: asyncio.Queue) -> None:
+        """采集阶段：读帧、计时、放入槽位 / Capture stage: read, time and hand over frames."""
+        while True:
+            interval = 1.0 / float(max(1, self._target_fps))
+            t0 = time.time()
+            try:
+                stream = self._active_preview_stream()
+                fill_ring = self._ring_active()
+                capture_t0 = time.perf_counter()
+                frame, main = await asyncio.to_thread(
+                    self._grab_sync, stream, fill_ring, self._keep_raw_cache
+                )
+                if fill_ring and self._ring_written is not None:
+                    self._ring_written.set()
+                if frame is not None:
+                    self._capture_ms.append((time.perf_counter() - capture_t0) * 1000.0)
+                    self._consecutive_grab_failures = 0
+                    if slot.full():
+                        slot.get_nowait()
+                        self._pipeline_dropped += 1
+                    slot.put_nowait(
+                        (frame, main, stream, self._capture_sequence, capture_t0)
+                    )
+                else:
                     self._consecutive_grab_failures += 1
-                    self._logger.error(f"共享抓帧循环异常 / Shared grabber error: {e}")
                     if self._consecutive_grab_failures >= self._max_grab_failures:
+                        self._logger.warning(
+                            "连续抓帧失败，标记相机离线 / Consecutive grab failures, mark camera offline"
+                        )
                         async with self._control_lock:
                             await self._invalidate_camera_locked(
                                 "相机数据流中断 / Camera stream lost"
                             )
                         return
-                spent = time.time() - t0
-                await asyncio.sleep(max(0.0, interval - spent))
-        except asyncio.CancelledError:
-            raise
+            except Exception as e:
+                self._consecutive_grab_failures += 1
+                self._logger.error(f"共享抓帧循环异常 / Shared grabber error: {e}")
+                if self._consecutive_grab_failures >= self._max_grab_failures:
+                    async with self._control_lock:
+                        await self._invalidate_camera_locked(
+                            "相机数据流中断 / Camera stream lost"
+                        )
+                    return
+            spent = time.time() - t0
+            await asyncio.sleep(max(0.0, interval - spent))
+
+    async def _encode_stage(self, slot: asyncio.Queue) -> None:
+        """编码阶段：编码并发布共享帧 / Encode stage: encode and publish the shared frame."""
+        loop = asyncio.get_running_loop()
+        while True:
+            frame, main, stream, seq, capture_t0 = await slot.get()
+            try:
+                encode_t0 = time.perf_counter()
+                encoded = await loop.run_in_executor(
+                    self._jpeg_executor,
+                    self._encode_preview_jpeg_sync,
+                    frame,
+                    self.lores_pixel_format if stream == "lores" else None,
+                )
+                encode_ms = (time.perf_counter() - encode_t0) * 1000.0
+            except Exception as e:
+                self._logger.error(f"共享编码异常 / Shared encode error: {e}")
+                encoded = None
+            if encoded is None:
+                self._jpeg_encode_failures += 1
+                continue
+            h = int(getattr(frame, "shape", [0, 0])[0] or 0)
+            w = int(getattr(frame, "shape", [0, 0])[1] or 0)
+            with self._frame_lock:
+                self._frame_id += 1
+                # 默认不保留 raw，避免与 JPEG 双份常驻；需要时设 OGSCOPE_KEEP_RAW_CACHE=1，
+                # lores 预览时主流与 lores 取自同一请求
+                # By default do not retain raw to avoid dual large buffers; set env to keep. With
+                # a lores preview the kept main frame comes from the same request as the lores.
+                self._latest_raw = main if self._keep_raw_cache else None
+                if stream == "lores":
+                    self._latest_lores = frame
+                    self._latest_lores_seq = seq
+                self._last_preview_stream = stream
+                self._latest_jpeg = encoded.data
+                self._latest_ts = time.time()
+                self._latest_w = w
+                self._latest_h = h
+                self._last_jpeg_encoder = encoded.encoder
+                self._last_jpeg_source_format = encoded.source_format
+            self._jpeg_timestamps.append(time.monotonic())
+            self._jpeg_encode_ms.append(encode_ms)
+            self._pipeline_latency_ms.append(
+                (time.perf_counter() - capture_t0) * 1000.0
+            )
 
     def get_camera_instance(self):
         """兼容接口：返回全局相机实例 / Compat accessor for global camera object."""
@@ -612,7 +805,14 @@ class CameraManager:
             await asyncio.sleep(0.02)
 
     async def get_raw_frame(self) -> tuple[Any, int, float]:
-        """读取分析帧 / Get frame for analysis."""
+        """读取分析帧（调用方持有副本）/ Get an analysis frame the caller owns.
+
+        有持续分析消费者时复制环形缓冲中调用之后采集的一帧，不与抓帧循环争抢采集；
+        不需要长期持有帧时应使用 :meth:`lease_raw_frame`。
+        With a long-lived analysis consumer, copies the first ring frame captured after the
+        call instead of competing with the grabber for a capture. Use :meth:`lease_raw_frame`
+        unless the frame must outlive the call.
+        """
         self._analysis_consumers += 1
         try:
             await self.ensure_started()
@@ -623,6 +823,9 @@ class CameraManager:
                         self._capture_sequence,
                         self._latest_ts,
                     )
+            lease = await self._lease_from_ring(self._capture_sequence)
+            if lease is not None:
+                return lease.detach(), lease.frame_id, lease.timestamp
             # 无常驻 raw 时同步抓一帧，供解算使用 / Sync-grab without retaining raw.
             frame = await asyncio.to_thread(self._read_frame_sync)
             if frame is None:
@@ -632,9 +835,247 @@ class CameraManager:
                 ts = time.time()
             return frame, fid, ts
         finally:
-            self._analysis_consumers = max(0, self._analysis_consumers - 1)
+            self._release_analysis()
             self._schedule_idle_shutdown()
 
+    async def lease_raw_frame(self, newer_than: int | None = None) -> FrameLease:
+        """租用一帧主流只读帧，用完须 ``release()`` / Lease a read-only main frame; ``release()`` it.
+
+        共享抓帧运行且有持续分析消费者时，请求其下一次采集写入环形缓冲，返回槽位的只读视图
+        （零拷贝，租约期间不被覆盖）；``newer_than`` 给出时只接受更新的帧。否则同步读取一帧，
+        租约不占用槽位。
+        While the shared grabber runs with a long-lived analysis consumer, its next capture is
+        written to the ring and a read-only view of that slot is returned (no copy; not
+        overwritten while leased). With ``newer_than`` only a later frame is accepted. Otherwise
+        one frame is read synchronously and the lease pins nothing.
+        """
+        self._analysis_consumers += 1
+        try:
+            await self.ensure_started()
+            lease = await self._lease_from_ring(newer_than)
+            if lease is not None:
+                return lease
+            frame = await asyncio.to_thread(self._read_frame_sync)
+            if frame is None:
+                raise RuntimeError("无可用视频帧 / No frame available")
+            with self._frame_lock:
+                fid = self._capture_sequence
+            return FrameLease(frame, fid, time.time())
+        finally:
+            self._release_analysis()
+            self._schedule_idle_shutdown()
+
+    async def _lease_from_ring(self, newer_than: int | None) -> FrameLease | None:
+        """向抓帧循环请求下一帧主流并租用；超时返回 None 由调用方同步读取。
+        Ask the grabber to put its next main frame in the ring and lease it; None on timeout so
+        the caller reads synchronously.
+
+        抓帧循环只在有调用等待时写入缓冲，因此只接受请求之后采集的帧，最多等待约三个抓帧周期。
+        The grabber only fills the ring while a call waits, so only frames captured after the
+        request (and after ``newer_than``) are accepted; waits up to about three grabber ticks.
+        """
+        if (
+            not self._raw_ring.enabled
+            or self._ring_holders <= 0
+            or self._grabber_task is None
+            or self._grabber_task.done()
+        ):
+            return None
+        with self._frame_lock:
+            floor = self._capture_sequence
+        if newer_than is not None:
+            floor = max(floor, newer_than)
+        deadline = time.monotonic() + max(0.1, 3.0 / float(max(1, self._target_fps)))
+        self._ring_waiters += 1
+        if self._ring_written is None:
+            self._ring_written = asyncio.Event()
+        written = self._ring_written
+        try:
+            while True:
+                written.clear()
+                lease = self._raw_ring.lease_latest(newer_than=floor)
+                if lease is not None:
+                    return lease
+                remaining = deadline - time.monotonic()
+                if (
+                    remaining <= 0
+                    or self._grabber_task is None
+                    or self._grabber_task.done()
+                ):
+                    return None
+                try:
+                    await asyncio.wait_for(written.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return None
+        finally:
+            self._ring_waiters -= 1
+            if self._ring_waiters <= 0:
+                self._ring_written = None
+
+    async def get_lores_frame(self) -> tuple[Any, int, float]:
+        """读取快速分析用 lores 帧 / Get a lores frame for quick-look analysis.
+
+        预览运行时直接复用抓帧循环的最新 lores（不额外采集）；否则同步读一帧 lores，
+        相机没有 lores 时回退主流。返回帧可能小于主流，坐标按 :meth:`main_frame_shape` 换算。
+        Reuses the grabber's latest lores while the preview runs; otherwise reads one lores frame
+        synchronously, falling back to main without lores. Scale coordinates with
+        :meth:`main_frame_shape`.
+        """
+        self._analysis_consumers += 1
+        try:
+            await self.ensure_started()
+            with self._frame_lock:
+                if self._latest_lores is not None:
+                    return self._latest_lores, self._latest_lores_seq, self._latest_ts
+            stream = (
+                "lores" if getattr(self._camera, "lores_available", False) else "main"
+            )
+            frame = await asyncio.to_thread(self._read_frame_sync, stream)
+            if frame is None and stream == "lores":
+                frame = await asyncio.to_thread(self._read_frame_sync, "main")
+            if frame is None:
+                raise RuntimeError("无可用视频帧 / No frame available")
+            with self._frame_lock:
+                fid = self._capture_sequence
+            return frame, fid, time.time()
+        finally:
+            self._release_analysis()
+            self._schedule_idle_shutdown()
+
+    def _encode_rendition_sync(
+        self, frame: Any, image_format: str, quality: int, source_format: str
+    ) -> bytes | None:
+        if image_format == "png":
+            return self._png_encoder.encode_png(frame, source_format=source_format)
+        encoded = self._preview_encoder.encode_jpeg(
+            frame, quality=quality, source_format=source_format
+        )
+        return encoded.data if encoded is not None else None
+
+    def _store_rendition(self, key: tuple[int, str, int], data: bytes) -> None:
+        """写入编码缓存并淘汰旧帧与超额条目 / Store a rendition, evicting stale frames and overflow."""
+        if len(data) > self._rendition_max_bytes:
+            return
+        for old in [k for k in self._renditions if k[0] < key[0]]:
+            self._rendition_bytes -= len(self._renditions.pop(old))
+        self._renditions[key] = data
+        self._rendition_bytes += len(data)
+        while self._rendition_bytes > self._rendition_max_bytes:
+            _old, evicted = self._renditions.popitem(last=False)
+            self._rendition_bytes -= len(evicted)
+
+    async def get_rendition(
+        self, image_format: str = "jpeg", quality: int = 75
+    ) -> tuple[bytes | None, int]:
+        """当前共享帧的指定编码，返回 (字节, frame_id) / Current shared frame in a given encoding.
+
+        默认质量 JPEG 直接返回抓帧缓存；其余组合按 (frame_id, 格式, 质量) 缓存，并发请求同一组合时
+        只有一个协程取帧编码（single-flight），其余等待同一结果。预览源帧（lores，或常驻 raw）
+        可用时直接复用，否则每帧只同步读一次主流。
+        Default-quality JPEG comes straight from the grabber cache. Other combinations are cached
+        per (frame_id, format, quality) with single-flight encoding: concurrent requests for one
+        key share one read and one encode. The preview's source frame (lores, or retained raw)
+        is reused when available; otherwise main is read once per frame.
+        """
+        fmt = "png" if str(image_format).lower() == "png" else "jpeg"
+        q = 0 if fmt == "png" else int(max(10, min(100, int(quality))))
+        with self._frame_lock:
+            frame_id = self._frame_id
+            jpeg = self._latest_jpeg
+            if self._last_preview_stream == "lores":
+                source, source_format = self._latest_lores, self.lores_pixel_format
+            else:
+                source, source_format = self._latest_raw, self.pixel_format
+        if frame_id <= 0:
+            return None, 0
+        if fmt == "jpeg" and q == int(self._jpeg_quality) and jpeg is not None:
+            return jpeg, frame_id
+
+        key = (frame_id, fmt, q)
+        cached = self._renditions.get(key)
+        if cached is not None:
+            self._renditions.move_to_end(key)
+            self._rendition_hits += 1
+            return cached, frame_id
+        if key in self._rendition_inflight:
+            self._rendition_hits += 1
+
+        async def encode() -> bytes | None:
+            frame, frame_format = source, source_format
+            try:
+                if frame is None:
+                    frame = await self._rendition_source_frame(frame_id)
+                    frame_format = self.pixel_format
+                if frame is None:
+                    return None
+                data = await asyncio.get_running_loop().run_in_executor(
+                    self._jpeg_executor,
+                    self._encode_rendition_sync,
+                    frame,
+                    fmt,
+                    q,
+                    frame_format,
+                )
+            finally:
+                if source is None:
+                    self._drop_rendition_source(key)
+            self._rendition_encodes += 1
+            if data:
+                self._store_rendition(key, data)
+            return data
+
+        return await self._single_flight(key, encode), frame_id
+
+    async def _rendition_source_frame(self, frame_id: int) -> Any:
+        """每个 frame_id 只同步读一次主流 / Read the main frame at most once per ``frame_id``."""
+        held = self._rendition_source
+        if held is not None and held[0] == frame_id:
+            return held[1]
+
+        async def read() -> Any:
+            frame = (await self.lease_raw_frame()).detach()
+            self._rendition_source = (frame_id, frame)
+            return frame
+
+        return await self._single_flight((frame_id, "source", 0), read)
+
+    def _drop_rendition_source(self, finished: tuple[int, str, int]) -> None:
+        """该帧最后一个编码结束后释放主流帧 / Drop the main frame once its last encode finishes.
+
+        主流整帧不计入 ``preview_rendition_cache_kb``，因此只在仍有同帧编码进行中时保留。
+        The full-resolution frame is not counted against ``preview_rendition_cache_kb``, so it
+        is only held while encodes for the same ``frame_id`` are still in flight.
+        """
+        frame_id = finished[0]
+        held = self._rendition_source
+        if held is None or held[0] != frame_id:
+            return
+        if any(
+            key[0] == frame_id and key != finished and key[1] != "source"
+            for key in self._rendition_inflight
+        ):
+            return
+        self._rendition_source = None
+
+    async def _single_flight(
+        self, key: tuple[int, str, int], factory: Callable[[], Any]
+    ) -> Any:
+        """同一 key 并发时只执行一次 factory，其余等待结果 / Run ``factory`` once per concurrent key."""
+        pending = self._rendition_inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._rendition_inflight[key] = future
+        result = None
+        try:
+            result = await factory()
+        except Exception as exc:
+            self._logger.debug("编码缓存生成失败 / Rendition encode failed: %s", exc)
+        finally:
+            future.set_result(result)
+            self._rendition_inflight.pop(key, None)
+        return result
+
     async def get_cached_frame_snapshot(self) -> SharedFrame | None:
         """读取当前缓存帧快照（不触发 ensure）/ Read cached snapshot without ensure."""
         with self._frame_lock:
@@ -651,16 +1092,21 @@ class CameraManager:
 
     @staticmethod
     def encode_frame(
-        raw_frame: Any, image_format: str = "jpeg", quality: int = 75
+        raw_frame: Any,
+        image_format: str = "jpeg",
+        quality: int = 75,
+        source_format: str = "RGB888",
     ) -> bytes | None:
         """将原始帧编码为图像字节 / Encode raw frame to image bytes."""
         try:
             if image_format.lower() == "png":
-                return OpenCVEncoder().encode_png(raw_frame, source_format="RGB888")
-            encoded = create_preview_encoder("auto").encode_jpeg(
+                return OpenCVEncoder().encode_png(
+                    raw_frame, source_format=source_format
+                )
+            encoded = _shared_jpeg_encoder().encode_jpeg(
                 raw_frame,
                 quality=int(max(10, min(100, quality))),
-                source_format="RGB888",
+                source_format=source_format,
             )
             return encoded.data if encoded is not None else None
         except Exception:
@@ -716,15 +1162,22 @@ class CameraManager:
             "preview_consumers": int(self._preview_consumers),
             "analysis_consumers": int(self._analysis_consumers),
             "recording_consumers": int(self._recording_consumers),
-            "jpeg_average_encode_ms": (
-                round(sum(self._jpeg_encode_ms) / len(self._jpeg_encode_ms), 2)
-                if self._jpeg_encode_ms
-                else 0.0
-            ),
+            "capture_average_ms": self._mean_ms(self._capture_ms),
+            "jpeg_average_encode_ms": self._mean_ms(self._jpeg_encode_ms),
+            "pipeline_latency_ms": self._mean_ms(self._pipeline_latency_ms),
+            "pipeline_dropped_frames": int(self._pipeline_dropped),
             "jpeg_cached_bytes": len(self._latest_jpeg or b""),
             "preview_encoder": self._last_jpeg_encoder,
             "jpeg_encode_failures": int(self._jpeg_encode_failures),
             "jpeg_source_format": self._last_jpeg_source_format,
+            "preview_stream": self._last_preview_stream,
+            "rendition_cache_entries": len(self._renditions),
+            "rendition_cache_bytes": int(self._rendition_bytes),
+            "rendition_cache_hits": int(self._rendition_hits),
+            "rendition_encodes": int(self._rendition_encodes),
+            **self._raw_ring.stats(),
+            "preview_width": int(self._latest_w),
+            "preview_height": int(self._latest_h),
             "camera_driver": str(info.get("driver", "")),
             "camera_backend": str(info.get("backend", "")),
             "lores_enabled": bool(info.get("lores_enabled", False)),
@@ -736,6 +1189,10 @@ class CameraManager:
             **memory,
         }
 
+    @staticmethod
+    def _mean_ms(samples: deque[float]) -> float:
+        return round(sum(samples) / len(samples), 2) if samples else 0.0
+
     @staticmethod
     def _memory_metrics() -> dict[str, int]:
         """读取轻量进程与CMA指标 / Read lightweight process and CMA metrics."""
@@ -124,6 +124,10 @@ def mock_plate_solve(monkeypatch):
             },
         )
 
+    # 补丁只作用于本进程，解算须留在进程内 / Patches are in-process, so keep solving in-process
+    monkeypatch.setattr(
+        "ogscope.algorithms.plate_solve.pool.get_solver_pool", lambda: None
+    )
     monkeypatch.setattr(
         "ogscope.algorithms.plate_solve.solver.PlateSolver.solve",
         _fake_solve,
@@ -160,3 +164,102 @@ def temp_analysis_dir(tmp_path: Path):
     for p in (lab.experiments_root, lab.presets_official, lab.presets_user):
         p.mkdir(parents=True, exist_ok=True)
     return analysis_root
+
+
+def write_synthetic_hip_catalog(path: Path, n_stars: int = 6000, seed: int = 5) -> Path:
+    """写入随机全天 hip_main 格式星表 / Write a random whole-sky catalogue in hip_main format."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    ra = rng.uniform(0.0, 360.0, n_stars)
+    dec = np.rad2deg(np.arcsin(rng.uniform(-1.0, 1.0, n_stars)))
+    mag = rng.uniform(1.0, 7.0, n_stars)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        for i in range(n_stars):
+            fields = ["H", str(i + 1), " ", " ", " ", f"{mag[i]:.2f}", " ", " "]
+            fields += [f"{ra[i]:.8f}", f"{dec[i]:.8f}", " ", " ", "0.0", "0.0"]
+            f.write("|".join(fields) + "\n")
+    return path
+
+
+def attitude_matrix(ra_deg: float, dec_deg: float, roll_deg: float):
+    """构造 [视轴, 图像 x, 图像 y] 行向量旋转矩阵 / Rotation with rows [boresight, x, y]."""
+    import numpy as np
+
+    ra, dec, roll = np.deg2rad([ra_deg, dec_deg, roll_deg])
+    boresight = np.array(
+        [np.cos(ra) * np.cos(dec), np.sin(ra) * np.cos(dec), np.sin(dec)]
+    )
+    east = np.array([-np.sin(ra), np.cos(ra), 0.0])
+    north = np.cross(boresight, east)
+    x_axis = np.cos(roll) * east + np.sin(roll) * north
+    return np.vstack((boresight, x_axis, np.cross(boresight, x_axis)))
+
+
+def simulated_camera(**config):
+    """已启动采集的模拟 IMX327 相机，``config`` 覆盖默认配置 / Started simulated IMX327 camera.
+
+    默认 1280x720、旋转 180°；``config`` 中的键覆盖默认值 / Defaults to 1280x720 rotated
+    180°; keys in ``config`` override them.
+    """
+    from ogscope.platform.hardware.camera import IMX327MIPICamera
+
+    cam = IMX327MIPICamera(
+        {"width": 1280, "height": 720, "rotation": 180, "simulated": True, **config}
+    )
+    assert cam.initialize() and cam.start_capture()
+    return cam
+
+
+def synthetic_centroids(
+    t3,
+    ra_deg: float,
+    dec_deg: float,
+    roll_deg: float,
+    size: tuple[int, int] = (480, 640),
+    fov_deg: float = 20.0,
+    n: int = 30,
+    noise_px: float = 0.0,
+    seed: int | None = None,
+):
+    """将 Tetra3 星表按姿态投影为最亮 n 颗 (y, x) 质心 / Project a Tetra3 star table into (y, x) centroids.
+
+    ``noise_px`` 大于 0 时加入以 ``seed`` 生成的高斯噪声 / Adds Gaussian noise from ``seed``
+    when ``noise_px`` is positive.
+    """
+    import numpy as np
+    from tetra3.tetra3 import _compute_centroids
+
+    rotation = attitude_matrix(ra_deg, dec_deg, roll_deg)
+    derot = (rotation @ np.asarray(t3.star_table[:, 2:5], dtype=np.float64).T).T
+    front = np.flatnonzero(derot[:, 0] > 0)
+    cents, kept = _compute_centroids(derot[front], size, np.deg2rad(fov_deg))
+    cents = cents[kept][:n]
+    if noise_px > 0:
+        rng = np.random.default_rng(seed)
+        cents = cents + rng.normal(0.0, noise_px, size=cents.shape)
+    return cents
+
+
+@pytest.fixture(scope="session")
+def synthetic_tetra_database(tmp_path_factory) -> Path:
+    """由合成星表生成的小型 20° Tetra3 图案库（.npz）/ Small generated 20° Tetra3 DB (.npz)."""
+    from tetra3 import Tetra3
+
+    import ogscope  # noqa: F401 — 注册 vendor 路径 / registers vendor path
+
+    root = tmp_path_factory.mktemp("tetra_db")
+    catalog = write_synthetic_hip_catalog(root / "hip_main.dat")
+    t3 = Tetra3(load_database=None)
+    t3.generate_database(
+        max_fov=20.0,
+        min_fov=20.0,
+        star_catalog=catalog,
+        epoch_proper_motion=None,
+        lattice_field_oversampling=10,
+        patterns_per_lattice_field=20,
+        verification_stars_per_fov=30,
+        save_as=root / "synthetic_database.npz",
+    )
+    return root / "synthetic_database.npz"
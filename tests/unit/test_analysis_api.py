@@ -615,3 +615,33 @@ def test_analysis_replace_transcoded_video_updates_sidecar(
     assert side_obj.get("media_file") == "out.mp4"
     extra = side_obj.get("extra") or {}
     assert extra.get("container") == "MP4"
+
+
+@pytest.mark.unit
+def test_uploaded_frames_do_not_share_a_temporal_background(
+    client, temp_analysis_dir, mock_plate_solve, monkeypatch, tmp_path: Path
+):
+    """上传帧不使用时间背景模型 / Uploaded frames never use a temporal background model."""
+    from ogscope.web.api.analysis.services import analysis_service
+
+    image_path = tmp_path / "upload_background.jpg"
+    _build_star_image(image_path)
+    gate = analysis_service._realtime_gate_states.get("file_upload")
+    if gate is not None:
+        gate.in_flight = False
+        gate.last_finished_mono = 0.0
+    seen: list[object] = []
+
+    def _capture(*_args, **kwargs):
+        seen.append(kwargs.get("background_source"))
+        return {"frame_index": 0, "status": "MATCH_FOUND", "solve_overlay": {}}
+
+    monkeypatch.setattr(type(analysis_service), "_solve_bgr_to_row", _capture)
+    with image_path.open("rb") as f:
+        resp = client.post(
+            "/api/dev/analysis/solve/frame_upload",
+            files={"file": ("frame.jpg", f, "image/jpeg")},
+            data={"payload": json.dumps({"large_scale_bg_subtract": True})},
+        )
+    assert resp.status_code == 200
+    assert seen == [None]
@@ -0,0 +1,154 @@
+"""分析用主流环形缓冲测试 / Tests for the analysis main-frame ring."""
+
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from ogscope.domain.camera.frame_ring import FrameRing
+from ogscope.domain.camera.yuv import i420_buffer
+from ogscope.platform.hardware.camera import IMX327MIPICamera
+from ogscope.web.camera_shared import CameraManager
+
+
+@pytest.mark.unit
+def test_ring_leases_pin_slots_without_copies() -> None:
+    """租约为只读视图，占用期间槽位不被覆盖 / Leases are read-only views that pin their slot."""
+    ring = FrameRing(2)
+    ring.write(np.full((4, 6), 1, dtype=np.uint8), 1, 0.0)
+    first = ring.lease_latest()
+    again = ring.lease_latest()
+    assert first.frame_id == again.frame_id == 1
+    assert np.shares_memory(first.frame, again.frame)
+    with pytest.raises(ValueError):
+        first.frame[0, 0] = 9
+
+    assert ring.write(np.full((4, 6), 2, dtype=np.uint8), 2, 0.0)
+    # 两个槽：一个被租用，一个是最新帧，新帧只能丢弃 / One slot pinned, one newest: drop
+    assert not ring.write(np.full((4, 6), 3, dtype=np.uint8), 3, 0.0)
+    assert ring.stats()["raw_ring_overruns"] == 1
+    assert int(first.frame[0, 0]) == 1
+    assert ring.lease_latest(newer_than=2) is None
+
+    first.release()
+    again.release()
+    assert ring.write(np.full((4, 6), 3, dtype=np.uint8), 3, 0.0)
+    with ring.lease_latest(newer_than=2) as lease:
+        assert int(lease.frame[0, 0]) == 3
+    assert ring.stats()["raw_ring_pinned"] == 0
+    assert ring.stats()["raw_ring_bytes"] == 2 * 24
+
+
+@pytest.mark.asyncio
+async def test_analysis_leases_grabber_frames_instead_of_capturing() -> None:
+    """预览运行时解算租用抓帧循环写入的主流帧，不再二次采集 / Solves reuse grabber captures."""
+    cam = IMX327MIPICamera(
+        {
+            "width": 1280,
+            "height": 720,
+            "rotation": 180,
+            "simulated": True,
+            "capture_format": "yuv420",
+        }
+    )
+    assert cam.initialize() and cam.start_capture()
+    main_only_reads = {"count": 0}
+    get_video_frame = cam.get_video_frame
+
+    def counting_read():
+        main_only_reads["count"] += 1
+        return get_video_frame()
+
+    cam.get_video_frame = counting_read
+    manager = CameraManager()
+    manager._idle_shutdown_sec = 60
+    manager._target_fps = 20
+    manager.attach_camera_instance(cam)
+
+    await manager.acquire_analysis_consumer()
+    await manager.acquire_preview_consumer()
+    try:
+        await manager.get_preview_frame(wait_timeout_sec=2.0)
+        probe_reads = main_only_reads["count"]
+        leases = []
+        last_id = -1
+        for _ in range(3):
+            lease = await manager.lease_raw_frame(newer_than=last_id)
+            assert lease.pinned and lease.frame_id > last_id
+            last_id = lease.frame_id
+            leases.append(lease)
+        frame = leases[-1].frame
+        assert frame.shape == (720, 1280) and not frame.flags.writeable
+        assert i420_buffer(frame) is not None
+        metrics = await manager.stream_metrics()
+        assert metrics["raw_ring_pinned"] == 3
+        assert metrics["raw_ring_bytes"] == 3 * i420_buffer(frame).nbytes
+
+        leases.pop(0).release()
+        owned, owned_id, _ts = await manager.get_raw_frame()
+        assert owned_id > last_id and owned.flags.writeable
+        assert i420_buffer(owned) is not None
+        # 主流全部来自抓帧循环的同一请求，从未单独读取 / Main never read on its own
+        assert main_only_reads["count"] == probe_reads
+        for lease in leases:
+            lease.release()
+    finally:
+        await manager.release_analysis_consumer()
+        await manager.release_preview_consumer()
+        await manager.stop()
+    assert manager._raw_ring.stats()["raw_ring_bytes"] == 0
+
+
+@pytest.mark.asyncio
+async def test_grabber_fills_ring_only_on_request() -> None:
+    """无租帧请求时预览不抓主流；单次取帧自行读取 / The ring fills only on request."""
+    cam = IMX327MIPICamera(
+        {"width": 1280, "height": 720, "simulated": True, "capture_format": "yuv420"}
+    )
+    assert cam.initialize() and cam.start_capture()
+    calls = {"streams": 0, "main": 0}
+    capture_streams, get_video_frame = cam.capture_streams, cam.get_video_frame
+
+    def counting_streams():
+        calls["streams"] += 1
+        return capture_streams()
+
+    def counting_main():
+        calls["main"] += 1
+        return get_video_frame()
+
+    cam.capture_streams = counting_streams
+    cam.get_video_frame = counting_main
+    manager = CameraManager()
+    manager._idle_shutdown_sec = 60
+    manager._target_fps = 20
+    manager.attach_camera_instance(cam)
+
+    # 长期分析消费者本身不会让每个预览周期都抓主流 / A long-lived consumer alone adds no main grabs
+    await manager.acquire_analysis_consumer()
+    await manager.acquire_preview_consumer()
+    try:
+        await manager.get_preview_frame(wait_timeout_sec=2.0)
+        await asyncio.sleep(0.3)
+        assert calls["streams"] == 0
+
+        # 租帧请求由抓帧循环的下一次采集满足 / A lease is served by the grabber's next capture
+        main_reads = calls["main"]
+        lease = await manager.lease_raw_frame()
+        assert lease.frame.shape == (720, 1280) and lease.frame_id > 0
+        lease.release()
+        assert calls["streams"] >= 1 and calls["main"] == main_reads
+        streams = calls["streams"]
+        await asyncio.sleep(0.3)
+        assert calls["streams"] == streams
+        await manager.release_analysis_consumer()
+
+        # 没有长期消费者时单次取帧同步读取主流 / Without one, one-off reads grab main directly
+        frame, _frame_id, _ts = await manager.get_raw_frame()
+        assert frame.shape == (720, 1280)
+        assert calls["main"] == main_reads + 1 and calls["streams"] == streams
+    finally:
+        await manager.release_preview_consumer()
+        await manager.stop()
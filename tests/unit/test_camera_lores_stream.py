@@ -0,0 +1,100 @@
+"""lores 双流采集测试（模拟驱动）/ Tests for the dual-stream lores path on the simulated driver."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from ogscope.algorithms.star_extract import StarExtractor
+from ogscope.web.camera_shared import CameraManager
+from tests.conftest import simulated_camera
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "geometry",
+    [{"rotation": 180}, {"rotation": 90, "flip_horizontal": True}],
+)
+def test_lores_frame_is_scaled_main_frame(geometry: dict) -> None:
+    """lores 与主流几何一致，按倍率换算后星点重合 / Lores stars land on main stars after scaling."""
+    cam = simulated_camera(**geometry)
+    main = cam.capture_image()
+    lores = cam.capture_lores_image()
+
+    assert cam.output_frame_shape() == main.shape[:2]
+    assert lores.ndim == 2 and lores.shape == (main.shape[0] // 2, main.shape[1] // 2)
+    extractor = StarExtractor(max_stars=20)
+    ref = np.array([(s.x, s.y) for s in extractor.extract(main)])
+    got = np.array(
+        [
+            (s.x, s.y)
+            for s in extractor.extract(
+                lores, coord_scale=main.shape[1] / lores.shape[1]
+            )
+        ]
+    )
+    dist = np.sqrt(((got[:, None, :] - ref[None, :, :]) ** 2).sum(axis=2)).min(axis=1)
+    assert len(got) >= 15 and np.median(dist) < 2.0
+
+
+@pytest.mark.asyncio
+async def test_preview_encodes_lores_and_main_is_read_on_demand() -> None:
+    """预览只读 lores，分析按需读主流 / Preview reads lores only; main is read on demand."""
+    cam = simulated_camera()
+    reads = {"main": 0, "lores": 0}
+    read_main, read_lores = cam.get_video_frame, cam.get_lores_frame
+
+    def count(stream, fn):
+        def wrapper():
+            reads[stream] += 1
+            return fn()
+
+        return wrapper
+
+    cam.get_video_frame = count("main", read_main)
+    cam.get_lores_frame = count("lores", read_lores)
+    manager = CameraManager()
+    manager._idle_shutdown_sec = 60
+    manager.attach_camera_instance(cam)
+
+    await manager.acquire_preview_consumer()
+    try:
+        status, frame = await manager.get_preview_frame(wait_timeout_sec=2.0)
+        assert status == 200 and frame.jpeg_frame
+        assert (frame.height, frame.width) == (360, 640)
+        main_reads = reads["main"]
+
+        lores, _fid, _ts = await manager.get_lores_frame()
+        assert lores.shape == (360, 640)
+        assert manager.main_frame_shape() == (720, 1280)
+        assert reads["main"] == main_reads
+
+        raw, _fid, _ts = await manager.get_raw_frame()
+        assert raw.shape == (720, 1280, 3)
+        assert reads["main"] == main_reads + 1
+        assert (await manager.stream_metrics())["preview_stream"] == "lores"
+    finally:
+        await manager.release_preview_consumer()
+        await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_raw_cache_keeps_main_frame_with_lores_preview() -> None:
+    """开启 raw 缓存时 lores 预览仍常驻主流帧 / The raw cache keeps main frames under a lores preview."""
+    manager = CameraManager()
+    manager._idle_shutdown_sec = 60
+    manager._keep_raw_cache = True
+    manager.attach_camera_instance(simulated_camera())
+
+    await manager.acquire_preview_consumer()
+    try:
+        status, frame = await manager.get_preview_frame(wait_timeout_sec=2.0)
+        assert status == 200 and (frame.height, frame.width) == (360, 640)
+        assert frame.raw_frame.shape == (720, 1280, 3)
+
+        raw, _fid, _ts = await manager.get_raw_frame()
+        assert raw.shape == (720, 1280, 3)
+        assert raw is not frame.raw_frame
+    finally:
+        await manager.release_preview_consumer()
+        await manager.stop()
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import time
 
 import numpy as np
 import pytest
@@ -104,3 +105,83 @@ def test_preview_fps_is_independent_runtime_setting() -> None:
     manager = CameraManager()
     assert manager.set_preview_fps(12) == 12
     assert manager._target_fps == 12
+
+
+@pytest.mark.asyncio
+async def test_renditions_encode_once_per_frame_for_many_clients() -> None:
+    """多客户端同一非默认编码每帧只读帧、编码一次 / One read and one encode per frame and rendition."""
+    manager = CameraManager()
+    manager._idle_shutdown_sec = 60
+    manager._target_fps = 1
+    camera = _FrameCamera()
+    manager.attach_camera_instance(camera)
+    encodes: list[tuple[str, int]] = []
+    encode = manager._encode_rendition_sync
+
+    def counting_encode(frame, image_format, quality, source_format):
+        encodes.append((image_format, quality))
+        return encode(frame, image_format, quality, source_format)
+
+    manager._encode_rendition_sync = counting_encode
+    await manager.acquire_preview_consumer()
+    try:
+        status, snap = await manager.get_preview_frame(wait_timeout_sec=2.0)
+        assert status == 200
+        reads = camera.read_count
+        results = await asyncio.gather(
+            *(manager.get_rendition("png") for _ in range(5)),
+            *(manager.get_rendition("jpeg", 90) for _ in range(5)),
+        )
+        assert all(data and fid == snap.frame_id for data, fid in results)
+        assert sorted(encodes) == [("jpeg", 90), ("png", 0)]
+        assert camera.read_count == reads + 1
+        assert manager._rendition_source is None
+
+        again, _fid = await manager.get_rendition("png")
+        assert again == results[0][0] and len(encodes) == 2
+        default, _fid = await manager.get_rendition(
+            "jpeg", manager.preview_jpeg_quality
+        )
+        assert default == snap.jpeg_frame
+    finally:
+        await manager.release_preview_consumer()
+        await manager.stop()
+
+
+class _SlowFrameCamera(_FrameCamera):
+    def get_video_frame(self):
+        time.sleep(0.02)
+        return super().get_video_frame()
+
+
+@pytest.mark.asyncio
+async def test_grabber_overlaps_capture_and_encode() -> None:
+    """采集与编码重叠执行，编码跟不上时丢弃旧帧 / Capture overlaps encode; stale frames are dropped."""
+    manager = CameraManager()
+    manager._idle_shutdown_sec = 60
+    manager._target_fps = 50
+    manager.attach_camera_instance(_SlowFrameCamera())
+    encode = manager._encode_preview_jpeg_sync
+
+    def slow_encode(frame, source_format=None):
+        time.sleep(0.04)
+        return encode(frame, source_format)
+
+    manager._encode_preview_jpeg_sync = slow_encode
+    await manager.acquire_preview_consumer()
+    try:
+        await manager.get_preview_frame(wait_timeout_sec=2.0)
+        start = manager._frame_id
+        await asyncio.sleep(1.0)
+        published = manager._frame_id - start
+        metrics = await manager.stream_metrics()
+    finally:
+        await manager.release_preview_consumer()
+        await manager.stop()
+
+    # 串行约 1/(20+40ms)≈16 帧，流水线受编码限制约 25 帧 / ~16 sequential vs ~25 pipelined
+    assert published >= 20
+    assert metrics["pipeline_dropped_frames"] > 0
+    assert metrics["capture_average_ms"] >= 15.0
+    assert metrics["jpeg_average_encode_ms"] >= 35.0
+    assert metrics["pipeline_latency_ms"] >= metrics["jpeg_average_encode_ms"]
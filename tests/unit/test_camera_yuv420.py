@@ -0,0 +1,122 @@
+"""YUV420 采集路径测试（模拟驱动）/ Tests for the YUV420 capture path on the simulated driver."""
+
+from __future__ import annotations
+
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from ogscope.domain.camera.encoding import OpenCVEncoder, TurboJPEGEncoder
+from ogscope.domain.camera.yuv import i420_buffer, i420_planes, luma_frame, pack_i420
+from tests.conftest import simulated_camera
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "geometry",
+    [
+        {"rotation": 180},
+        {"rotation": 90, "flip_horizontal": True},
+        {"sampling_mode": "supersample"},
+    ],
+)
+def test_yuv420_luma_matches_rgb_capture(geometry: dict) -> None:
+    """Y 平面与 RGB888 路径几何一致、内存减半 / Y plane matches RGB888 geometry at half the memory."""
+    from ogscope.algorithms.plate_solve import luminance_for_extraction
+
+    rgb = simulated_camera(
+        lores_enabled=False, capture_format="rgb888", **geometry
+    ).capture_image()
+    cam = simulated_camera(lores_enabled=False, capture_format="yuv420", **geometry)
+    luma = cam.capture_image()
+
+    assert cam.output_pixel_format == "YUV420"
+    assert luma.ndim == 2 and luma.shape == rgb.shape[:2]
+    np.testing.assert_array_equal(np.asarray(luma), rgb[..., 0])
+    buf = i420_buffer(luma)
+    assert buf is not None and buf.nbytes * 2 == rgb.nbytes
+    gray, _shape = luminance_for_extraction(luma, 4096)
+    assert gray is luma
+    assert i420_buffer(luma[10:]) is None
+
+
+@pytest.mark.unit
+def test_yuv420_frames_encode_without_rgb(monkeypatch) -> None:
+    """TurboJPEG 直接编码 I420，OpenCV 回退仍输出彩色 / TurboJPEG encodes I420 planes; OpenCV still decodes colour."""
+    cv2 = pytest.importorskip("cv2")
+    calls: list[tuple] = []
+
+    class _FakeTurboJPEG:
+        def encode_from_yuv(self, buf, height, width, **kwargs):
+            # PyTurboJPEG 1.8.3 没有 align 参数 / PyTurboJPEG 1.8.3 has no align argument
+            assert set(kwargs) <= {"quality", "jpeg_subsample", "flags"}
+            calls.append(("yuv", buf.shape, height, width))
+            return b"yuv"
+
+        def encode(self, img, **kwargs):
+            calls.append(("encode", img.shape, kwargs.get("pixel_format")))
+            return b"img"
+
+    fake = types.SimpleNamespace(
+        TurboJPEG=_FakeTurboJPEG,
+        TJPF_BGR=0,
+        TJPF_RGB=1,
+        TJPF_GRAY=6,
+        TJSAMP_420=2,
+        TJSAMP_GRAY=3,
+    )
+    monkeypatch.setitem(sys.modules, "turbojpeg", fake)
+
+    luma = simulated_camera(
+        lores_enabled=False, capture_format="yuv420", rotation=180
+    ).capture_image()
+    encoded = TurboJPEGEncoder().encode_jpeg(luma, source_format="YUV420")
+    assert encoded is not None and encoded.data == b"yuv"
+    assert calls == [("yuv", (1080, 1280), 720, 1280)]
+
+    TurboJPEGEncoder().encode_jpeg(np.asarray(luma), source_format="GRAY8")
+    assert calls[-1] == ("encode", (720, 1280, 1), 6)
+
+    # 宽度不是 8 的倍数时先转 BGR / Widths off the 8-pixel multiple go through BGR
+    narrow = luma_frame(np.zeros((30, 36), dtype=np.uint8), 20)
+    TurboJPEGEncoder().encode_jpeg(narrow, source_format="YUV420")
+    assert calls[-1] == ("encode", (20, 36, 3), 0)
+
+    jpeg = OpenCVEncoder().encode_jpeg(luma, source_format="YUV420")
+    decoded = cv2.imdecode(
+        np.frombuffer(jpeg.data, dtype=np.uint8), cv2.IMREAD_UNCHANGED
+    )
+    assert decoded.shape == (720, 1280, 3)
+
+
+@pytest.mark.unit
+def test_mono_yuv420_capture_returns_plain_luma() -> None:
+    """黑白模式只输出 Y 平面 / Mono mode returns just the Y plane."""
+    cam = simulated_camera(
+        lores_enabled=False, capture_format="yuv420", color_mode="mono", rotation=180
+    )
+    frame = cam.capture_image()
+    assert cam.output_pixel_format == "GRAY8"
+    assert type(frame) is np.ndarray and frame.shape == (720, 1280)
+    assert frame.flags.c_contiguous
+
+
+@pytest.mark.unit
+def test_pack_i420_drops_row_padding() -> None:
+    """带行填充的驱动缓冲被整理为紧凑 I420 / Padded driver buffers are packed tightly."""
+    width, height, stride = 6, 4, 8
+    tight = np.arange(width * height * 3 // 2, dtype=np.uint8).reshape(
+        height * 3 // 2, width
+    )
+    y, u, v = i420_planes(tight, width, height)
+    padded = np.zeros((height * 3 // 2, stride), dtype=np.uint8)
+    padded[:height, :width] = y
+    chroma = padded[height:].reshape(-1)
+    c_rows, c_stride = height // 2, stride // 2
+    chroma[: c_rows * c_stride].reshape(c_rows, c_stride)[:, : width // 2] = u
+    chroma[c_rows * c_stride :].reshape(c_rows, c_stride)[:, : width // 2] = v
+
+    np.testing.assert_array_equal(pack_i420(padded, width, height), tight)
+    assert pack_i420(tight, width, height) is tight
@@ -0,0 +1,121 @@
+"""提星后端与输入路径测试 / Tests for centroid extraction backends and input paths."""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pytest
+
+import ogscope  # noqa: F401 — 注册 vendor 路径 / registers vendor path
+
+
+def _star_field(height: int, width: int, stars: int, seed: int = 1) -> np.ndarray:
+    """高斯星点加噪声的 uint8 帧 / uint8 frame of Gaussian stars on noise."""
+    rng = np.random.default_rng(seed)
+    image = rng.normal(20.0, 3.0, (height, width)).astype(np.float32)
+    for cy, cx, amp, s in zip(
+        rng.uniform(0, height, stars),
+        rng.uniform(0, width, stars),
+        rng.uniform(10, 200, stars),
+        rng.uniform(0.8, 2.0, stars),
+    ):
+        y0, y1 = max(0, int(cy) - 8), min(height, int(cy) + 9)
+        x0, x1 = max(0, int(cx) - 8), min(width, int(cx) + 9)
+        yy, xx = np.mgrid[y0:y1, x0:x1]
+        image[y0:y1, x0:x1] += amp * np.exp(
+            -((yy - cy) ** 2 + (xx - cx) ** 2) / (2 * s * s)
+        )
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"max_axis_ratio": 2.0, "min_area": 3},
+        {"sigma_mode": "local_root_square", "binary_open": False, "max_sum": 5000.0},
+        {"bg_sub_mode": "global_median", "crop": (300, 400), "downsample": 2},
+    ],
+)
+def test_opencv_backend_matches_scipy(kwargs: dict) -> None:
+    """两后端质心、通量与矩一致 / Both backends give the same centroids, sums and moments."""
+    from tetra3 import get_centroids_from_image
+
+    image = _star_field(480, 640, 120)
+    ref = get_centroids_from_image(
+        image, sigma=3, max_area=400, return_moments=True, **kwargs
+    )
+    got = get_centroids_from_image(
+        image, sigma=3, max_area=400, return_moments=True, backend="opencv", **kwargs
+    )
+    assert len(ref[0]) > 10
+    np.testing.assert_allclose(got[0], ref[0], atol=1e-3)
+    for ref_part, got_part in zip(ref[1], got[1]):
+        np.testing.assert_allclose(got_part, ref_part, rtol=1e-4, atol=1e-4)
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+def test_opencv_backend_1080p_budget() -> None:
+    """1080p 帧 OpenCV 后端提星预算 / OpenCV backend budget on a 1080p frame."""
+    from tetra3 import get_centroids_from_image
+
+    image = _star_field(1080, 1920, 300)
+    get_centroids_from_image(image, sigma=3, max_area=400, backend="opencv")
+
+    times = []
+    for _ in range(3):
+        t0 = time.perf_counter()
+        get_centroids_from_image(image, sigma=3, max_area=400, backend="opencv")
+        times.append((time.perf_counter() - t0) * 1000.0)
+    assert min(times) < 100.0
+
+
+@pytest.mark.unit
+def test_luminance_for_extraction_avoids_copies() -> None:
+    """单通道帧零拷贝，BGR 帧缩放后为单通道 / Mono frames pass through; BGR frames become one channel."""
+    from ogscope.algorithms.plate_solve import luminance_for_extraction
+
+    mono = _star_field(480, 640, 40)
+    gray, shape = luminance_for_extraction(mono, 1280)
+    assert gray is mono and shape == (480, 640)
+
+    bgr = np.dstack([mono, mono, mono])
+    gray, shape = luminance_for_extraction(bgr, 320)
+    assert gray.shape == (240, 320) and gray.dtype == np.uint8 and shape == (480, 640)
+
+
+@pytest.mark.unit
+def test_luminance_for_extraction_handles_four_channel_frames() -> None:
+    """BGRA/XRGB 帧按颜色转亮度，其他通道数报错 / 4-channel frames use colour luminance; others raise."""
+    from ogscope.algorithms.plate_solve import luminance_for_extraction
+
+    rng = np.random.default_rng(4)
+    bgr = rng.integers(0, 256, (120, 160, 3), dtype=np.uint8)
+    padding = np.zeros((120, 160, 1), dtype=np.uint8)
+    expected, _ = luminance_for_extraction(bgr, 1280)
+    gray, shape = luminance_for_extraction(np.concatenate((bgr, padding), axis=2), 1280)
+    assert shape == (120, 160)
+    np.testing.assert_array_equal(gray, expected)
+
+    with pytest.raises(ValueError):
+        luminance_for_extraction(bgr[:, :, :2], 1280)
+
+
+@pytest.mark.unit
+def test_ndarray_input_matches_pil_input() -> None:
+    """uint16 数组与 PIL 输入结果一致且不被修改 / A uint16 array matches PIL input and is left intact."""
+    from PIL import Image
+    from tetra3 import get_centroids_from_image
+
+    frame = _star_field(240, 320, 30).astype(np.uint16) * 256
+    before = frame.copy()
+    got, images = get_centroids_from_image(
+        frame, sigma=3, max_area=400, return_images=True
+    )
+    ref = get_centroids_from_image(Image.fromarray(frame), sigma=3, max_area=400)
+    np.testing.assert_array_equal(got, ref)
+    np.testing.assert_array_equal(frame, before)
+    assert images["final_centroids"].mode == "RGB"
@@ -51,3 +51,103 @@ def test_level1_milder_than_level5_dense() -> None:
     r1 = int(q1["metrics"]["removed_dense"]) + int(q1["metrics"]["removed_line"])
     r5 = int(q5["metrics"]["removed_dense"]) + int(q5["metrics"]["removed_line"])
     assert r5 >= r1
+
+
+def _legacy_collinear(xy: np.ndarray, h: int, w: int, p: dict) -> np.ndarray:
+    """原逐条直线 + SVD 实现 / Original one-line-at-a-time RANSAC with SVD spans."""
+
+    def span(pts: np.ndarray) -> float:
+        if pts.shape[0] < 2:
+            return 0.0
+        c = pts.mean(axis=0)
+        proj = (pts - c) @ np.linalg.svd(pts - c, full_matrices=False)[2][0]
+        return float(proj.max() - proj.min())
+
+    def dist(pts: np.ndarray, p0: np.ndarray, p1: np.ndarray) -> np.ndarray:
+        vx, vy = p1[1] - p0[1], p1[0] - p0[0]
+        len2 = vx * vx + vy * vy
+        if len2 < 1e-12:
+            return np.hypot(pts[:, 1] - p0[1], pts[:, 0] - p0[0])
+        t = np.clip(
+            ((pts[:, 1] - p0[1]) * vx + (pts[:, 0] - p0[0]) * vy) / len2, 0.0, 1.0
+        )
+        return np.hypot(pts[:, 1] - (p0[1] + t * vx), pts[:, 0] - (p0[0] + t * vy))
+
+    if xy.shape[0] < p["line_min_inliers"]:
+        return xy
+    min_span = p["line_min_span_frac"] * float(min(h, w))
+    rng = np.random.default_rng(42)
+    remain = xy.copy()
+    for _ in range(3):
+        m = remain.shape[0]
+        if m < p["line_min_inliers"]:
+            break
+        best, best_count = None, 0
+        for _ in range(p["line_ransac_iters"]):
+            i, j = rng.integers(0, m, size=2)
+            if i == j:
+                continue
+            inl = dist(remain, remain[i], remain[j]) <= p["line_max_dist_px"]
+            cnt = int(inl.sum())
+            if (
+                cnt >= p["line_min_inliers"]
+                and span(remain[inl]) >= min_span
+                and cnt > best_count
+            ):
+                best, best_count = inl, cnt
+        if best is None:
+            break
+        remain = remain[~best]
+    return remain
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("level", [1, 3, 5])
+def test_vectorized_rejection_matches_legacy(level: int) -> None:
+    """向量化密集/共线剔除与逐格、逐线实现结果一致 / Vectorized rejection matches the loop versions."""
+    from ogscope.algorithms.plate_solve.centroid_quality import (
+        _level_params,
+        _reject_collinear_ransac,
+        _reject_dense_clusters,
+    )
+
+    h, w = 1080, 1920
+    p = _level_params(level)
+    rng = np.random.default_rng(level)
+    for _ in range(20):
+        pts = np.column_stack([rng.uniform(0, h, 120), rng.uniform(0, w, 120)])
+        t = rng.uniform(0, 1, 20)[:, np.newaxis]
+        a, b = rng.uniform(0, [h, w]), rng.uniform(0, [h, w])
+        pts = np.vstack([pts, a + t * (b - a) + rng.normal(0, 1, (20, 2))])
+        pts = np.vstack([pts, rng.uniform(0, [h, w]) + rng.normal(0, 6, (12, 2))])
+
+        kept, _, _ = _reject_dense_clusters(
+            pts,
+            h,
+            w,
+            cell_px=float(p["cell_px"]),
+            dense_min_points=int(p["dense_min_points"]),
+        )
+        cell = float(p["cell_px"])
+        iy = np.clip((pts[:, 0] / cell).astype(int), 0, int(np.ceil(h / cell)) - 1)
+        ix = np.clip((pts[:, 1] / cell).astype(int), 0, int(np.ceil(w / cell)) - 1)
+        cells = np.zeros((int(np.ceil(h / cell)), int(np.ceil(w / cell))), dtype=int)
+        np.add.at(cells, (iy, ix), 1)
+        thresh = max(p["dense_min_points"] * 2, p["dense_min_points"] + 3)
+        bad = [
+            cells[r, c] >= p["dense_min_points"]
+            or cells[max(0, r - 1) : r + 2, max(0, c - 1) : c + 2].sum() >= thresh
+            for r, c in zip(iy, ix)
+        ]
+        np.testing.assert_array_equal(kept, pts[~np.asarray(bad)])
+
+        remain, _, _ = _reject_collinear_ransac(
+            kept,
+            h,
+            w,
+            iters=int(p["line_ransac_iters"]),
+            min_inliers=int(p["line_min_inliers"]),
+            max_dist_px=float(p["line_max_dist_px"]),
+            min_span_frac=float(p["line_min_span_frac"]),
+        )
+        np.testing.assert_array_equal(remain, _legacy_collinear(kept, h, w, p))
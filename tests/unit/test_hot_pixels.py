@@ -0,0 +1,129 @@
+"""热像素标定单元测试 / Unit tests for hot-pixel calibration."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import ogscope  # noqa: F401 — 注册 vendor 路径 / registers vendor path
+from ogscope.algorithms.star_extract import HotPixelStore, build_hot_pixel_map
+
+_HOT = [(10, 20), (100, 300), (239, 0), (50, 51), (50, 52)]
+
+
+def _dark_frames(count: int, seed: int = 0) -> list[np.ndarray]:
+    """带固定热像素与一次宇宙线的暗场 / Dark frames with fixed hot pixels and one cosmic ray."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i in range(count):
+        frame = np.clip(rng.normal(12.0, 2.0, (240, 320)), 0, 255).astype(np.uint8)
+        for y, x in _HOT:
+            frame[y, x] = 200
+        if i == 0:
+            frame[5, 5] = 255
+        frames.append(np.dstack([frame, frame, frame]))
+    return frames
+
+
+@pytest.mark.unit
+def test_build_hot_pixel_map_finds_fixed_pixels_only() -> None:
+    """中值只保留固定热像素，非暗场报错 / The median keeps only fixed hot pixels; lit frames are refused."""
+    hot_map = build_hot_pixel_map(
+        _dark_frames(5), exposure_us=200000, analogue_gain=16.0
+    )
+    expected = sorted(y * 320 + x for y, x in _HOT)
+    assert hot_map.indices.tolist() == expected
+    assert (hot_map.width, hot_map.height) == (320, 240)
+
+    lit = [np.tile(np.arange(320, dtype=np.uint8), (240, 1)) for _ in range(3)]
+    with pytest.raises(ValueError):
+        build_hot_pixel_map(lit, exposure_us=1000, analogue_gain=1.0)
+
+
+@pytest.mark.unit
+def test_repair_removes_hot_pixels_before_extraction() -> None:
+    """提星亮度中热像素被替换，原帧不变 / Hot pixels are gone from the luminance; the frame is untouched."""
+    from ogscope.algorithms.plate_solve import luminance_for_extraction
+
+    frames = _dark_frames(5)
+    hot_map = build_hot_pixel_map(frames, exposure_us=200000, analogue_gain=16.0)
+    frame = frames[1]
+    before = frame.copy()
+    gray, _ = luminance_for_extraction(frame, 320, hot_pixels=hot_map)
+    assert int(gray.max()) < 60
+    np.testing.assert_array_equal(frame, before)
+
+    mono = frame[:, :, 0]
+    repaired, _ = luminance_for_extraction(mono, 320, hot_pixels=hot_map)
+    assert int(repaired.max()) < 60 and int(mono[10, 20]) == 200
+
+    flat, _ = luminance_for_extraction(
+        frame,
+        320,
+        hot_pixels=hot_map,
+        large_scale_bg_subtract=True,
+        downsample_max_side=64,
+    )
+    assert int(flat.max()) < 60
+
+    other_size = np.zeros((120, 160), dtype=np.uint8)
+    assert hot_map.repair(other_size) is other_size
+
+
+@pytest.mark.unit
+def test_store_persists_and_matches_nearest_settings(tmp_path: Path) -> None:
+    """按分辨率/方向匹配并取最近曝光增益 / Lookup matches size and orientation, then nearest exposure/gain."""
+    store = HotPixelStore(tmp_path)
+    frames = _dark_frames(3)
+    for exposure, gain in ((100000, 8.0), (400000, 16.0)):
+        store.save(
+            build_hot_pixel_map(frames, exposure_us=exposure, analogue_gain=gain)
+        )
+
+    reloaded = HotPixelStore(tmp_path)
+    assert len(reloaded.maps()) == 2
+    assert reloaded.lookup(320, 240, 120000, 8.0).exposure_us == 100000
+    assert reloaded.lookup(320, 240, 350000, 12.0).exposure_us == 400000
+    assert reloaded.lookup(320, 240, 2000000, 16.0) is None
+    assert reloaded.lookup(320, 240, 100000, 8.0, orientation="r180") is None
+    assert reloaded.lookup(640, 480, 100000, 8.0) is None
+    assert reloaded.clear() == 2 and not list(tmp_path.iterdir())
+
+
+@pytest.mark.unit
+def test_lores_frames_use_the_remapped_main_calibration(
+    monkeypatch, tmp_path: Path
+) -> None:
+    """lores 帧按主流标定映射后修补 / Lores frames are repaired with the remapped main-size map."""
+    import types
+
+    import cv2
+
+    from ogscope.domain.camera import calibration
+
+    frames = _dark_frames(3)
+    store = HotPixelStore(tmp_path)
+    store.save(build_hot_pixel_map(frames, exposure_us=200000, analogue_gain=16.0))
+    monkeypatch.setattr(calibration, "get_hot_pixel_store", lambda: store)
+    camera = types.SimpleNamespace(exposure_us=200000, analogue_gain=16.0, rotation=0)
+
+    # ISP 式缩小到一半：热像素被摊薄但仍明显 / Half-size ISP-style scaling dilutes hot pixels
+    lores = cv2.resize(frames[1][:, :, 0], (160, 120), interpolation=cv2.INTER_AREA)
+    assert calibration.hot_pixels_for_frame(lores, camera) is None
+    lores_map = calibration.hot_pixels_for_frame(lores, camera, main_shape=(240, 320))
+    assert (lores_map.width, lores_map.height) == (160, 120)
+    assert lores_map.indices.tolist() == sorted(
+        {y // 2 * 160 + x // 2 for y, x in _HOT}
+    )
+    assert (
+        calibration.hot_pixels_for_frame(lores, camera, main_shape=(240, 320))
+        is lores_map
+    )
+    assert int(lores.max()) > 50 and int(lores_map.repair(lores).max()) < 30
+
+    main_map = calibration.hot_pixels_for_frame(
+        frames[1], camera, main_shape=(240, 320)
+    )
+    assert main_map is store.lookup(320, 240, 200000, 16.0)
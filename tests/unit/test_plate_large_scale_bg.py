@@ -48,3 +48,81 @@ def test_background_optimization_matches_reference_math() -> None:
 
     actual = subtract_large_scale_background_bgr(bgr, downsample_max_side=64)
     np.testing.assert_array_equal(actual, expected)
+
+
+def _vignetted_frame(seed: int = 0) -> np.ndarray:
+    """带暗角与噪声的 BGR 帧 / BGR frame with vignetting and noise."""
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:240, 0:320]
+    vignette = 80.0 - 30.0 * (((yy - 120) / 120.0) ** 2 + ((xx - 160) / 160.0) ** 2)
+    gray = np.clip(vignette + rng.normal(0.0, 2.0, vignette.shape), 0, 255).astype(
+        np.uint8
+    )
+    return np.dstack([gray, gray, gray])
+
+
+@pytest.mark.unit
+def test_temporal_background_refreshes_every_n_frames_or_on_key_change() -> None:
+    """每 N 帧或键变化时才重新估计 / Re-estimates only every N frames or on key change."""
+    from ogscope.algorithms.plate_solve.background import TemporalBackgroundModel
+
+    model = TemporalBackgroundModel(refresh_interval_frames=3, downsample_max_side=64)
+    frame = _vignetted_frame()
+    tokens = [model.update(frame, key=(10000, 1.0)).token for _ in range(7)]
+    assert tokens[0] == tokens[1] == tokens[2]
+    assert tokens[3] == tokens[4] == tokens[5] != tokens[2]
+    assert tokens[6] != tokens[5]
+    assert model.refresh_count == 3
+
+    changed = model.update(frame, key=(20000, 1.0))
+    assert changed.token != tokens[6]
+    assert model.update(frame[:120, :160], key=(20000, 1.0)).token != changed.token
+    assert model.refresh_count == 5
+
+
+@pytest.mark.unit
+def test_temporal_background_matches_per_frame_flattening() -> None:
+    """快照展平与逐帧估计的亮度一致 / Snapshot flattening matches per-frame luminance flattening."""
+    from ogscope.algorithms.plate_solve import luminance_for_extraction
+    from ogscope.algorithms.plate_solve.background import TemporalBackgroundModel
+
+    frame = _vignetted_frame()
+    snapshot = TemporalBackgroundModel(downsample_max_side=64).update(frame)
+    fast, shape = luminance_for_extraction(frame, 320, background=snapshot)
+    ref, _ = luminance_for_extraction(
+        frame, 320, large_scale_bg_subtract=True, downsample_max_side=64
+    )
+    assert shape == (240, 320) and fast.dtype == np.uint8
+    assert np.abs(fast.astype(np.int16) - ref.astype(np.int16)).max() <= 2
+    # 暗角被展平 / Vignetting is flattened
+    assert float(fast[:20].mean()) == pytest.approx(
+        float(fast[110:130].mean()), abs=2.0
+    )
+
+    mono16 = frame[:, :, 0].astype(np.uint16) * 256
+    flat16, _ = luminance_for_extraction(
+        mono16,
+        320,
+        background=TemporalBackgroundModel(downsample_max_side=64).update(mono16),
+    )
+    assert flat16.dtype == np.uint16
+    assert float(flat16[:20].mean()) == pytest.approx(
+        float(flat16[110:130].mean()), rel=0.05
+    )
+
+
+@pytest.mark.unit
+def test_mono_frame_flattened_without_snapshot() -> None:
+    """单通道帧无快照时也按当前帧展平 / Mono frames are flattened from the frame itself."""
+    from ogscope.algorithms.plate_solve import luminance_for_extraction
+
+    mono = cv2.cvtColor(_vignetted_frame(), cv2.COLOR_BGR2GRAY)
+    raw, _ = luminance_for_extraction(mono, 320)
+    flat, shape = luminance_for_extraction(
+        mono, 320, large_scale_bg_subtract=True, downsample_max_side=64
+    )
+    assert shape == (240, 320) and flat.dtype == np.uint8
+    assert abs(float(raw[:20].mean()) - float(raw[110:130].mean())) > 10.0
+    assert float(flat[:20].mean()) == pytest.approx(
+        float(flat[110:130].mean()), abs=2.0
+    )
@@ -0,0 +1,112 @@
+"""设备配置图案库单元测试 / Unit tests for the device-profile pattern database."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import ogscope  # noqa: F401 — 注册 vendor 路径 / registers vendor path
+from ogscope.algorithms.plate_solve import solver as solver_mod
+from ogscope.algorithms.plate_solve.profile_database import (
+    build_profile_database,
+    profile_database_path,
+)
+from ogscope.config import Settings
+from tests.conftest import synthetic_centroids
+
+_SIZE = (480, 640)
+
+
+@pytest.mark.unit
+def test_profile_path_encodes_settings(tmp_path: Path) -> None:
+    """文件名随视场带/星等/赤纬带变化 / File name follows FOV band, magnitude and Dec band."""
+    settings = Settings(plate_solve_dir=tmp_path, solver_fov_deg=11.0)
+    assert profile_database_path(settings) == tmp_path / "profile_fov10to12_magauto.npz"
+
+    polar = Settings(
+        plate_solve_dir=tmp_path,
+        solver_fov_deg=11.0,
+        solver_profile_fov_margin_deg=0.5,
+        solver_profile_star_max_magnitude=7.5,
+        solver_profile_dec_min_deg=60.0,
+    )
+    assert (
+        profile_database_path(polar).name
+        == "profile_fov10p5to11p5_mag7p5_dec60to90.npz"
+    )
+
+
+@pytest.mark.unit
+def test_resolver_picks_matching_profile_database(tmp_path: Path) -> None:
+    """存在匹配的设备库时自动选用，显式配置优先 / A matching profile DB wins unless a path is configured."""
+    settings = Settings(plate_solve_dir=tmp_path, solver_database_mmap=False)
+    (tmp_path / "default_database.npz").write_bytes(b"")
+    assert (
+        solver_mod._resolve_database_path(settings) == tmp_path / "default_database.npz"
+    )
+
+    profile = profile_database_path(settings)
+    profile.write_bytes(b"")
+    assert solver_mod._resolve_database_path(settings) == profile
+
+    other_fov = Settings(
+        plate_solve_dir=tmp_path, solver_database_mmap=False, solver_fov_deg=20.0
+    )
+    assert (
+        solver_mod._resolve_database_path(other_fov)
+        == tmp_path / "default_database.npz"
+    )
+
+    explicit = Settings(
+        plate_solve_dir=tmp_path,
+        solver_database_mmap=False,
+        solver_tetra_database_path=tmp_path / "default_database.npz",
+    )
+    assert (
+        solver_mod._resolve_database_path(explicit)
+        == (tmp_path / "default_database.npz").resolve()
+    )
+
+
+@pytest.mark.unit
+def test_build_dec_band_profile_database(
+    synthetic_tetra_database: Path, tmp_path: Path
+) -> None:
+    """赤纬带设备库只含带内附近星且可解算 / A Dec-band profile DB keeps nearby stars and solves."""
+    from tetra3 import Tetra3
+
+    settings = Settings(
+        plate_solve_dir=tmp_path,
+        solver_fov_deg=20.0,
+        solver_profile_fov_margin_deg=0.0,
+        solver_profile_dec_min_deg=60.0,
+    )
+    out = build_profile_database(
+        settings,
+        synthetic_tetra_database.parent / "hip_main.dat",
+        lattice_field_oversampling=10,
+        patterns_per_lattice_field=20,
+        verification_stars_per_fov=30,
+        epoch_proper_motion=None,
+    )
+    assert out == profile_database_path(settings)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [out.name]
+
+    full = Tetra3(load_database=synthetic_tetra_database)
+    t3 = Tetra3(load_database=out)
+    assert t3.database_properties["hash_table_type"] == "bucketed"
+    assert list(t3.database_properties["range_dec"]) == [60.0, 90.0]
+    assert np.rad2deg(t3.star_table[:, 1].min()) >= 40.0 - 1e-4
+    assert t3.num_patterns < full.num_patterns / 2
+
+    solution = t3.solve_from_centroids(
+        synthetic_centroids(full, 200.0, 75.0, 30.0, size=_SIZE),
+        _SIZE,
+        fov_estimate=20.0,
+        fov_max_error=1.0,
+        solve_timeout=None,
+    )
+    assert solution["status"] == 1
+    assert solution["Dec"] == pytest.approx(75.0, abs=0.1)
@@ -25,6 +25,7 @@ class _FakeCamera:
 @pytest.mark.unit
 def test_realtime_solver_status_endpoints(client, monkeypatch, mock_plate_solve):
     """测试实时解算启停接口 / Test realtime solver start and stop endpoints."""
+    from ogscope.domain.camera.frame_ring import FrameLease
     from ogscope.web.api.debug import routes as debug_routes
     from ogscope.web.camera_shared import CameraManager, get_camera_manager
 
@@ -36,11 +37,10 @@ def test_realtime_solver_status_endpoints(client, monkeypatch, mock_plate_solve)
         staticmethod(lambda: fake_camera),
     )
 
-    async def _fake_get_raw_frame(_self):
-        frame = fake_camera.get_video_frame()
-        return frame, 1, 0.0
+    async def _fake_lease_raw_frame(_self, newer_than=None):
+        return FrameLease(fake_camera.get_video_frame(), 1, 0.0)
 
-    monkeypatch.setattr(CameraManager, "get_raw_frame", _fake_get_raw_frame)
+    monkeypatch.setattr(CameraManager, "lease_raw_frame", _fake_lease_raw_frame)
 
     start_resp = client.post(
         "/api/dev/debug/analysis/realtime/start",
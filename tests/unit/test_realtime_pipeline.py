@@ -0,0 +1,206 @@
+"""实时解算分阶段流水线测试 / Tests for the staged realtime solve pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from ogscope.algorithms.plate_solve.solver import SolveResult
+from ogscope.algorithms.star_extract import StarPoint
+from ogscope.core.realtime import service as realtime_module
+from ogscope.core.realtime.pipeline import LatestQueue
+from ogscope.core.realtime.service import RealtimeSolveService
+from ogscope.domain.camera.frame_ring import FrameRing
+
+
+class _FakeCamera:
+    is_capturing = True
+
+
+class _FakeManager:
+    """以环形缓冲模拟共享抓帧 / Shared grabber stand-in backed by a real ring."""
+
+    def __init__(self) -> None:
+        self.ring = FrameRing(3)
+        self.camera = _FakeCamera()
+        self.frame_id = 0
+
+    def get_camera_instance(self):
+        return self.camera
+
+    def main_frame_shape(self):
+        return None
+
+    async def acquire_analysis_consumer(self) -> None:
+        return None
+
+    async def release_analysis_consumer(self) -> None:
+        return None
+
+    async def lease_raw_frame(self, newer_than=None):
+        await asyncio.sleep(0.02)
+        self.frame_id += 1
+        self.ring.write(np.zeros((48, 64), dtype=np.uint8), self.frame_id, time.time())
+        return self.ring.lease_latest()
+
+
+class _SlowExtractor:
+    def __init__(self, star_count: int) -> None:
+        self.star_count = star_count
+        self.calls: list[tuple[str, float, float]] = []
+
+    def extract(self, frame, hot_pixels=None, *, coord_scale=1.0):
+        t0 = time.monotonic()
+        time.sleep(0.1)
+        self.calls.append((threading.current_thread().name, t0, time.monotonic()))
+        return [
+            StarPoint(x=float(i), y=float(i), flux=1.0, area=1.0)
+            for i in range(self.star_count)
+        ]
+
+
+def _service(monkeypatch, star_count: int):
+    manager = _FakeManager()
+    monkeypatch.setattr(realtime_module, "get_camera_manager", lambda: manager)
+    svc = RealtimeSolveService()
+    svc._analysis_interval_sec = 0.0
+    svc._fullsolve_interval = 1
+    svc._scheduler = None
+    svc.extractor = _SlowExtractor(star_count)
+    solves: list[tuple[float, float]] = []
+
+    async def fake_solve(frame_shape, stars, tracking=False):
+        t0 = time.monotonic()
+        await asyncio.sleep(0.1)
+        solves.append((t0, time.monotonic()))
+        return SolveResult(
+            ra_deg=10.0,
+            dec_deg=80.0,
+            detected_stars=len(stars),
+            solve_source="realtime",
+            status="NO_MATCH",
+            status_code=0,
+            roll_deg=None,
+            fov_deg=None,
+            matches=None,
+            prob=None,
+            rmse_arcsec=None,
+            t_solve_ms=100.0,
+            t_extract_ms=None,
+            t_preprocess_ms=None,
+        )
+
+    svc._solve_frame = fake_solve
+    return svc, manager, solves
+
+
+@pytest.mark.asyncio
+async def test_extraction_runs_off_loop_and_overlaps_solving(monkeypatch) -> None:
+    """提星不阻塞事件循环，且与解算重叠 / Extraction leaves the loop free and overlaps solving."""
+    svc, manager, solves = _service(monkeypatch, star_count=12)
+    await svc.start()
+    max_gap = 0.0
+    end = time.monotonic() + 0.8
+    last = time.monotonic()
+    while time.monotonic() < end:
+        await asyncio.sleep(0.01)
+        now = time.monotonic()
+        max_gap, last = max(max_gap, now - last), now
+    status = await svc.get_status()
+    await svc.stop()
+
+    calls = svc.extractor.calls
+    assert calls and all(name.startswith("ogscope-extract") for name, _a, _b in calls)
+    assert max_gap < 0.06
+    assert any(s0 < e1 and e0 < s1 for _n, e0, e1 in calls for s0, s1 in solves)
+    stages = status["stages"]
+    assert set(stages) == {"acquire", "extract", "filter", "solve", "publish"}
+    assert stages["extract"]["dropped"] > 0 and stages["extract"]["avg_ms"] >= 90.0
+    assert status["fullsolve_count"] == stages["publish"]["processed"] >= 4
+    assert status["end_to_end_ms"] > 0
+    # 被取消时进行中的提星线程结束后自行释放租约 / An in-flight extraction releases on completion
+    await asyncio.sleep(0.15)
+    assert manager.ring.stats()["raw_ring_pinned"] == 0
+
+
+@pytest.mark.asyncio
+async def test_quality_filter_skips_sparse_frames(monkeypatch) -> None:
+    """星点过少的帧不送解算 / Frames with too few stars never reach the solver."""
+    svc, manager, solves = _service(monkeypatch, star_count=2)
+    await svc.start()
+    await asyncio.sleep(0.35)
+    status = await svc.get_status()
+    await svc.stop()
+
+    assert status["rejected_count"] >= 2 and not solves
+    assert status["stages"]["filter"]["processed"] == status["rejected_count"]
+    # 被取消时进行中的提星线程结束后自行释放租约 / An in-flight extraction releases on completion
+    await asyncio.sleep(0.15)
+    assert manager.ring.stats()["raw_ring_pinned"] == 0
+
+
+@pytest.mark.unit
+def test_tracking_job_never_replaces_a_queued_full_solve(monkeypatch) -> None:
+    """跟踪作业不顶替排队中的全量解算 / A tracking job leaves a queued full solve in place."""
+    svc, _manager, _solves = _service(monkeypatch, star_count=12)
+    svc._solve_queue = LatestQueue(
+        1, svc._stats["solve"], realtime_module._FrameJob.release
+    )
+    svc._track_prior = object()
+    svc._propagate = lambda *_args: None
+
+    def job(frame_id: int, fullsolve: bool):
+        return realtime_module._FrameJob(
+            frame_id=frame_id,
+            fullsolve=fullsolve,
+            frame=None,
+            camera=None,
+            frame_shape=(48, 64),
+            coord_scale=1.0,
+            acquired_mono=time.monotonic(),
+            stars=[
+                StarPoint(x=float(i), y=float(i), flux=1.0, area=1.0) for i in range(12)
+            ],
+        )
+
+    svc._filter_job(job(1, fullsolve=True))
+    svc._filter_job(job(2, fullsolve=False))
+    assert svc._solve_queue._queue.get_nowait().frame_id == 1
+    assert svc._stats["solve"].dropped == 1
+
+    # 更新的全量解算照常顶替旧项 / A newer full solve still supersedes the pending one
+    svc._filter_job(job(3, fullsolve=False))
+    svc._filter_job(job(4, fullsolve=True))
+    assert svc._solve_queue._queue.get_nowait().frame_id == 4
+
+
+@pytest.mark.asyncio
+async def test_filter_and_publish_errors_do_not_stop_the_pipeline(monkeypatch) -> None:
+    """过滤与发布阶段出错时记录错误并继续 / Filter and publish errors are logged, not fatal."""
+    svc, _manager, _solves = _service(monkeypatch, star_count=12)
+    publish_job = svc._publish_job
+    calls = {"filter": 0, "publish": 0}
+
+    def flaky(name, fn):
+        def wrapper(*args):
+            calls[name] += 1
+            if calls[name] == 1:
+                raise RuntimeError(f"{name} boom")
+            return fn(*args)
+
+        return wrapper
+
+    svc._filter_job = flaky("filter", svc._filter_job)
+    svc._publish_job = flaky("publish", publish_job)
+    await svc.start()
+    await asyncio.sleep(0.8)
+    status = await svc.get_status()
+    await svc.stop()
+
+    assert calls["filter"] >= 2 and calls["publish"] >= 2
+    assert status["last_error"] in {"filter boom", "publish boom"}
+    assert status["fullsolve_count"] >= 1
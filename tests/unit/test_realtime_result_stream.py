@@ -0,0 +1,83 @@
+"""实时结果推送测试 / Tests for pushed realtime results."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from ogscope.core.realtime.broadcast import ResultHub, snapshot_delta
+
+
+def _snapshot(frame: int, ra: float, *, mode: str = "fullsolve") -> dict:
+    return {
+        "running": True,
+        "frame_count": frame,
+        "result": {
+            "ra_deg": ra,
+            "dec_deg": 80.0,
+            "solve_mode": mode,
+            "tetra": {"n": 12},
+        },
+    }
+
+
+@pytest.mark.unit
+def test_snapshot_delta_keeps_only_changes() -> None:
+    """差分只含变化字段，消失字段为 None / Deltas carry changes only; vanished keys map to None."""
+    old = {"a": 1, "b": {"x": 1, "y": 2}, "gone": 3}
+    new = {"a": 1, "b": {"x": 1, "y": 5}, "c": [1]}
+    assert snapshot_delta(old, new) == {"b": {"y": 5}, "c": [1], "gone": None}
+    assert snapshot_delta(new, new) == {}
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_gets_latest_delta_only() -> None:
+    """慢客户端只收到最新结果的差分 / A slow client gets just the newest result, as a delta."""
+    hub = ResultHub(max_subscribers=2)
+    hub.publish(_snapshot(1, 10.0))
+    slow = hub.subscribe()
+    fast = hub.subscribe(include_tracking=False, detail="full")
+    assert hub.subscribe() is None
+
+    first = await slow.next()
+    assert first["frame_count"] == 1 and "tetra" not in first["result"]
+    assert (await fast.next())["result"]["tetra"] == {"n": 12}
+
+    for frame in range(2, 6):
+        hub.publish(_snapshot(frame, 10.0 + frame, mode="tracking"), tracking=True)
+    delta = await slow.next()
+    assert slow.coalesced == 3
+    assert delta == {
+        "seq": 5,
+        "frame_count": 5,
+        "result": {"ra_deg": 15.0, "solve_mode": "tracking"},
+    }
+
+    # 只订阅全解算的客户端跳过跟踪帧 / Full-solve-only clients skip tracker updates
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(fast.next(), timeout=0.05)
+    hub.publish(_snapshot(6, 20.0))
+    assert (await fast.next())["result"] == {"ra_deg": 20.0}
+
+    slow.close()
+    assert hub.subscriber_count == 1 and hub.subscribe() is not None
+
+
+@pytest.mark.unit
+def test_websocket_pushes_current_result(client, monkeypatch) -> None:
+    """WebSocket 连接立即收到当前结果，超出上限被拒绝 / WebSocket gets the current result; extra clients are refused."""
+    from starlette.websockets import WebSocketDisconnect
+
+    from ogscope.core.realtime import realtime_solve_service
+
+    hub = ResultHub(max_subscribers=1)
+    monkeypatch.setattr(realtime_solve_service, "results", hub)
+    hub.publish(_snapshot(7, 42.0))
+
+    with client.websocket_connect("/api/core/v1/analysis/ws?detail=full") as ws:
+        message = ws.receive_json()
+        assert message["seq"] == 1 and message["result"]["tetra"] == {"n": 12}
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect("/api/core/v1/analysis/ws") as extra:
+                extra.receive_json()
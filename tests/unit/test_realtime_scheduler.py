@@ -0,0 +1,101 @@
+"""全量解算自适应调度测试 / Tests for adaptive full-solve scheduling."""
+
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from ogscope.config import Settings
+from ogscope.core.realtime.scheduler import FullSolveScheduler
+
+# 0.005 度/像素：1920 像素约 9.6° 视场 / 0.005 deg per pixel, about a 9.6° field at 1920 px
+_DEG_PER_PX = 0.005
+
+
+def _run(
+    scheduler: FullSolveScheduler, speed_deg_s: float, seconds: float, fps: float = 5.0
+) -> int:
+    """按帧率模拟：每帧先跟踪再决策，全量解算立即成功 / Simulate frames; full solves succeed at once."""
+    dt = 1.0 / fps
+    solves = 0
+    for i in range(int(seconds * fps)):
+        now = i * dt
+        if i:
+            scheduler.observe_track(
+                speed_deg_s * dt / _DEG_PER_PX, 0.9, _DEG_PER_PX, dt
+            )
+        if scheduler.decide(now).fullsolve:
+            solves += 1
+            scheduler.observe_latency(300.0)
+            scheduler.observe_solve(True, now, fullsolve=True)
+    return solves
+
+
+@pytest.mark.unit
+def test_still_mount_stretches_and_turning_tightens_full_solves() -> None:
+    """静止时少解算，转动时比固定 10 帧间隔更频繁 / Fewer solves when still, more than every 10 frames when turning."""
+    still = FullSolveScheduler(
+        min_interval_sec=1.0, max_interval_sec=15.0, motion_deg_s=0.1
+    )
+    # 60 秒、5 fps：固定间隔为 30 次 / 60 s at 5 fps: the fixed 10-frame interval runs 30
+    assert _run(still, speed_deg_s=0.004, seconds=60.0) == 4
+    assert still.to_dict(60.0)["reasons"]["steady"] > 250
+
+    turning = FullSolveScheduler(
+        min_interval_sec=1.0, max_interval_sec=15.0, motion_deg_s=0.1
+    )
+    assert _run(turning, speed_deg_s=1.0, seconds=60.0) == 60
+    status = turning.to_dict(60.0)
+    assert status["motion_deg_s"] == pytest.approx(1.0)
+    assert status["last_decision"]["reason"] in {"motion", "min_interval"}
+
+
+@pytest.mark.unit
+def test_confidence_failures_and_latency_drive_decisions() -> None:
+    """低置信度与失败尽快重解，最小间隔不低于解算耗时 / Low confidence and failures re-solve soon; latency bounds the interval."""
+    sched = FullSolveScheduler(min_interval_sec=1.0, max_interval_sec=15.0)
+    assert sched.decide(0.0).reason == "no_fix"
+    sched.observe_solve(False, 0.8, fullsolve=True)
+    assert sched.decide(0.9).reason == "min_interval"
+    assert sched.decide(1.0).reason == "no_fix"
+
+    sched.observe_solve(True, 1.5, fullsolve=True)
+    assert sched.decide(2.5).reason == "steady"
+    sched.observe_track(0.0, 0.2, _DEG_PER_PX, 0.2)
+    assert sched.decide(2.6).reason == "low_confidence"
+    sched.observe_solve(False, 3.0, fullsolve=True)
+    assert sched.decide(3.7).reason == "retry"
+
+    # 全量解算 4 秒：最小间隔放宽到 6 秒 / 4 s full solves widen the minimum interval to 6 s
+    sched.observe_latency(4000.0)
+    sched.observe_solve(True, 4.0, fullsolve=True)
+    assert sched.decide(9.0).reason == "min_interval"
+    assert sched.decide(9.8).reason == "low_confidence"
+    # 失败的跟踪解算不触发重试 / A failed tracking solve does not trigger a retry
+    sched.observe_solve(True, 10.0, fullsolve=True)
+    sched.observe_track(0.0, 0.9, _DEG_PER_PX, 0.2)
+    sched.observe_solve(False, 10.5, fullsolve=False)
+    assert sched.decide(16.0).reason == "steady"
+    assert sched.to_dict(16.0)["min_interval_sec"] == pytest.approx(6.0)
+
+
+@pytest.mark.asyncio
+async def test_realtime_status_reports_scheduler() -> None:
+    """状态中包含调度决策 / Status exposes the scheduler's decisions."""
+    from ogscope.core.realtime.service import RealtimeSolveService
+
+    svc = RealtimeSolveService()
+    assert svc._wants_fullsolve() is True
+    scheduler = (await svc.get_status())["scheduler"]
+    assert scheduler["adaptive"] is True
+    assert scheduler["last_decision"] == {"fullsolve": True, "reason": "no_fix"}
+
+
+@pytest.mark.unit
+def test_settings_reject_min_interval_above_max() -> None:
+    """最小全量解算间隔大于最大间隔时配置报错 / Settings reject a min interval above the max."""
+    with pytest.raises(ValidationError, match="solver_fullsolve_min_interval_sec"):
+        Settings(
+            solver_fullsolve_min_interval_sec=30.0,
+            solver_fullsolve_max_interval_sec=10.0,
+        )
@@ -9,6 +9,7 @@ import pytest
 from ogscope.algorithms.plate_solve.sensor_context import (
     attach_sensor_prediction,
     local_sidereal_time_deg,
+    sensor_hint,
 )
 from ogscope.web.api.models.schemas import AnalysisSolveImageRequest
 
@@ -85,3 +86,15 @@ def test_sensor_prediction_unavailable_when_time_invalid() -> None:
     attach_sensor_prediction(row, context)
 
     assert row["sensor_prediction"]["sensor_status"] == "unavailable"
+
+
+def test_sensor_hint_only_for_usable_prediction() -> None:
+    """仅在预测可用时给出解算 hint / Solver hint only for a usable prediction."""
+    ra_dec = sensor_hint(_solve_context())
+    assert ra_dec is not None
+    assert ra_dec[1] == pytest.approx(0.0, abs=1e-6)
+
+    context = _solve_context()
+    context["quality"]["gps_valid"] = False
+    assert sensor_hint(context) is None
+    assert sensor_hint(None) is None
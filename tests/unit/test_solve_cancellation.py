@@ -0,0 +1,109 @@
+"""解算协作式取消单元测试 / Unit tests for cooperative solve cancellation."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import ogscope  # noqa: F401 — 注册 vendor 路径 / registers vendor path
+from ogscope.algorithms.plate_solve import (
+    AsyncPlateSolver,
+    PlateSolver,
+    SolveCancelToken,
+)
+from ogscope.algorithms.plate_solve import pool as pool_mod
+from ogscope.algorithms.star_extract import StarPoint
+
+_SIZE = (480, 640)
+
+
+def _random_stars(n: int = 30, seed: int = 2) -> list[StarPoint]:
+    """与任何天区都不匹配的随机星点（全量搜索约 0.3 s）/ Random stars matching no sky (~0.3 s search)."""
+    rng = np.random.default_rng(seed)
+    return [
+        StarPoint(x=float(x), y=float(y), flux=float(n - i), area=4.0)
+        for i, (y, x) in enumerate(rng.uniform((0, 0), _SIZE, size=(n, 2)))
+    ]
+
+
+def _cancel_after(token: SolveCancelToken, delay_sec: float) -> None:
+    threading.Timer(delay_sec, token.cancel).start()
+
+
+@pytest.mark.unit
+def test_token_cancels_only_its_own_search(synthetic_tetra_database: Path) -> None:
+    """令牌中止对应搜索，实例级标志不受影响 / Token stops its search; instance flag untouched."""
+    from tetra3 import Tetra3
+    from tetra3.tetra3 import CANCELLED
+
+    t3 = Tetra3(load_database=synthetic_tetra_database)
+    centroids = np.array([[s.y, s.x] for s in _random_stars()])
+    token = SolveCancelToken()
+    _cancel_after(token, 0.03)
+
+    out = t3.solve_from_centroids(
+        centroids, _SIZE, fov_estimate=20.0, solve_timeout=60000, cancel_token=token
+    )
+    assert out["status"] == CANCELLED
+    assert not t3._cancelled
+
+
+@pytest.mark.unit
+def test_cancelled_token_stops_centroid_extraction() -> None:
+    """已取消令牌使提星抛出 SolveCancelled / A set token aborts centroid extraction."""
+    from tetra3 import SolveCancelled, get_centroids_from_image
+
+    image = np.zeros((120, 160), dtype=np.float32)
+    image[40:44, 50:54] = 200.0
+    token = SolveCancelToken()
+    assert len(get_centroids_from_image(image, cancel_token=token)) == 1
+    token.cancel()
+    with pytest.raises(SolveCancelled):
+        get_centroids_from_image(image, cancel_token=token)
+
+
+@pytest.mark.unit
+def test_plate_solver_reports_cancelled_extraction() -> None:
+    """提星阶段取消返回 CANCELLED 结果 / Cancellation during extraction yields CANCELLED."""
+    token = SolveCancelToken()
+    token.cancel()
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    result = PlateSolver().solve_from_bgr_frame(frame, max_stars=20, cancel_token=token)
+    assert result.status == "CANCELLED"
+    assert result.status_code == 4
+
+
+@pytest.mark.unit
+def test_pool_worker_is_freed_by_cancel(
+    synthetic_tetra_database: Path, monkeypatch
+) -> None:
+    """取消经共享标志到达 worker 进程 / Cancellation reaches the worker via the shared flag."""
+    monkeypatch.setenv(
+        "OGSCOPE_SOLVER_TETRA_DATABASE_PATH", str(synthetic_tetra_database)
+    )
+    monkeypatch.setenv("OGSCOPE_SOLVER_DATABASE_MMAP", "false")
+    pool = pool_mod.SolverProcessPool(1)
+    monkeypatch.setattr(pool_mod, "get_solver_pool", lambda: pool)
+    try:
+        pool.warmup()
+        facade = AsyncPlateSolver(PlateSolver(fov_deg=20.0, solve_timeout_ms=60000))
+        token = SolveCancelToken()
+        _cancel_after(token, 0.05)
+        result = facade.solve_sync(
+            _random_stars(), _SIZE, centroid_rejection_level=1, cancel_token=token
+        )
+        assert result.status == "CANCELLED"
+        # 槽位已归还，下一请求不受旧取消影响 / Slot released; next request unaffected
+        again = facade.solve_sync(
+            _random_stars(4),
+            _SIZE,
+            centroid_rejection_level=1,
+            cancel_token=SolveCancelToken(),
+            solve_timeout_ms=200,
+        )
+        assert again.status != "CANCELLED"
+    finally:
+        pool.shutdown()
@@ -4,12 +4,14 @@
 
 from __future__ import annotations
 
+import itertools
 import time
 
 import cv2
 import numpy as np
 import pytest
 
+import ogscope  # noqa: F401 — 注册 vendor 路径 / registers vendor path
 from ogscope.algorithms.star_extract import StarExtractor
 
 
@@ -42,3 +44,136 @@ def test_star_extract_performance_baseline():
     avg_ms = (elapsed / rounds) * 1000.0
 
     assert avg_ms < 35.0
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+def test_star_extract_noisy_1080p_budget():
+    """1080p 高噪声帧提星预算（连通域过多的最坏情况）/ 1080p noisy-frame budget (blob-count worst case)."""
+    rng = np.random.default_rng(7)
+    gray = np.clip(rng.normal(30.0, 8.0, (1080, 1920)), 0, 255).astype(np.uint8)
+    frame = np.dstack([gray, gray, gray])
+    extractor = StarExtractor(max_stars=80)
+    extractor.extract(frame)
+
+    times = []
+    for _ in range(5):
+        start = time.perf_counter()
+        stars = extractor.extract(frame)
+        times.append((time.perf_counter() - start) * 1000.0)
+
+    assert len(stars) <= 80
+    assert min(times) < 45.0
+
+
+def _legacy_key_hashes(
+    ratios: np.ndarray, bins: int, max_err: float, max_index: int
+) -> list[tuple[int, int]]:
+    """原逐键实现（product + dist 闭包 + 逐个哈希）/ Original per-key enumeration."""
+    from tetra3.tetra3 import _compute_pattern_key_hash, _pattern_key_hash_to_index
+
+    key = (ratios * bins).astype(int)
+    low = np.maximum(0, (ratios - max_err) * bins).astype(int)
+    high = np.minimum(bins, (ratios + max_err) * bins).astype(int)
+    ranges = [range(lo, hi + 1) for lo, hi in zip(low, high)]
+
+    def dist(code: tuple[int, ...]) -> int:
+        return sum((a - b) * (a - b) for a, b in zip(code, key))
+
+    keys = sorted((dist(code), code) for code in itertools.product(*ranges))
+    out = []
+    for _, code in keys:
+        key_hash = _compute_pattern_key_hash(code, bins)
+        out.append(
+            (int(key_hash), int(_pattern_key_hash_to_index(key_hash, max_index, False)))
+        )
+    return out
+
+
+def _neighbourhood_patterns() -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    return [np.sort(rng.uniform(0.2, 1.0, 5)) for _ in range(200)]
+
+
+def _vectorized_key_hashes(
+    ratios: np.ndarray, bins: int, max_err: float, max_index: int
+) -> list[tuple[int, int]]:
+    """向量化候选键枚举 / Vectorized candidate-key enumeration."""
+    from tetra3.tetra3 import _pattern_key_neighbourhood
+
+    key_hashes, indices = _pattern_key_neighbourhood(
+        np.maximum(0, (ratios - max_err) * bins).astype(int),
+        np.minimum(bins, (ratios + max_err) * bins).astype(int),
+        (ratios * bins).astype(int),
+        bins,
+        max_index,
+        False,
+    )
+    return list(zip(key_hashes.tolist(), indices.tolist()))
+
+
+@pytest.mark.unit
+def test_pattern_key_neighbourhood_matches_legacy():
+    """候选键向量化结果与原实现一致 / Vectorized key search is identical to the original."""
+    bins, max_err, max_index = 250, 0.002, 1_000_003
+    for r in _neighbourhood_patterns():
+        expected = _legacy_key_hashes(r, bins, max_err, max_index)
+        assert _vectorized_key_hashes(r, bins, max_err, max_index) == expected
+
+
+def _best_of_ms(fn, rounds: int = 3, setup=None) -> float:
+    """多轮取最快耗时(ms) / Fastest of several rounds in ms."""
+    times = []
+    for _ in range(rounds):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000.0)
+    return min(times)
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+def test_pattern_key_neighbourhood_is_faster_than_legacy():
+    """200 个图案的候选键枚举明显快于原实现 / Vectorized key search clearly beats the original."""
+    bins, max_err, max_index = 250, 0.002, 1_000_003
+    patterns = _neighbourhood_patterns()
+
+    legacy_ms = _best_of_ms(
+        lambda: [_legacy_key_hashes(r, bins, max_err, max_index) for r in patterns]
+    )
+    vectorized_ms = _best_of_ms(
+        lambda: [_vectorized_key_hashes(r, bins, max_err, max_index) for r in patterns]
+    )
+
+    assert vectorized_ms <= legacy_ms / 3.0
+
+
+@pytest.mark.unit
+def test_breadth_first_combination_blocks_match_generator():
+    """广度优先组合索引表与递归生成器顺序一致 / Index tables match the recursive generator."""
+    from tetra3.breadth_first_combinations import (
+        breadth_first_combination_blocks,
+        breadth_first_combinations,
+    )
+
+    n = 30
+    legacy = list(breadth_first_combinations(list(range(n)), 4))
+    blocks = list(breadth_first_combination_blocks(n, 4))
+    assert [tuple(row) for b in blocks for row in b.tolist()] == legacy
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+def test_breadth_first_combination_blocks_cold_cache_budget():
+    """空缓存下 30 选 4 索引表生成预算 / Cold-cache budget for the 30-choose-4 index tables."""
+    from tetra3 import breadth_first_combinations as bfc
+
+    table_ms = _best_of_ms(
+        lambda: list(bfc.breadth_first_combination_blocks(30, 4)),
+        rounds=5,
+        setup=bfc._index_tables.clear,
+    )
+    bfc._index_tables.clear()
+    assert table_ms < 10.0
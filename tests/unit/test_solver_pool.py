@@ -0,0 +1,184 @@
+"""解算进程池单元测试 / Unit tests for the plate-solve process pool."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import ogscope  # noqa: F401 — 注册 vendor 路径 / registers vendor path
+from ogscope.algorithms.plate_solve import AsyncPlateSolver, PlateSolver, SolveResult
+from ogscope.algorithms.plate_solve import pool as pool_mod
+from ogscope.algorithms.plate_solve import solver as solver_mod
+from ogscope.algorithms.star_extract import StarPoint
+from tests.conftest import synthetic_centroids
+
+_TIMING_KEYS = ("t_solve_ms", "t_extract_ms", "t_preprocess_ms")
+
+
+def _sample_result() -> SolveResult:
+    return SolveResult(
+        ra_deg=12.5,
+        dec_deg=-3.25,
+        detected_stars=3,
+        solve_source="realtime",
+        status="MATCH_FOUND",
+        status_code=1,
+        roll_deg=None,
+        fov_deg=10.0,
+        matches=2,
+        prob=1e-9,
+        rmse_arcsec=4.5,
+        t_solve_ms=12.0,
+        t_extract_ms=None,
+        t_preprocess_ms=1.5,
+        large_scale_bg_subtract=True,
+        raw={
+            "matched_centroids": [[1.0, 2.0], [3.5, 4.5]],
+            "matched_catID": [11, 12],
+            "rotation_matrix": np.eye(3),
+            "distortion": None,
+            "epoch_equinox": 2000,
+        },
+        solve_overlay={
+            "frame_shape": [480, 640],
+            "stars_matched": [
+                {
+                    "x": 1.0,
+                    "y": 2.0,
+                    "ra_deg": 1.0,
+                    "dec_deg": 2.0,
+                    "mag": 3.0,
+                    "cat_id": 11,
+                },
+                {
+                    "x": 3.0,
+                    "y": 4.0,
+                    "ra_deg": 5.0,
+                    "dec_deg": 6.0,
+                    "mag": 7.0,
+                    "cat_id": None,
+                },
+            ],
+            "stars_pattern": [{"x": 1.0, "y": 2.0}],
+            "stars_all_centroids": [],
+        },
+        centroid_quality={
+            "level": 3,
+            "flags": ["dense"],
+            "rejected_centroids_yx": [[5.0, 6.0]],
+        },
+        solve_mode="tracking",
+    )
+
+
+@pytest.mark.unit
+def test_pack_round_trip_preserves_result() -> None:
+    """打包/解包后 to_dict 完全一致，数值载荷为数组 / Round trip is exact and payloads are arrays."""
+    original = _sample_result()
+    packed = pool_mod.pack_solve_result(original)
+    assert isinstance(packed.raw["matched_centroids"], pool_mod._PackedList)
+    assert isinstance(packed.solve_overlay["stars_pattern"], pool_mod._PackedRecords)
+
+    restored = pool_mod.unpack_solve_result(packed)
+    assert restored.to_dict() == original.to_dict()
+    assert restored.roll_deg is None and restored.matches == 2
+    assert restored.raw["matched_catID"] == [11, 12]
+
+
+@pytest.mark.unit
+def test_process_pool_matches_in_process_solve(
+    synthetic_tetra_database: Path, monkeypatch
+) -> None:
+    """进程池解算与本进程解算结果一致 / Pool solve equals the in-process solve."""
+    from tetra3 import Tetra3
+
+    monkeypatch.setenv(
+        "OGSCOPE_SOLVER_TETRA_DATABASE_PATH", str(synthetic_tetra_database)
+    )
+    monkeypatch.setenv("OGSCOPE_SOLVER_DATABASE_MMAP", "false")
+    t3 = Tetra3(load_database=synthetic_tetra_database)
+    monkeypatch.setattr(solver_mod, "_get_tetra3", lambda _settings: t3)
+
+    size = (480, 640)
+    stars = [
+        StarPoint(x=float(c[1]), y=float(c[0]), flux=float(100 - i), area=4.0)
+        for i, c in enumerate(synthetic_centroids(t3, 30.0, 20.0, 10.0, size=size))
+    ]
+    solver = PlateSolver(fov_deg=20.0, fov_max_error_deg=1.0, solve_timeout_ms=60000)
+    expected = solver.solve(stars, size, centroid_rejection_level=1).to_dict()
+
+    pool = pool_mod.SolverProcessPool(1)
+    monkeypatch.setattr(pool_mod, "get_solver_pool", lambda: pool)
+    try:
+        facade = AsyncPlateSolver(solver)
+        got = asyncio.run(facade.solve(stars, size, centroid_rejection_level=1))
+    finally:
+        pool.shutdown()
+
+    assert got.status == "MATCH_FOUND"
+    actual = got.to_dict()
+    for key in _TIMING_KEYS:
+        expected.pop(key)
+        actual.pop(key)
+    expected["tetra"].pop("T_solve")
+    actual["tetra"].pop("T_solve")
+    # 经 JSON 比较，使 NaN 字段（如 epoch_proper_motion）可比 / Compare via JSON so NaN fields compare equal
+    assert json.dumps(actual, sort_keys=True) == json.dumps(expected, sort_keys=True)
+
+
+class _HeldExecutor:
+    """不运行任务、只保留 future 的执行器 / Executor that holds futures without running them."""
+
+    def __init__(self) -> None:
+        self.futures: list[Future] = []
+
+    def submit(self, *_args) -> Future:
+        fut: Future = Future()
+        self.futures.append(fut)
+        return fut
+
+    def shutdown(self, **_kwargs) -> None:
+        pass
+
+
+@pytest.mark.unit
+def test_one_crash_failing_several_solves_restarts_once(monkeypatch) -> None:
+    """同一进程池上多个 future 因崩溃失败只重建一次 / One crash, several failed futures, one rebuild."""
+    executors: list[_HeldExecutor] = []
+
+    def new_executor(_self) -> _HeldExecutor:
+        executors.append(_HeldExecutor())
+        return executors[-1]
+
+    monkeypatch.setattr(pool_mod.SolverProcessPool, "_new_executor", new_executor)
+    pool = pool_mod.SolverProcessPool(1)
+
+    def request() -> pool_mod._SolveRequest:
+        return pool_mod._SolveRequest(
+            method="stars",
+            image=np.zeros((0, 4)),
+            frame_shape=(480, 640),
+            options=np.zeros(0),
+            solve_source="full",
+            centroid_params=None,
+            prior=None,
+        )
+
+    outs = [pool_mod.AsyncPlateSolver._dispatch(pool, request()) for _ in range(3)]
+    for fut in executors[0].futures:
+        fut.set_exception(BrokenProcessPool("worker died"))
+
+    assert [out.result().status for out in outs] == ["WORKER_ERROR"] * 3
+    assert len(executors) == 2
+    assert pool.generation == 1
+    # 新进程池上的失败仍会重建 / A failure on the new executor still rebuilds
+    later = pool_mod.AsyncPlateSolver._dispatch(pool, request())
+    executors[1].futures[0].set_exception(BrokenProcessPool("worker died"))
+    assert later.result().status == "WORKER_ERROR"
+    assert len(executors) == 3
@@ -0,0 +1,31 @@
+"""星点提取单元测试 / Unit tests for the star extractor."""
+
+from __future__ import annotations
+
+import cv2
+import numpy as np
+import pytest
+
+from ogscope.algorithms.star_extract import StarExtractor, StarPoint
+
+
+@pytest.mark.unit
+def test_extract_returns_brightest_round_blobs_first() -> None:
+    """按通量降序返回圆形星点，剔除条纹与孤立噪点 / Round blobs by flux; streaks and specks dropped."""
+    frame = np.zeros((360, 640, 3), dtype=np.uint8)
+    stars = [(100, 50, 255), (300, 200, 180), (500, 300, 120), (50, 300, 90)]
+    for x, y, level in stars:
+        cv2.circle(frame, (x, y), 3, (level, level, level), -1)
+    cv2.line(frame, (200, 20), (400, 120), (255, 255, 255), 1)
+    frame[10, 600] = 255
+
+    found = StarExtractor(max_stars=3).extract(frame)
+    assert all(isinstance(p, StarPoint) for p in found)
+    for point, (x, y, _level) in zip(found, stars):
+        assert point.x == pytest.approx(x, abs=1.0) and point.y == pytest.approx(
+            y, abs=1.0
+        )
+    assert [p.flux for p in found] == sorted((p.flux for p in found), reverse=True)
+
+    # 条纹与孤立噪点不计入 / The streak and the lone hot speck are not stars
+    assert len(StarExtractor(max_stars=10).extract(frame)) == len(stars)
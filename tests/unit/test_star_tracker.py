@@ -0,0 +1,184 @@
+"""星点跟踪与姿态推算测试 / Tests for the star tracker and attitude propagation."""
+
+from __future__ import annotations
+
+import math
+import time
+
+import numpy as np
+import pytest
+
+import ogscope  # noqa: F401 — 注册 vendor 路径 / registers vendor path
+from ogscope.algorithms.plate_solve import SolveResult, propagate_solve
+from ogscope.algorithms.star_extract import StarPoint
+from ogscope.algorithms.star_match import FastTracker
+from tests.conftest import attitude_matrix
+
+_SIZE = (1080, 1920)
+
+
+def _field(n: int = 80, seed: int = 3) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform((0.0, 0.0), (_SIZE[1], _SIZE[0]), (n, 2))
+    return xy, rng.uniform(100.0, 5000.0, n)
+
+
+def _stars(xy: np.ndarray, flux: np.ndarray) -> list[StarPoint]:
+    return [StarPoint(float(x), float(y), float(f), 4.0) for (x, y), f in zip(xy, flux)]
+
+
+def _moved(
+    xy: np.ndarray, a: complex, b: complex, rng: np.random.Generator
+) -> np.ndarray:
+    z = a * (xy[:, 0] + 1j * xy[:, 1]) + b
+    z += rng.normal(0.0, 0.3, len(z)) + 1j * rng.normal(0.0, 0.3, len(z))
+    return np.column_stack((z.real, z.imag))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("shift", [complex(6.0, -3.0), complex(140.0, 85.0)])
+def test_tracker_recovers_similarity_transform(shift: complex) -> None:
+    """丢星与新增杂点下恢复平移/旋转/缩放；大位移走亮星投票 / Recover the transform despite lost and spurious stars."""
+    rng = np.random.default_rng(5)
+    xy, flux = _field()
+    a = 1.002 * complex(math.cos(math.radians(0.6)), math.sin(math.radians(0.6)))
+    keep = rng.permutation(len(xy))[:68]
+    cur_xy = np.vstack(
+        (_moved(xy, a, shift, rng)[keep], rng.uniform((0, 0), (1920, 1080), (10, 2)))
+    )
+    cur_flux = np.concatenate((flux[keep], np.full(10, 300.0)))
+
+    result = FastTracker().track(
+        _stars(xy, flux), _stars(cur_xy, cur_flux), center=(960.0, 540.0)
+    )
+
+    expected = a * complex(960.0, 540.0) + shift - complex(960.0, 540.0)
+    assert abs(complex(result.delta_x, result.delta_y) - expected) < 0.5
+    assert result.rotation_deg == pytest.approx(0.6, abs=0.02)
+    assert result.scale == pytest.approx(1.002, abs=5e-4)
+    assert result.inliers >= 60 and result.residual_px < 0.6
+    assert result.confidence > 0.8
+    assert result.previous_xy.shape == result.current_xy.shape == (result.inliers, 2)
+
+
+@pytest.mark.unit
+def test_tracker_rejects_unrelated_fields() -> None:
+    """无关星场或星数不足时置信度为 0 / Unrelated fields and too few stars give zero confidence."""
+    xy, flux = _field()
+    other_xy, other_flux = _field(seed=99)
+    tracker = FastTracker()
+    assert (
+        tracker.track(_stars(xy, flux), _stars(other_xy, other_flux)).confidence == 0.0
+    )
+    assert tracker.track(_stars(xy[:3], flux[:3]), _stars(xy, flux)).confidence == 0.0
+
+
+@pytest.mark.unit
+@pytest.mark.slow
+def test_tracker_80_stars_budget() -> None:
+    """80 颗星单次跟踪预算 / Budget for tracking 80 stars."""
+    xy, flux = _field()
+    tracker = FastTracker()
+    prev = _stars(xy, flux)
+    cur = _stars(
+        _moved(xy, 1.0 + 0j, complex(4.0, 2.0), np.random.default_rng(1)), flux
+    )
+    timings = []
+    for _ in range(50):
+        t0 = time.perf_counter()
+        tracker.track(prev, cur)
+        timings.append(time.perf_counter() - t0)
+    assert min(timings) * 1000.0 < 5.0
+
+
+_FOV, _DISTORTION = 12.0, -0.02
+_BEFORE = attitude_matrix(83.0, 41.0, 30.0)
+_AFTER = attitude_matrix(83.4, 41.25, 30.5)
+
+
+def _observed_fields() -> tuple[list[StarPoint], list[StarPoint]]:
+    """同一批天空星在两个姿态下的 Tetra3 投影 / The same sky stars projected by Tetra3 at two attitudes."""
+    from tetra3.tetra3 import _compute_centroids, _distort_centroids
+
+    rng = np.random.default_rng(8)
+    sky = _BEFORE[0] + rng.normal(0.0, 0.06, (400, 3))
+    sky /= np.linalg.norm(sky, axis=1)[:, None]
+
+    def observe(rotation: np.ndarray) -> np.ndarray:
+        yx, kept = _compute_centroids((rotation @ sky.T).T, _SIZE, np.deg2rad(_FOV))
+        out = np.full((len(sky), 2), np.nan)
+        out[kept] = _distort_centroids(yx[kept], _SIZE, _DISTORTION)[:, ::-1]
+        return out
+
+    prev_xy, cur_xy = observe(_BEFORE), observe(_AFTER)
+    both = np.flatnonzero(~np.isnan(prev_xy[:, 0]) & ~np.isnan(cur_xy[:, 0]))[:80]
+    ones = np.ones(len(both))
+    return _stars(prev_xy[both], ones), _stars(cur_xy[both], ones)
+
+
+def _prior() -> SolveResult:
+    return SolveResult(
+        ra_deg=83.0,
+        dec_deg=41.0,
+        detected_stars=80,
+        solve_source="realtime",
+        status="MATCH_FOUND",
+        status_code=1,
+        roll_deg=None,
+        fov_deg=_FOV,
+        matches=None,
+        prob=None,
+        rmse_arcsec=None,
+        t_solve_ms=None,
+        t_extract_ms=None,
+        t_preprocess_ms=None,
+        raw={"rotation_matrix": _BEFORE.tolist(), "distortion": _DISTORTION},
+    )
+
+
+def _assert_after(solved: SolveResult | None) -> None:
+    expected_ra = math.degrees(math.atan2(_AFTER[0, 1], _AFTER[0, 0])) % 360.0
+    expected_roll = math.degrees(math.atan2(_AFTER[1, 2], _AFTER[2, 2])) % 360.0
+    assert solved is not None and solved.solve_mode == "propagated"
+    assert solved.ra_deg == pytest.approx(expected_ra, abs=1e-3)
+    assert solved.dec_deg == pytest.approx(41.25, abs=1e-3)
+    assert solved.roll_deg == pytest.approx(expected_roll, abs=1e-2)
+    assert np.allclose(solved.raw["rotation_matrix"], _AFTER, atol=1e-5)
+
+
+@pytest.mark.unit
+def test_tracked_stars_propagate_attitude_like_tetra3() -> None:
+    """跟踪内点推算的姿态与 Tetra3 投影一致 / Attitude carried along tracked stars matches Tetra3's projection."""
+    prev, cur = _observed_fields()
+    track = FastTracker().track(prev, cur)
+    assert track.inliers >= 0.9 * len(prev)
+    _assert_after(propagate_solve(_prior(), track.previous_xy, track.current_xy, _SIZE))
+
+
+@pytest.mark.unit
+def test_realtime_service_carries_late_solves_forward() -> None:
+    """跟踪帧直接得到指向；较旧帧的解算结果被推到最新帧 / Tracked frames get pointing; late solves are carried forward."""
+    from ogscope.core.realtime.service import RealtimeSolveService, _FrameJob
+
+    prev, cur = _observed_fields()
+    svc = RealtimeSolveService()
+
+    def job(acquired: float, stars: list[StarPoint]) -> _FrameJob:
+        return _FrameJob(
+            frame_id=int(acquired),
+            fullsolve=True,
+            frame=None,
+            camera=None,
+            frame_shape=_SIZE,
+            coord_scale=1.0,
+            acquired_mono=acquired,
+            stars=stars,
+        )
+
+    assert svc._propagate(1.0, prev, _SIZE) is None
+    assert svc._reanchor(job(1.0, prev), _prior()) is None
+    _assert_after(svc._propagate(2.0, cur, _SIZE))
+    assert svc._last_track["inliers"] >= 0.9 * len(prev)
+
+    # 帧 1 的解算在帧 2 推算之后才返回 / Frame 1's solve lands after frame 2 was propagated
+    _assert_after(svc._reanchor(job(1.0, prev), _prior()))
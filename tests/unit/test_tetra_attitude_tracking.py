@@ -0,0 +1,156 @@
+"""姿态跟踪解算单元测试 / Unit tests for attitude-tracking solves."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import ogscope  # noqa: F401 — 注册 vendor 路径 / registers vendor path
+from ogscope.algorithms.plate_solve import PlateSolver, SolveResult
+from ogscope.algorithms.plate_solve import solver as solver_mod
+from ogscope.algorithms.star_extract import StarPoint
+from tests.conftest import attitude_matrix, synthetic_centroids
+
+_SIZE = (480, 640)
+_FOV_DEG = 10.0
+
+
+def _radec_vectors(ra: np.ndarray, dec: np.ndarray) -> np.ndarray:
+    return np.column_stack(
+        (np.cos(ra) * np.cos(dec), np.sin(ra) * np.cos(dec), np.sin(dec))
+    )
+
+
+def _synthetic_sky(n_stars: int = 30000):
+    """按星等排序的随机全天星表 / Random whole-sky star table, brightest first."""
+    from tetra3 import Tetra3
+
+    rng = np.random.default_rng(11)
+    ra = rng.uniform(0.0, 2.0 * np.pi, n_stars)
+    dec = np.arcsin(rng.uniform(-1.0, 1.0, n_stars))
+    mag = np.sort(rng.uniform(1.0, 8.0, n_stars))
+    table = np.column_stack((ra, dec, _radec_vectors(ra, dec), mag)).astype(np.float32)
+    t3 = Tetra3(load_database=None)
+    t3._star_table = table
+    from scipy.spatial import KDTree
+
+    t3._star_kd_tree = KDTree(table[:, 2:5])
+    t3._pattern_catalog = np.zeros((8, 4), dtype=np.uint32)
+    t3._num_patterns = 1000
+    t3._db_props.update(
+        pattern_size=4,
+        verification_stars_per_fov=150,
+        epoch_equinox=2000,
+        epoch_proper_motion=2024.0,
+    )
+    return t3
+
+
+def _observe(t3, ra_deg: float, dec_deg: float, roll_deg: float) -> np.ndarray:
+    """把星表投影到画面得到 (y, x) 质心 / Project the catalogue into (y, x) centroids."""
+    return synthetic_centroids(
+        t3,
+        ra_deg,
+        dec_deg,
+        roll_deg,
+        size=_SIZE,
+        fov_deg=_FOV_DEG,
+        n=60,
+        noise_px=0.3,
+        seed=3,
+    )
+
+
+@pytest.mark.unit
+def test_solve_from_attitude_recovers_moved_pointing() -> None:
+    """先验偏离 0.4° 仍收敛到真实指向 / Converges from a prior 0.4° away."""
+    t3 = _synthetic_sky()
+    centroids = _observe(t3, 40.0, 60.0, 15.0)
+    prior = attitude_matrix(40.5, 60.2, 15.3)
+
+    out = t3.solve_from_attitude(
+        centroids, _SIZE, prior, _FOV_DEG, return_rotation_matrix=True
+    )
+    assert out["status"] == 1
+    assert out["Matches"] >= 20
+    assert out["RA"] == pytest.approx(40.0, abs=0.01)
+    assert out["Dec"] == pytest.approx(60.0, abs=0.01)
+    assert out["FOV"] == pytest.approx(_FOV_DEG, rel=1e-3)
+    assert out["RMSE"] < 30.0
+
+
+@pytest.mark.unit
+def test_solve_from_attitude_rejects_unrelated_sky() -> None:
+    """先验指向错误天区时不返回匹配 / No match when the prior points elsewhere."""
+    t3 = _synthetic_sky()
+    centroids = _observe(t3, 40.0, 60.0, 15.0)
+    out = t3.solve_from_attitude(
+        centroids, _SIZE, attitude_matrix(200.0, -30.0, 0.0), _FOV_DEG
+    )
+    assert out["status"] == 2
+    assert out["RA"] is None
+
+
+def _prior_result(rotation: np.ndarray) -> SolveResult:
+    return SolveResult(
+        ra_deg=40.0,
+        dec_deg=60.0,
+        detected_stars=60,
+        solve_source="realtime",
+        status="MATCH_FOUND",
+        status_code=1,
+        roll_deg=15.0,
+        fov_deg=_FOV_DEG,
+        matches=40,
+        prob=1e-9,
+        rmse_arcsec=5.0,
+        t_solve_ms=300.0,
+        t_extract_ms=None,
+        t_preprocess_ms=None,
+        raw={"rotation_matrix": rotation.tolist(), "distortion": None},
+    )
+
+
+def _stars_from(centroids: np.ndarray) -> list[StarPoint]:
+    n = len(centroids)
+    return [
+        StarPoint(x=float(c[1]), y=float(c[0]), flux=float(n - i), area=4.0)
+        for i, c in enumerate(centroids)
+    ]
+
+
+@pytest.mark.unit
+def test_plate_solver_tracks_then_falls_back(monkeypatch) -> None:
+    """有先验走跟踪；退化时回退全量搜索 / Tracks with a prior, falls back when degraded."""
+    t3 = _synthetic_sky()
+    full_calls: list[int] = []
+
+    def _full(*_args, **_kwargs):
+        full_calls.append(1)
+        return {"RA": None, "Dec": None, "status": 2, "T_solve": 1.0}
+
+    monkeypatch.setattr(t3, "solve_from_centroids", _full)
+    monkeypatch.setattr(solver_mod, "_get_tetra3", lambda _settings: t3)
+    stars = _stars_from(_observe(t3, 40.0, 60.0, 15.0))
+    solver = PlateSolver(fov_deg=_FOV_DEG)
+
+    tracked = solver.solve(
+        stars,
+        _SIZE,
+        prior=_prior_result(attitude_matrix(40.2, 60.1, 15.0)),
+        centroid_rejection_level=1,
+    )
+    assert tracked.solve_mode == "tracking"
+    assert tracked.status == "MATCH_FOUND"
+    assert tracked.ra_deg == pytest.approx(40.0, abs=0.01)
+    assert "rotation_matrix" in tracked.raw
+    assert not full_calls
+
+    lost = solver.solve(
+        stars,
+        _SIZE,
+        prior=_prior_result(attitude_matrix(120.0, 0.0, 0.0)),
+        centroid_rejection_level=1,
+    )
+    assert lost.solve_mode == "full"
+    assert full_calls == [1]
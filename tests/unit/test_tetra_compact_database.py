@@ -0,0 +1,120 @@
+"""紧凑图案库格式单元测试 / Unit tests for the compact Tetra3 database layout."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import ogscope  # noqa: F401 — 注册 vendor 路径 / registers vendor path
+from tests.conftest import synthetic_centroids
+
+_SIZE = (480, 640)
+
+
+def _sorted_patterns(catalog: np.ndarray) -> set[tuple[int, ...]]:
+    rows = catalog[np.any(catalog != 0, axis=1)]
+    return set(map(tuple, np.sort(rows, axis=1).tolist()))
+
+
+@pytest.fixture(scope="module")
+def compact_database_path(synthetic_tetra_database: Path, tmp_path_factory) -> Path:
+    from tetra3 import compact_database
+
+    out = tmp_path_factory.mktemp("compact_db") / "synthetic_database_compact.npz"
+    return compact_database(synthetic_tetra_database, out)
+
+
+@pytest.mark.unit
+def test_bucket_lookup_slices_each_bucket_once() -> None:
+    """桶按首个命中的键返回一次，行连续 / Each bucket is returned once, as a contiguous run."""
+    from tetra3.tetra3 import _get_bucket_indices_from_hashes
+
+    offsets = np.array([0, 2, 2, 5, 6], dtype=np.uint32)
+    chains, inds = _get_bucket_indices_from_hashes([2, 0, 2, 1, 3], offsets)
+    assert chains.tolist() == [0, 0, 0, 1, 1, 4]
+    assert inds.tolist() == [2, 3, 4, 0, 1, 5]
+
+
+@pytest.mark.unit
+def test_compact_database_keeps_every_pattern(
+    synthetic_tetra_database: Path, compact_database_path: Path
+) -> None:
+    """紧凑库去掉空行但保留全部图案，且可转为内存映射 / No empty rows, all patterns kept."""
+    from tetra3 import Tetra3, convert_database_to_mmap
+
+    original = Tetra3(load_database=synthetic_tetra_database)
+    compact = Tetra3(load_database=compact_database_path)
+
+    assert compact.database_properties["hash_table_type"] == "bucketed"
+    assert compact.pattern_catalog.shape[0] == compact.num_patterns
+    assert np.all(np.any(compact.pattern_catalog != 0, axis=1))
+    assert compact.star_table.dtype == np.float32
+    assert compact.pattern_edge_ratios.dtype == np.uint16
+    assert _sorted_patterns(compact.pattern_catalog) == _sorted_patterns(
+        original.pattern_catalog
+    )
+
+    mmapped = Tetra3(load_database=convert_database_to_mmap(compact_database_path))
+    assert isinstance(mmapped.pattern_edge_ratios, np.memmap)
+    assert np.array_equal(mmapped.pattern_catalog, compact.pattern_catalog)
+
+
+@pytest.mark.unit
+def test_compact_database_solves_like_original(
+    synthetic_tetra_database: Path, compact_database_path: Path
+) -> None:
+    """两种格式解算结果一致 / Both layouts give the same solutions."""
+    from tetra3 import Tetra3
+
+    original = Tetra3(load_database=synthetic_tetra_database)
+    compact = Tetra3(load_database=compact_database_path)
+    fields = [
+        synthetic_centroids(
+            original, ra_deg, dec_deg, roll_deg, size=_SIZE, noise_px=0.3, seed=seed
+        )
+        for seed, (ra_deg, dec_deg, roll_deg) in enumerate(
+            [(30.0, 20.0, 10.0), (250.0, -45.0, 200.0), (120.0, 75.0, 300.0)]
+        )
+    ]
+    fields.append(np.random.default_rng(3).uniform((0, 0), _SIZE, size=(12, 2)))
+
+    for centroids in fields:
+        expected = original.solve_from_centroids(
+            centroids, _SIZE, fov_estimate=20.0, fov_max_error=1.0, solve_timeout=None
+        )
+        got = compact.solve_from_centroids(
+            centroids, _SIZE, fov_estimate=20.0, fov_max_error=1.0, solve_timeout=None
+        )
+        assert got["status"] == expected["status"]
+        if expected["status"] == 1:
+            assert got["RA"] == pytest.approx(expected["RA"], abs=1e-6)
+            assert got["Dec"] == pytest.approx(expected["Dec"], abs=1e-6)
+            assert got["Matches"] == expected["Matches"]
+
+
+@pytest.mark.unit
+def test_compact_database_buckets_match_original_keys(
+    synthetic_tetra_database: Path, compact_database_path: Path
+) -> None:
+    """每个图案所在桶与原始 float64 星向量算出的桶一致 / Buckets follow the float64 keys."""
+    from tetra3 import Tetra3
+    from tetra3.tetra3 import _pattern_catalog_entries
+
+    original = Tetra3(load_database=synthetic_tetra_database)
+    compact = Tetra3(load_database=compact_database_path)
+    offsets = np.asarray(compact._pattern_bucket_offsets)
+    num_buckets = len(offsets) - 1
+    rows = np.arange(compact.pattern_catalog.shape[0])
+    stored_bucket = np.searchsorted(offsets, rows, side="right") - 1
+
+    _, entries = _pattern_catalog_entries(
+        original.star_table[:, 2:5].astype(np.float64),
+        original.database_properties["pattern_bins"],
+        num_buckets,
+        True,
+        compact.pattern_catalog.astype(int).tolist(),
+    )
+    expected_bucket = np.array([entry[3] for entry in entries])
+    assert np.array_equal(stored_bucket, expected_bucket)
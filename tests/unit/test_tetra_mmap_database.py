@@ -0,0 +1,128 @@
+"""内存映射图案库单元测试 / Unit tests for the memory-mapped Tetra3 database."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import ogscope  # noqa: F401 — 注册 vendor 路径 / registers vendor path
+from ogscope.algorithms.plate_solve import solver as solver_mod
+from ogscope.config import Settings
+
+
+def _synthetic_tetra(n_stars: int = 200, n_slots: int = 64):
+    """构造小型合成图案库 / Build a small synthetic pattern database."""
+    from tetra3 import Tetra3
+
+    rng = np.random.default_rng(7)
+    ra = rng.uniform(0.0, 2.0 * np.pi, n_stars)
+    dec = rng.uniform(-np.pi / 2, np.pi / 2, n_stars)
+    star_table = np.zeros((n_stars, 6), dtype=np.float32)
+    star_table[:, 0] = ra
+    star_table[:, 1] = dec
+    star_table[:, 2] = np.cos(ra) * np.cos(dec)
+    star_table[:, 3] = np.sin(ra) * np.cos(dec)
+    star_table[:, 4] = np.sin(dec)
+    star_table[:, 5] = rng.uniform(1.0, 7.0, n_stars)
+
+    t3 = Tetra3(load_database=None)
+    t3._star_table = star_table
+    t3._pattern_catalog = rng.integers(0, n_stars, size=(n_slots, 4)).astype(np.uint16)
+    t3._pattern_largest_edge = rng.uniform(1, 200, n_slots).astype(np.float16)
+    t3._pattern_key_hashes = rng.integers(0, 2**16, n_slots).astype(np.uint16)
+    t3._star_catalog_IDs = np.arange(n_stars, dtype=np.uint32)
+    t3._db_props.update(
+        pattern_mode="edge_ratio",
+        hash_table_type="quadratic_probe",
+        pattern_size=4,
+        pattern_bins=50,
+        pattern_max_error=0.005,
+        max_fov=20.0,
+        min_fov=10.0,
+        star_catalog="hip_main",
+        epoch_equinox=2000,
+        epoch_proper_motion=2024.0,
+        lattice_field_oversampling=100,
+        patterns_per_lattice_field=50,
+        verification_stars_per_fov=150,
+        star_max_magnitude=7.0,
+        presort_patterns=True,
+        num_patterns=n_slots // 2,
+    )
+    return t3
+
+
+@pytest.mark.unit
+def test_convert_npz_to_mmap_round_trip(tmp_path: Path) -> None:
+    """npz 转映射目录后数组一致且为 memmap / Converted arrays match and are memory-mapped."""
+    from tetra3 import Tetra3, convert_database_to_mmap
+
+    src = _synthetic_tetra()
+    npz = tmp_path / "default_database.npz"
+    src.save_database(npz)
+
+    out_dir = convert_database_to_mmap(npz)
+    assert out_dir == tmp_path / "default_database"
+    assert (out_dir / "star_kd_tree.pkl").is_file()
+
+    ref = Tetra3(load_database=npz)
+    t3 = Tetra3(load_database=out_dir)
+    assert isinstance(t3.pattern_catalog, np.memmap)
+    assert isinstance(t3.star_table, np.memmap)
+    np.testing.assert_array_equal(t3.pattern_catalog, ref.pattern_catalog)
+    np.testing.assert_array_equal(t3.pattern_key_hashes, ref.pattern_key_hashes)
+    np.testing.assert_array_equal(t3.star_catalog_IDs, ref.star_catalog_IDs)
+    assert t3.num_patterns == ref.num_patterns
+    assert t3.database_properties["max_fov"] == pytest.approx(20.0)
+
+    probe = ref.star_table[3, 2:5]
+    assert t3.star_kd_tree.query(probe)[1] == ref.star_kd_tree.query(probe)[1] == 3
+
+
+@pytest.mark.unit
+def test_stale_kd_tree_cache_is_rebuilt(tmp_path: Path) -> None:
+    """KD 树缓存与星表不符时重建 / Stale KD-tree cache is rebuilt and rewritten."""
+    from tetra3 import Tetra3
+
+    t3 = _synthetic_tetra()
+    out_dir = tmp_path / "db"
+    t3.save_database_mmap(out_dir)
+    _synthetic_tetra(n_stars=50).save_database_mmap(tmp_path / "other")
+    (tmp_path / "other" / "star_kd_tree.pkl").replace(out_dir / "star_kd_tree.pkl")
+
+    loaded = Tetra3(load_database=out_dir)
+    assert loaded.star_kd_tree.n == 200
+    reloaded = Tetra3(load_database=out_dir)
+    assert reloaded.star_kd_tree.n == 200
+
+
+@pytest.mark.unit
+def test_resolve_database_path_prefers_mmap_dir(tmp_path: Path) -> None:
+    """存在映射目录时优先解析到目录 / Resolver prefers the mmap directory."""
+    _synthetic_tetra().save_database_mmap(tmp_path / "default_database")
+    settings = Settings(plate_solve_dir=tmp_path)
+    assert solver_mod._resolve_database_path(settings) == tmp_path / "default_database"
+
+    off = Settings(plate_solve_dir=tmp_path, solver_database_mmap=False)
+    assert solver_mod._resolve_database_path(off) == "default_database"
+
+
+@pytest.mark.unit
+def test_resolve_database_path_skips_stale_default_mmap_dir(tmp_path: Path) -> None:
+    """默认 .npz 比映射目录新时不使用旧目录 / A newer default .npz wins over a stale mmap dir."""
+    mmap_dir = tmp_path / "default_database"
+    _synthetic_tetra().save_database_mmap(mmap_dir)
+    npz = tmp_path / "default_database.npz"
+    npz.write_bytes(b"")
+    stamp = (mmap_dir / "props_packed.npy").stat().st_mtime
+    os.utime(npz, (stamp + 10.0, stamp + 10.0))
+    assert solver_mod._resolve_database_path(Settings(plate_solve_dir=tmp_path)) == npz
+
+    os.utime(npz, (stamp - 10.0, stamp - 10.0))
+    assert (
+        solver_mod._resolve_database_path(Settings(plate_solve_dir=tmp_path))
+        == mmap_dir
+    )
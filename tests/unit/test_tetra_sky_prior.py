@@ -0,0 +1,148 @@
+"""天区先验剪枝搜索单元测试 / Unit tests for the sky-prior pruned pattern search."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import ogscope  # noqa: F401 — 注册 vendor 路径 / registers vendor path
+from ogscope.algorithms.plate_solve import PlateSolver
+from ogscope.algorithms.plate_solve import solver as solver_mod
+from ogscope.algorithms.star_extract import StarPoint
+from tests.conftest import synthetic_centroids
+
+_SIZE = (480, 640)
+
+
+@pytest.mark.unit
+def test_sky_cells_cover_radius_and_partition_sky(
+    synthetic_tetra_database: Path,
+) -> None:
+    """半径内的点都落在首轮格内，各轮格互不重叠且覆盖全天 / Ring masks partition the sky."""
+    from tetra3 import Tetra3
+    from tetra3.tetra3 import _angle_from_distance, _radec_to_vectors
+
+    t3 = Tetra3(load_database=synthetic_tetra_database)
+    grid = t3._sky_cell_grid
+    # 索引在首次带先验解算时才构建 / The index is built on the first prior search
+    assert t3._pattern_sky_cells is None
+
+    rng = np.random.default_rng(3)
+    points = rng.normal(size=(20000, 3))
+    points /= np.linalg.norm(points, axis=1)[:, None]
+    centre = _radec_to_vectors(np.deg2rad(250.0), np.deg2rad(-70.0))
+    near = _angle_from_distance(np.linalg.norm(points - centre, axis=1)) <= np.deg2rad(
+        20.0
+    )
+    masks = t3._sky_prior_cell_masks((250.0, -70.0, 20.0), 3.0)
+    assert t3._pattern_sky_cells.shape == (t3.pattern_catalog.shape[0],)
+    assert masks[0][grid.cell_of(points[near])].all()
+
+    stacked = np.vstack(masks).astype(int)
+    assert len(masks) > 1
+    assert (stacked.sum(axis=0) == 1).all()
+    assert t3._sky_prior_cell_masks(None, 3.0) == [None]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("prior_offset_deg", [(2.0, -3.0), (180.0, 40.0)])
+def test_solve_with_sky_prior_finds_pointing(
+    synthetic_tetra_database: Path, prior_offset_deg: tuple[float, float]
+) -> None:
+    """先验准确或偏差很大时都能解出正确指向 / Right or badly wrong priors both still solve."""
+    from tetra3 import Tetra3
+
+    t3 = Tetra3(load_database=synthetic_tetra_database)
+    ra_deg, dec_deg = 30.0, 20.0
+    prior = (ra_deg + prior_offset_deg[0], dec_deg + prior_offset_deg[1], 20.0)
+    out = t3.solve_from_centroids(
+        synthetic_centroids(t3, ra_deg, dec_deg, 10.0),
+        _SIZE,
+        fov_estimate=20.0,
+        fov_max_error=1.0,
+        solve_timeout=None,
+        sky_prior=prior,
+    )
+    assert out["status"] == 1
+    assert out["RA"] == pytest.approx(ra_deg, abs=0.05)
+    assert out["Dec"] == pytest.approx(dec_deg, abs=0.05)
+
+
+@pytest.mark.unit
+def test_wider_sky_prior_passes_reuse_image_pattern_lookups(
+    synthetic_tetra_database: Path, monkeypatch
+) -> None:
+    """各轮只重新按天区掩码过滤，不重复查表 / Wider passes re-filter, never re-probe the table."""
+    from tetra3 import Tetra3
+
+    t3 = Tetra3(load_database=synthetic_tetra_database)
+    lookups: list[bytes] = []
+    masks: set[int] = set()
+    lookup, gather = t3._lookup_pattern_rows, t3._gather_pattern_rows
+
+    def _lookup(*args, **kwargs):
+        lookups.append(np.asarray(args[3][0]).tobytes())
+        return lookup(*args, **kwargs)
+
+    def _gather(*args, **kwargs):
+        masks.add(id(args[5]))
+        return gather(*args, **kwargs)
+
+    monkeypatch.setattr(t3, "_lookup_pattern_rows", _lookup)
+    monkeypatch.setattr(t3, "_gather_pattern_rows", _gather)
+    # 先验在对侧天区，需要多轮才能解出 / Prior on the far side needs several passes
+    out = t3.solve_from_centroids(
+        synthetic_centroids(t3, 30.0, 20.0, 10.0),
+        _SIZE,
+        fov_estimate=20.0,
+        fov_max_error=1.0,
+        solve_timeout=None,
+        sky_prior=(210.0, -20.0, 20.0),
+    )
+    assert out["status"] == 1
+    # 多轮搜索，但每个图像图案只查表一次 / Several passes, one table lookup per image pattern
+    assert len(masks) > 1
+    assert len(lookups) == len(set(lookups))
+
+
+@pytest.mark.unit
+def test_plate_solver_passes_confident_hint_as_sky_prior(
+    synthetic_tetra_database: Path, monkeypatch
+) -> None:
+    """仅给定 hint_radius_deg 时传入 sky_prior，半径含视场半对角线 / Radius adds FOV half-diagonal."""
+    from tetra3 import Tetra3
+
+    t3 = Tetra3(load_database=synthetic_tetra_database)
+    seen: list[object] = []
+    original = t3.solve_from_centroids
+
+    def _spy(*args, **kwargs):
+        seen.append(kwargs.get("sky_prior"))
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(t3, "solve_from_centroids", _spy)
+    monkeypatch.setattr(solver_mod, "_get_tetra3", lambda _settings: t3)
+    stars = [
+        StarPoint(x=float(c[1]), y=float(c[0]), flux=float(100 - i), area=4.0)
+        for i, c in enumerate(synthetic_centroids(t3, 250.0, -45.0, 200.0))
+    ]
+    solver = PlateSolver(fov_deg=20.0, fov_max_error_deg=1.0, solve_timeout_ms=60000)
+
+    plain = solver.solve(
+        stars, _SIZE, hint_ra_deg=250.0, hint_dec_deg=-45.0, centroid_rejection_level=1
+    )
+    hinted = solver.solve(
+        stars,
+        _SIZE,
+        hint_ra_deg=250.0,
+        hint_dec_deg=-45.0,
+        hint_radius_deg=10.0,
+        centroid_rejection_level=1,
+    )
+
+    assert plain.status == hinted.status == "MATCH_FOUND"
+    assert hinted.ra_deg == pytest.approx(plain.ra_deg)
+    assert seen[0] is None
+    assert seen[1] == pytest.approx((250.0, -45.0, 10.0 + 12.5))